@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""동시 버튼 클릭 시 카운트 누락 여부 확인 (로컬 Firebase 대역 서버 사용)
+
+여러 프로세스(= CountWriter 여러 개)에서 많은 스레드가 동시에 버튼을 누르는 상황을 만들고,
+서버에 남은 최종 카운트가 실제 클릭 수와 같은지 확인합니다.
+비교용으로 예전 방식(GET 후 +1 PUT)도 같은 조건에서 돌려 누락 수를 보여줍니다.
+
+실행: python bench/counter_stress.py --threads 32 --clicks 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import firebase_count  # noqa: E402
+from fake_firebase import FakeFirebaseServer  # noqa: E402
+
+COUNT_PATH = "/simulations/love_simulator/count.json"
+
+
+def naive_update(db_url, path):
+    """예전 update_firebase_count 와 같은 GET → +1 → PUT"""
+    try:
+        current = requests.get(db_url + path, timeout=5).json()
+        if not isinstance(current, int):
+            current = 0
+        requests.put(db_url + path, json=current + 1, timeout=5)
+    except requests.exceptions.RequestException:
+        pass # 예전 코드도 실패 시 에러만 표시하고 증가분은 버림
+
+
+def run_clicks(threads, clicks, click):
+    """threads 개 스레드가 동시에 clicks 번씩 click(i) 호출, 클릭 한 번당 소요 시간 목록 반환"""
+    latencies = []
+    lock = threading.Lock()
+    start = threading.Barrier(threads)
+
+    def worker(i):
+        local = []
+        start.wait()
+        for _ in range(clicks):
+            t0 = time.perf_counter()
+            click(i)
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return latencies
+
+
+def report(name, expected, actual, latencies, elapsed):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    missing = expected - actual if isinstance(actual, int) else "?" # 값이 없으면 누락 수를 알 수 없음
+    print(f"[{name}] 클릭 {expected}회 → 서버 카운트 {actual} (누락 {missing}), "
+          f"{elapsed:.2f}s, 클릭 지연 p50={statistics.median(latencies) * 1e6:.0f}us p99={p99 * 1e6:.0f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--clicks", type=int, default=50, help="스레드당 클릭 수")
+    parser.add_argument("--writers", type=int, default=4, help="CountWriter 개수 (앱 서버 프로세스 수 흉내)")
+    parser.add_argument("--flush-interval", type=float, default=0.05)
+    parser.add_argument("--skip-naive", action="store_true", help="예전 방식 비교 생략")
+    args = parser.parse_args()
+    expected = args.threads * args.clicks
+    actual = None # write-behind 측정 전에 실패하면 None 으로 남음
+
+    server = FakeFirebaseServer().start()
+    try:
+        if not args.skip_naive:
+            t0 = time.perf_counter()
+            latencies = run_clicks(args.threads, args.clicks, lambda i: naive_update(server.url, COUNT_PATH))
+            report("GET+PUT", expected, server.data.get(COUNT_PATH), latencies, time.perf_counter() - t0)
+            server.data.clear()
+            server.stats.update(get=0, put=0, conflict=0, injected_error=0)
+
+        writers = [firebase_count.CountWriter(server.url, COUNT_PATH, flush_interval=args.flush_interval)
+                   for _ in range(args.writers)]
+        t0 = time.perf_counter()
+        latencies = run_clicks(args.threads, args.clicks, lambda i: writers[i % len(writers)].add())
+        for writer in writers:
+            writer.close()
+        actual = server.data.get(COUNT_PATH)
+        report("write-behind", expected, actual, latencies, time.perf_counter() - t0)
+        print(f"  쓰기 {sum(w.flush_count for w in writers)}회, 서버 GET {server.stats['get']} / "
+              f"PUT {server.stats['put']} / 충돌(412) {server.stats['conflict']}")
+    finally:
+        server.stop()
+    if actual != expected:
+        print(f"실패: write-behind 서버 카운트 {actual}, 기대값 {expected}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""월별 확률 곡선(curve_batch) 측정: 프로필 수 × 개월 수 처리 시간, legacy 프리셋 호환성, hazard 곡선 단조성
+
+실행: python bench/curve_bench.py --profiles 100000 --horizon 36
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import love_model  # noqa: E402
+from bench.profiles import random_columns  # noqa: E402
+
+CHECK_PROFILES = 2_000 # apply_time_decay_v2 와 한 행씩 비교할 프로필 수
+
+
+def legacy_mismatches(columns):
+    """legacy 프리셋의 3/6/12개월 값이 기존 apply_time_decay_v2 경로와 다른 프로필 수"""
+    curves = love_model.curve_batch(columns, horizon=12, preset='legacy')
+    scores = love_model.score_batch(columns)
+    mismatches = 0
+    for row in range(len(columns['appearance'])):
+        for months in love_model.PERIOD_MONTHS:
+            encounter = love_model.apply_time_decay_v2(scores['encounter_prob'][row], months)
+            relationship = min(encounter, love_model.apply_time_decay_v2(scores['relationship_prob'][row], months))
+            if (curves['encounter'][row, months - 1] != encounter
+                    or curves['relationship'][row, months - 1] != relationship):
+                mismatches += 1
+                break
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--horizon", type=int, default=36)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    mismatches = legacy_mismatches(random_columns(rng, CHECK_PROFILES))
+    print(f"legacy 프리셋 3/6/12개월: {CHECK_PROFILES:,}개 중 불일치 {mismatches}개")
+
+    columns = random_columns(rng, args.profiles)
+    ok = mismatches == 0
+    for preset in love_model.CURVE_PRESETS:
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            curves = love_model.curve_batch(columns, horizon=args.horizon, preset=preset)
+            samples.append(time.perf_counter() - t0)
+        monotone = bool((np.diff(curves['encounter'], axis=1) >= 0).all()
+                        and (np.diff(curves['relationship'], axis=1) >= 0).all())
+        capped = bool((curves['relationship'] <= curves['encounter']).all())
+        print(f"{preset}: {args.profiles:,}개 × {args.horizon}개월 중앙값 {np.median(samples) * 1000:.0f}ms "
+              f"({args.profiles * args.horizon / np.median(samples) / 1e6:.1f}M 값/초), "
+              f"단조 증가 {'OK' if monotone else '실패'}, 연애 ≤ 만남 {'OK' if capped else '실패'}")
+        ok = ok and monotone and capped
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""목표 역산(find_min_effort) 벤치마크: 무작위 시작 프로필 × 무작위 목표
+
+- 지연 시간 p50/p99/max, 도달 가능 비율, 평균 비용, 시간 예산 초과 횟수
+- --verify N: 입력 일부만 풀어둔 작은 문제 N 개를 전수 탐색과 비교해서 최소 비용이 같은지 확인
+
+실행: python bench/goal_search_bench.py --profiles 200 --verify 50
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import goal_search  # noqa: E402
+import love_model  # noqa: E402
+from bench.profiles import random_params  # noqa: E402
+
+BUDGET_MS = 250 # 화면에서 바로 보여줄 수 있는 목표 시간
+FREE_FIELDS = 4 # 전수 탐색 비교에서 풀어둘 입력 수
+
+
+def brute_force(params, target, step_costs):
+    """풀린 입력의 모든 조합을 계산해서 목표 이상 중 최소 비용 (없으면 None)"""
+    names = list(love_model.activities_options)
+    current = love_model.profile_columns(params, 1, names)
+    free = [field for field, cost in step_costs.items() if cost is not None]
+    options = []
+    for field in free:
+        if field in ('activity1', 'activity2'):
+            values = np.arange(len(names))
+            steps = (values != current[field][0]).astype(np.float64)
+        else:
+            values, steps = goal_search._field_options(params, field, step_costs[field])
+        options.append((values, steps * step_costs[field]))
+    combos = list(itertools.product(*[range(len(values)) for values, _ in options]))
+    columns = love_model.profile_columns(params, len(combos), names)
+    cost = np.zeros(len(combos))
+    for i, (field, (values, costs)) in enumerate(zip(free, options)):
+        picks = np.array([combo[i] for combo in combos])
+        columns[field] = values[picks]
+        cost += costs[picks]
+    reached = love_model.score_batch(columns)['relationship_6m'] >= target - 1e-9
+    return cost[reached].min() if reached.any() else None
+
+
+def verify(rng, count):
+    fields = list(goal_search.DEFAULT_STEP_COSTS)
+    mismatches = 0
+    for _ in range(count):
+        params = random_params(rng)
+        free = rng.choice(fields, FREE_FIELDS, replace=False)
+        step_costs = {field: (float(rng.integers(1, 4)) if field in free else None) for field in fields}
+        target = float(rng.uniform(0, 50))
+        result = goal_search.find_min_effort(params, target, step_costs, time_budget=10)
+        expected = brute_force(params, target, step_costs)
+        if result.start_prob >= target:
+            expected = 0.0
+        if (expected is None) != (result.cost is None) or (
+                expected is not None and abs(expected - result.cost) > 1e-9) or (
+                result.reachable and result.achieved_prob < target - 1e-6):
+            mismatches += 1
+            print(f"  불일치: free={list(free)} target={target:.2f} 전수={expected} 탐색={result.cost}")
+    print(f"전수 탐색 비교 {count}개: 불일치 {mismatches}개")
+    return mismatches == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--verify", type=int, default=0, help="전수 탐색과 비교할 작은 문제 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    goal_search.find_min_effort(random_params(rng), 30) # 워밍업
+    samples, costs, reached, incomplete = [], [], 0, 0
+    for _ in range(args.profiles):
+        params = random_params(rng)
+        target = float(rng.uniform(5, 50))
+        t0 = time.perf_counter()
+        result = goal_search.find_min_effort(params, target)
+        samples.append((time.perf_counter() - t0) * 1000)
+        incomplete += not result.complete
+        if result.reachable:
+            reached += 1
+            costs.append(result.cost)
+            assert result.achieved_prob >= target - 1e-6, (target, result)
+    p50, p99 = np.percentile(samples, [50, 99])
+    print(f"프로필 {args.profiles}개: p50 {p50:.2f}ms, p99 {p99:.2f}ms, max {max(samples):.2f}ms (목표 {BUDGET_MS}ms), "
+          f"도달 {reached}/{args.profiles}, 평균 비용 {np.mean(costs) if costs else 0:.1f}칸, 시간 초과 {incomplete}회")
+    ok = p99 < BUDGET_MS
+    if args.verify:
+        ok = verify(rng, args.verify) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
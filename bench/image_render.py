@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""캐릭터 이미지 캐시 효과 측정: 파일 크기 대비 캐시 크기, st.image 호출 시간
+
+st.image 를 bare 모드(스크립트 실행 컨텍스트 없이)로 호출해서
+원본 경로를 넘길 때(매번 읽기/디코딩/축소/인코딩)와 캐시 바이트를 넘길 때를 비교합니다.
+
+실행: python bench/image_render.py --repeat 20
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import streamlit as st  # noqa: E402
+
+import image_cache  # noqa: E402
+from bench.profiles import call_samples  # noqa: E402
+
+
+def time_render(image, width, repeat):
+    """st.image 호출 시간 목록 (초)"""
+    return call_samples(lambda: st.image(image, width=width), [()] * repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="이미지당 반복 횟수")
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR) # bare 모드 경고 숨김
+    os.chdir(image_cache.BASE_DIR) # 앱과 같은 상대 경로(images/...) 사용
+
+    t0 = time.perf_counter()
+    cache = image_cache.ImageCache().build()
+    print(f"캐시 빌드: {len(cache.stats())}개, {(time.perf_counter() - t0) * 1000:.0f}ms")
+    if cache.errors:
+        print(f"  빌드 실패: {cache.errors}")
+
+    width = image_cache.CHARACTER_IMAGE_WIDTH
+    legacy_all, cached_all = [], []
+    print(f"{'이미지':<32} {'원본':>9} {'캐시':>8} {'원본 경로 p50':>14} {'캐시 p50':>10}")
+    for row in cache.stats():
+        legacy = time_render(row['path'], width, args.repeat)
+        cached = time_render(cache.get(row['path'], width), width, args.repeat)
+        legacy_all += legacy
+        cached_all += cached
+        print(f"{row['path']:<32} {row['source_bytes'] / 1024:>7.0f}KB {row['cached_bytes'] / 1024:>6.1f}KB "
+              f"{statistics.median(legacy) * 1000:>12.2f}ms {statistics.median(cached) * 1000:>8.2f}ms")
+    total_source = sum(r['source_bytes'] for r in cache.stats())
+    total_cached = sum(r['cached_bytes'] for r in cache.stats())
+    print(f"합계: 원본 {total_source / 1024:.0f}KB → 캐시 {total_cached / 1024:.1f}KB "
+          f"({total_cached / total_source:.1%}), st.image p50 {statistics.median(legacy_all) * 1000:.2f}ms → "
+          f"{statistics.median(cached_all) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""동시 세션 부하 테스트: AppTest 세션 여러 개 + 장애 주입 가능한 로컬 Firebase 대역 서버
+
+세션마다 love_sim.py 를 헤드리스(AppTest)로 띄우고, 무작위로 위젯 값을 바꾸거나
+"🔮 시뮬레이션 실행!" 버튼을 누릅니다. AppTest 는 run 할 때마다 Streamlit Runtime 인스턴스와 st.secrets 를
+프로세스 전역으로 바꿔치기하기 때문에 한 프로세스에서 여러 세션을 동시에 돌릴 수 없어서 세션마다 프로세스를
+하나씩 띄웁니다. 그래서 cache_resource(카운트 캐시/쓰기 버퍼/파이프라인)도 세션마다 따로 있고,
+앱 서버 여러 대가 같은 Firebase 를 쓰는 상황과 같습니다.
+
+Firebase 대역 서버에는 응답 지연(--latency-ms, --jitter-ms)과 503 오류(--error-rate)를 넣을 수 있습니다.
+가상 인구 분포는 세션마다 따로 만들지 않도록 시작 전에 하네스가 한 번 만들어 두고(--population-dir 로
+미리 만든 폴더를 줄 수도 있음) 세션 프로세스는 LOVE_SIM_POPULATION_DIR 로 그 캐시를 읽기만 합니다.
+끝나면 rerun 처리량(rerun/초), 종류별(처음 로딩/위젯 변경/버튼) 지연 백분위를 보여주고,
+세션 프로세스를 살려 둔 채 --drain-timeout 초까지 기다린 뒤 서버 카운트와 실제 클릭 수를 비교해
+카운트 누락 수를 보여줍니다. 누락이 있거나 앱 예외/세션 중단이 있으면 종료 코드 1 입니다.
+
+실행: python bench/load_test.py --sessions 8 --actions 20 --latency-ms 50 --error-rate 0.1
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import population  # noqa: E402
+from fake_firebase import FakeFirebaseServer  # noqa: E402
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "love_sim.py")
+COUNT_PATH = "/simulations/love_simulator/count.json"
+BUTTON_LABEL = "🔮 시뮬레이션 실행!"
+KINDS = ('initial', 'widget', 'click')
+PERCENTILES = (50, 90, 95, 99)
+START_TIMEOUT = 120.0 # 초, 세션 프로세스가 streamlit 을 import 하고 준비될 때까지
+
+
+def random_action(at, rng, click_prob):
+    """버튼 클릭 또는 위젯 하나를 무작위 값으로 변경 (아직 run 하지 않음), 동작 종류 반환"""
+    if rng.random() < click_prob:
+        next(button for button in at.button if button.label == BUTTON_LABEL).click()
+        return 'click'
+    choices = [(widget, widget.options) for widget in list(at.selectbox) + list(at.radio) + list(at.select_slider)]
+    choices += [(widget, range(int(widget.min), int(widget.max) + 1)) for widget in list(at.slider) + list(at.number_input)]
+    widget, values = rng.choice(choices)
+    widget.set_value(rng.choice(values))
+    return 'widget'
+
+
+def run_session(index, args, db_url, start, stop, results):
+    """세션 프로세스 하나: 처음 로딩 후 args.actions 번 동작하고 (번호, [(종류, 초, 예외 여부)], 중단 사유) 를 보냄
+
+    결과를 보낸 뒤에도 stop 이 올 때까지 살아 있어서, 쓰기 버퍼가 남은 증가분을 계속 반영할 수 있음
+    """
+    from streamlit.testing.v1 import AppTest
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR) # bare mode 경고
+    rng = random.Random(args.seed * 1000 + index)
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+    at.secrets["firebase"] = {"databaseURL": db_url}
+    samples, failure, kind = [], None, 'initial'
+    start.wait(START_TIMEOUT)
+    try:
+        for step in range(args.actions + 1):
+            if step:
+                kind = random_action(at, rng, args.click_prob)
+            t0 = time.perf_counter()
+            at.run()
+            samples.append((kind, time.perf_counter() - t0, bool(at.exception)))
+            if at.exception: # 화면이 중간에 끊겨서 더 진행할 수 없음
+                failure = f"session-{index} ({kind}): 앱 예외: {at.exception[0].message}"
+                break
+    except Exception as e: # 타임아웃 등 하네스 쪽 오류 (그때까지의 클릭은 samples 에 있음)
+        failure = f"session-{index} ({kind}): {type(e).__name__}: {e}"
+    results.put((index, samples, failure))
+    stop.wait(args.drain_timeout + START_TIMEOUT)
+
+
+def wait_for_count(server, expected, timeout):
+    """쓰기 버퍼가 남은 증가분을 반영할 때까지 서버 카운트를 확인 (expected 도달 또는 timeout)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        with server.lock:
+            count = server.data.get(COUNT_PATH)
+        if count == expected or time.monotonic() >= deadline:
+            return count if isinstance(count, int) else 0
+        time.sleep(0.2)
+
+
+def summarize(samples, elapsed):
+    rows = {}
+    for kind in KINDS + ('all',):
+        seconds = [s for k, s, _ in samples if kind in (k, 'all')]
+        if not seconds:
+            continue
+        values = np.percentile(np.array(seconds) * 1000, PERCENTILES)
+        rows[kind] = {'reruns': len(seconds), 'max_ms': max(seconds) * 1000,
+                      **{f'p{p}_ms': value for p, value in zip(PERCENTILES, values.tolist())}}
+    return {'reruns': len(samples), 'elapsed': elapsed, 'reruns_per_sec': len(samples) / elapsed,
+            'exceptions': sum(failed for _, _, failed in samples), 'latency': rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="동시 세션(브라우저 탭) 수 = 프로세스 수")
+    parser.add_argument("--actions", type=int, default=20, help="세션당 동작(위젯 변경/클릭) 수")
+    parser.add_argument("--click-prob", type=float, default=0.3, help="동작 중 버튼 클릭 비율")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Firebase 응답 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Firebase 추가 지연 최대값 (균등 분포)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Firebase 503 비율 (0~1)")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="남은 증가분 반영을 기다릴 최대 초")
+    parser.add_argument("--timeout", type=float, default=120.0, help="rerun 하나의 최대 초")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--population-dir", help="가상 인구 캐시 폴더 (기본: 임시 폴더에 새로 만듦)")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    server = FakeFirebaseServer(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                                error_rate=args.error_rate, seed=args.seed).start()
+    server.data[COUNT_PATH] = 0
+    # 실행 기록은 임시 DB 에, 가상 인구는 미리 만든 캐시 폴더에서 (세션 프로세스가 환경 변수를 물려받음)
+    work_dir = tempfile.mkdtemp(prefix="love_sim_load_")
+    os.environ["LOVE_SIM_RUN_DB"] = os.path.join(work_dir, "runs.db")
+    population_dir = args.population_dir or os.path.join(work_dir, "population")
+    os.environ["LOVE_SIM_POPULATION_DIR"] = population_dir
+    population_t0 = time.perf_counter()
+    population.load_or_build(cache_dir=population_dir) # 세션들이 동시에 만들며 CPU 를 나눠 쓰지 않도록 한 번만
+    population_seconds = time.perf_counter() - population_t0
+    context = multiprocessing.get_context("spawn")
+    start, stop, results = context.Barrier(args.sessions + 1), context.Event(), context.Queue()
+    processes = [context.Process(target=run_session, args=(i, args, server.url, start, stop, results),
+                                 name=f"session-{i}", daemon=True) for i in range(args.sessions)]
+    try:
+        for process in processes:
+            process.start()
+        start.wait(START_TIMEOUT)
+        t0 = time.perf_counter()
+        samples, failures = [], []
+        for _ in processes:
+            try:
+                _, session_samples, failure = results.get(timeout=args.timeout * (args.actions + 1))
+            except queue.Empty:
+                failures.append("결과를 보내지 않은 세션이 있음")
+                break
+            samples.extend(session_samples)
+            if failure:
+                failures.append(failure)
+        elapsed = time.perf_counter() - t0
+
+        clicks = sum(kind == 'click' for kind, _, _ in samples)
+        drain_t0 = time.perf_counter()
+        count = wait_for_count(server, clicks, args.drain_timeout)
+        report = summarize(samples, elapsed)
+        report.update({
+            'config': vars(args), 'cpu_count': os.cpu_count(), 'session_failures': failures, 'clicks': clicks,
+            'server_count': count, 'lost_increments': clicks - count,
+            'drain_seconds': time.perf_counter() - drain_t0, 'server': dict(server.stats),
+            'population_seconds': population_seconds,
+        })
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=10)
+        server.stop()
+
+    print(f"세션 {args.sessions}개 × 동작 {args.actions}회 (CPU {os.cpu_count()}개), "
+          f"Firebase 지연 {args.latency_ms:g}ms(+0~{args.jitter_ms:g}ms), 오류율 {args.error_rate:.0%}")
+    print(f"가상 인구 준비 {population_seconds:.1f}s ({population_dir})")
+    print(f"rerun {report['reruns']}회 / {elapsed:.1f}s = {report['reruns_per_sec']:.2f} rerun/초, "
+          f"앱 예외 {report['exceptions']}회")
+    for failure in failures:
+        print(f"  세션 중단: {failure}")
+    for kind, row in report['latency'].items():
+        percentiles = " ".join(f"p{p}={row[f'p{p}_ms']:.0f}ms" for p in PERCENTILES)
+        print(f"  {kind:8s} {row['reruns']:5d}회  {percentiles} max={row['max_ms']:.0f}ms")
+    print(f"클릭 {clicks}회 → 서버 카운트 {count} (누락 {report['lost_increments']}, "
+          f"반영 대기 {report['drain_seconds']:.1f}s)")
+    stats = report['server']
+    print(f"  서버 GET {stats['get']} / PUT {stats['put']} / 충돌(412) {stats['conflict']} / "
+          f"주입 오류(503) {stats['injected_error']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if report['lost_increments'] == 0 and report['exceptions'] == 0 and not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
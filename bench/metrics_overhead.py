@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""계측 오버헤드 측정: lap 한 번, rerun 한 번(구간 10개 + finish), 스크랩(Prometheus 텍스트/JSON) 비용
+
+실행: python bench/metrics_overhead.py --iterations 100000
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import metrics  # noqa: E402
+from bench.profiles import time_per_call  # noqa: E402
+
+SPANS = ("page_setup", "firebase_count", "widgets", "params", "scoring", "character_image", "charts", "advice",
+         "share_and_book", "intro")
+BUDGET_US = 100 # rerun 하나당 계측 비용 목표 (앱 rerun 은 수십~수백 ms)
+
+
+def per_call_us(func, iterations):
+    return time_per_call(func, [()] * iterations, 1)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    registry = metrics.Registry()
+    rerun = registry.start_rerun()
+    lap_us = per_call_us(lambda: rerun.lap("scoring"), args.iterations)
+
+    def full_rerun():
+        current = registry.start_rerun()
+        for name in SPANS:
+            current.lap(name)
+        registry.inc("button_runs_total")
+        current.finish()
+    rerun_us = per_call_us(full_rerun, args.iterations // 10)
+
+    disabled = metrics.Registry(enabled=False)
+
+    def disabled_rerun():
+        current = disabled.start_rerun()
+        for name in SPANS:
+            current.lap(name)
+        current.finish()
+    disabled_us = per_call_us(disabled_rerun, args.iterations // 10)
+
+    scrape_text_ms = per_call_us(registry.prometheus_text, 200) / 1000
+    scrape_json_ms = per_call_us(registry.snapshot, 200) / 1000
+    print(f"lap {lap_us:.2f}us, rerun(구간 {len(SPANS)}개 + finish) {rerun_us:.1f}us "
+          f"(꺼짐 {disabled_us:.2f}us), 스크랩 Prometheus {scrape_text_ms:.2f}ms / JSON {scrape_json_ms:.2f}ms")
+    return 0 if rerun_us < BUDGET_US else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
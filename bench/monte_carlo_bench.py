@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""몬테카를로 밴드(simulate_bands) 시간/메모리 측정: 시나리오 수별 소요 시간, 최대 할당량, 시드 재현성
+
+실행: python bench/monte_carlo_bench.py --scenarios 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import monte_carlo  # noqa: E402
+from bench.profiles import random_params  # noqa: E402
+
+BUDGET_SECONDS = 1.0 # 10만 시나리오 목표 시간
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk-size", type=int, default=monte_carlo.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    params = random_params(np.random.default_rng(args.seed))
+
+    monte_carlo.simulate_bands(params, scenarios=1_000) # 워밍업
+    ok = True
+    for scenarios in args.scenarios:
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            result = monte_carlo.simulate_bands(params, scenarios=scenarios, chunk_size=args.chunk_size, seed=args.seed)
+            samples.append(time.perf_counter() - t0)
+        tracemalloc.start()
+        again = monte_carlo.simulate_bands(params, scenarios=scenarios, chunk_size=args.chunk_size, seed=args.seed)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        reproducible = again.bands.equals(result.bands)
+        print(f"시나리오 {scenarios:,}개: 중앙값 {np.median(samples) * 1000:.0f}ms, 최대 {max(samples) * 1000:.0f}ms, "
+              f"최대 할당 {peak / 1e6:.1f}MB, 시드 재현 {'OK' if reproducible else '실패'}")
+        ok = ok and reproducible and (scenarios > 100_000 or max(samples) < BUDGET_SECONDS)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
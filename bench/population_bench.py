@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""가상 인구 분포 벤치마크: 인구 크기별 계산 처리량/최대 메모리, 디스크 캐시 로딩 시간, 순위 조회 지연
+
+최대 메모리(tracemalloc)가 인구 크기와 상관없이 청크 하나 분량으로 유지되는지 확인합니다.
+
+실행: python bench/population_bench.py --sizes 1000000 5000000 20000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import population  # noqa: E402
+
+LOOKUPS = 100_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 5_000_000, 20_000_000])
+    parser.add_argument("--chunk-size", type=int, default=population.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        tracemalloc.start()
+        stats = population.build_population(size, args.seed, args.chunk_size)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        elapsed = stats.meta['elapsed']
+        p10, p50, p90 = stats.percentiles([10, 50, 90])
+        print(f"{size:>12,}명: {elapsed:6.2f}s ({size / elapsed / 1e6:.2f}M 명/초), 최대 메모리 {peak / 2**20:.0f}MB, "
+              f"6개월 연애 확률 p10={p10:.2f}% p50={p50:.2f}% p90={p90:.2f}%")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = population.cache_path(size, args.seed, args.chunk_size, cache_dir)
+        stats.save(path)
+        t0 = time.perf_counter()
+        loaded = population.PopulationStats.load(path)
+        load_ms = (time.perf_counter() - t0) * 1000
+        print(f"디스크 캐시: {os.path.getsize(path) / 1024:.0f}KB, 로딩 {load_ms:.1f}ms")
+
+    probs = np.random.default_rng(args.seed).uniform(0, 100, LOOKUPS).tolist()
+    t0 = time.perf_counter()
+    for prob in probs:
+        loaded.top_percent(prob)
+    print(f"순위 조회: {(time.perf_counter() - t0) / LOOKUPS * 1e6:.2f}us/회")
+
+
+if __name__ == "__main__":
+    main()
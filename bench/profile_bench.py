@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""params 딕셔너리 vs love_profile.Profile: 프로필당 메모리, 단일 호출 속도, 직렬화/배치
+
+- 메모리: 프로필 --profiles 개를 만들 때 새로 할당되는 양 (tracemalloc, 라벨 문자열은 공유라 제외됨)
+  params 딕셔너리 / Profile / to_bytes 바이트 / pack_profiles 구조화 배열 한 행
+- 단일 호출: calculate_base_score_v2 → calculate_encounter_prob_v2 → calculate_relationship_prob_v2 (µs)
+  두 경로의 결과가 비트 단위로 같은지도 확인
+- 직렬화: to_bytes / from_bytes, 위젯 값 → Profile
+- 배치: score_batch 에 라벨 열 딕셔너리 vs pack_profiles 구조화 배열
+
+실행: python bench/profile_bench.py --profiles 10000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import love_model  # noqa: E402
+import love_profile  # noqa: E402
+from bench.profiles import allocated_per_item, columns_to_params, covering_columns, time_per_call  # noqa: E402
+
+
+def per_call_us(func, items, repeat):
+    """인자 하나짜리 호출의 µs (최솟값)"""
+    return time_per_call(func, [(item,) for item in items], repeat)[0]
+
+
+def score(params):
+    base = love_model.calculate_base_score_v2(params)
+    encounter = love_model.calculate_encounter_prob_v2(base, params)
+    return base, encounter, love_model.calculate_relationship_prob_v2(encounter, base, params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=10_000)
+    parser.add_argument("--calls", type=int, default=500, help="단일 호출 측정에 쓸 프로필 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    columns = covering_columns(np.random.default_rng(args.seed), args.profiles)
+    params_list = columns_to_params(columns)
+    profiles = [love_profile.Profile.from_params(params) for params in params_list]
+    mismatches = sum(score(params) != score(profile) for params, profile in zip(params_list, profiles))
+    print(f"프로필 {args.profiles:,}개, 딕셔너리/Profile 계산 결과 불일치 {mismatches}개")
+
+    print("프로필당 메모리:")
+    for name, build in (
+        ("params 딕셔너리", lambda: columns_to_params(columns)),
+        ("Profile", lambda: [love_profile.Profile.from_params(params) for params in params_list]),
+        ("to_bytes", lambda: [profile.to_bytes() for profile in profiles]),
+        ("pack_profiles 행", lambda: love_profile.pack_profiles(profiles)),
+    ):
+        print(f"  {name:18s} {allocated_per_item(build):8.1f}B")
+
+    calls = params_list[:args.calls]
+    dict_us = per_call_us(score, calls, args.repeat)
+    profile_us = per_call_us(score, profiles[:args.calls], args.repeat)
+    print(f"단일 계산 (기본 점수 → 만남 → 연애): 딕셔너리 {dict_us:.1f}us, Profile {profile_us:.1f}us "
+          f"→ {dict_us / profile_us:.1f}배")
+
+    packed = [profile.to_bytes() for profile in profiles[:args.calls]]
+    print(f"직렬화: to_bytes {per_call_us(love_profile.Profile.to_bytes, profiles[:args.calls], args.repeat):.2f}us, "
+          f"from_bytes {per_call_us(love_profile.Profile.from_bytes, packed, args.repeat):.2f}us, "
+          f"위젯 값 → Profile {per_call_us(love_profile.Profile.from_params, calls, args.repeat):.2f}us "
+          f"({love_profile.PACKED_SIZE}바이트)")
+
+    labels = columns # 라벨 문자열 열
+    records = love_profile.pack_profiles(profiles)
+    label_result, record_result = love_model.score_batch(labels), love_model.score_batch(records)
+    assert all(np.array_equal(label_result[key], record_result[key]) for key in label_result)
+    label_us = per_call_us(love_model.score_batch, [labels], args.repeat)
+    record_us = per_call_us(love_model.score_batch, [records], args.repeat)
+    print(f"score_batch {args.profiles:,}개: 라벨 열 {label_us / 1000:.2f}ms, 구조화 배열 {record_us / 1000:.2f}ms "
+          f"({records.nbytes / 1024:.0f}KB)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""벤치마크용 무작위 프로필 생성기 (시드 고정, 모든 범주형 단계 포함) + 공통 측정 도구 (호출당 시간, 할당량)"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import love_model  # noqa: E402
+import love_profile  # noqa: E402
+
+GENDERS = ["여성", "남성"]
+AGE_GROUPS = ["20대 초반", "20대 중후반", "30대 초반", "30대 중후반", "40대+"]
+
+
+def random_columns(rng, n):
+    """n 개 프로필을 열 딕셔너리로 (범주형은 라벨 문자열, 숫자는 위젯 범위 안에서 균등)"""
+    columns = {}
+    for field, (low, high, step) in love_model.NUMERIC_RANGES.items():
+        columns[field] = low + step * rng.integers(0, round((high - low) / step) + 1, n)
+    for field, levels in love_model.CATEGORY_LEVELS.items():
+        columns[field] = np.asarray(levels, dtype=object)[rng.integers(0, len(levels), n)]
+    names = np.asarray(list(love_model.activities_options), dtype=object)
+    columns['activity1'] = names[rng.integers(0, len(names), n)]
+    columns['activity2'] = names[rng.integers(0, len(names), n)]
+    columns['apply_sim_result'] = rng.random(n) < 0.5
+    columns['gender'] = np.asarray(GENDERS, dtype=object)[rng.integers(0, len(GENDERS), n)]
+    columns['age_group'] = np.asarray(AGE_GROUPS, dtype=object)[rng.integers(0, len(AGE_GROUPS), n)]
+    for field in ('solo_duration', 'exp_level'): # 모델은 읽지 않지만 love_profile.Profile 에는 필요
+        levels = love_profile.DISPLAY_LEVELS[field]
+        columns[field] = np.asarray(levels, dtype=object)[rng.integers(0, len(levels), n)]
+    return columns
+
+
+def covering_columns(rng, n):
+    """random_columns 와 같지만 모든 범주형 단계/활동이 반드시 한 번 이상 나오도록 앞쪽 행을 채운 뒤 섞음"""
+    columns = random_columns(rng, n)
+    names = list(love_model.activities_options)
+    required = [(field, levels) for field, levels in love_model.CATEGORY_LEVELS.items()]
+    required += [('activity1', names), ('activity2', names[::-1]), ('gender', GENDERS), ('age_group', AGE_GROUPS)]
+    if n < max(len(levels) for _, levels in required):
+        raise ValueError(f"모든 단계를 넣으려면 n 이 {max(len(levels) for _, levels in required)} 이상이어야 합니다.")
+    for field, levels in required:
+        columns[field][:len(levels)] = levels
+    order = rng.permutation(n)
+    return {field: values[order] for field, values in columns.items()}
+
+
+def columns_to_params(columns):
+    """열 딕셔너리 → 앱 params 딕셔너리 목록"""
+    n = len(columns['appearance'])
+    rows = []
+    for i in range(n):
+        params = {field: values[i].item() if hasattr(values[i], 'item') else values[i] for field, values in columns.items()}
+        params['activities_options'] = love_model.activities_options
+        rows.append(params)
+    return rows
+
+
+def random_params(rng):
+    """앱과 같은 형태의 params 딕셔너리 하나"""
+    return columns_to_params(random_columns(rng, 1))[0]
+
+
+def covers_all_levels(columns):
+    """모든 범주형 단계와 활동이 한 번 이상 나왔는지"""
+    for field, levels in love_model.CATEGORY_LEVELS.items():
+        if set(columns[field]) != set(levels):
+            return False
+    return set(columns['activity1']) | set(columns['activity2']) == set(love_model.activities_options)
+
+
+# --- 측정 도구 ---
+def time_per_call(func, args_list, repeat):
+    """args_list 를 한 바퀴 도는 시간을 repeat 번 재서 호출당 µs (최솟값, 중앙값)"""
+    for args in args_list: # 워밍업 (지연 초기화, CPU 클럭)
+        func(*args)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        samples.append((time.perf_counter() - t0) / len(args_list) * 1e6)
+    return min(samples), float(np.median(samples))
+
+
+def call_samples(func, args_list):
+    """호출마다 걸린 시간 목록 (초, 지연 분포용)"""
+    samples = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def allocations(func, args):
+    """한 번 호출할 때 최대 할당량(KB)과 호출 후 남은 블록 수 (tracemalloc)"""
+    func(*args) # 지연 초기화 제외
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    return peak / 1024, blocks
+
+
+def allocated_per_item(build):
+    """build() 가 만든 객체 목록이 차지하는 항목당 바이트 (목록 자체의 포인터 포함)"""
+    tracemalloc.start()
+    items = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(items)
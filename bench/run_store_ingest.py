@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""실행 기록 저장소 수집(ingest) 벤치마크: 동시 세션 수별 record() 지연과 저장 처리량
+
+- batched: RunStore.record() (대기열 + 백그라운드 일괄 INSERT)
+- inline: 클릭마다 바로 트랜잭션 하나로 INSERT (비교용)
+각 방식마다 새 임시 DB 를 쓰고, 끝나면 저장된 행 수가 기록한 실행 수와 같은지 확인합니다.
+
+실행: python bench/run_store_ingest.py --sessions 1 8 32 --runs 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import love_model  # noqa: E402
+import run_store  # noqa: E402
+from bench.profiles import random_params  # noqa: E402
+
+PREPARED_RUNS = 200 # 미리 만들어 돌려 쓰는 (params, results_df) 개수
+
+
+def make_run(rng):
+    """앱과 같은 형태의 (params, results_df, 캐릭터 경로)"""
+    params = random_params(rng)
+    curves = love_model.curve_batch(love_model.params_to_columns(params), horizon=12, preset='legacy')
+    labels = [f"{months}개월" for months in curves['months']]
+    results_df = pd.DataFrame({'만남 확률 (%)': curves['encounter'][0], '연애 시작 확률 (%)': curves['relationship'][0]},
+                              index=labels).round(1)
+    character = love_model.get_character_image_path(results_df.loc['6개월', '연애 시작 확률 (%)'], params['gender'])
+    return params, results_df, character
+
+
+def run_sessions(record, prepared, sessions, runs_per_session, samples_by_session):
+    """세션마다 스레드 하나로 record 를 runs_per_session 번 호출 (호출별 지연 ms 기록)"""
+    barrier = threading.Barrier(sessions)
+
+    def session(index):
+        session_id = run_store.RunStore.new_session_id()
+        samples = samples_by_session[index]
+        barrier.wait()
+        for i in range(index, index + runs_per_session):
+            params, results_df, character = prepared[i % len(prepared)]
+            t0 = time.perf_counter()
+            record(params, results_df, character, session_id)
+            samples.append((time.perf_counter() - t0) * 1000)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def measure(mode, prepared, sessions, runs_per_session, directory):
+    path = os.path.join(directory, f"{mode}_{sessions}.db")
+    store = run_store.RunStore(path)
+    if mode == "inline":
+        def record(params, results_df, character, session_id):
+            row = run_store.run_to_row(time.time(), session_id, params, results_df, character)
+            with store.engine.begin() as connection:
+                connection.execute(run_store.runs.insert(), [row])
+    else:
+        def record(params, results_df, character, session_id):
+            store.record(params, results_df, character, session_id=session_id)
+
+    samples_by_session = [[] for _ in range(sessions)]
+    started = time.perf_counter()
+    run_sessions(record, prepared, sessions, runs_per_session, samples_by_session)
+    store.close() # 남은 대기열까지 저장
+    elapsed = time.perf_counter() - started
+    samples = np.concatenate(samples_by_session)
+    total = sessions * runs_per_session
+    stored = store.count()
+    t0 = time.perf_counter()
+    distribution = store.probability_distribution()
+    query_ms = (time.perf_counter() - t0) * 1000
+    p50, p99 = np.percentile(samples, [50, 99])
+    print(f"{mode:7s} 세션 {sessions:3d} × {runs_per_session}: record p50 {p50:.3f}ms p99 {p99:.3f}ms, "
+          f"저장 {stored:,}/{total:,}행, {total / elapsed:,.0f} 행/초"
+          + (f", 배치 {store.batch_count}회" if mode == "batched" else "")
+          + f", 분포 집계 {len(distribution)}구간 {query_ms:.1f}ms")
+    return stored == total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--runs", type=int, default=500, help="세션당 실행 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--modes", nargs="+", default=["batched", "inline"], choices=["batched", "inline"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    prepared = [make_run(rng) for _ in range(PREPARED_RUNS)]
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        for sessions in args.sessions:
+            for mode in args.modes:
+                ok = measure(mode, prepared, sessions, args.runs, directory) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
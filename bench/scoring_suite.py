@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""점수 계산 경로 마이크로 벤치마크 + 기준값(baseline) 비교
+
+측정 항목 (모두 시드 고정 프로필, 모든 범주형 단계/활동 포함):
+- 단일 호출 지연: calculate_base_score_v2, calculate_encounter_prob_v2, calculate_relationship_prob_v2,
+  apply_time_decay_v2, get_character_image_path, 결과 표 만들기(예전 DataFrame + Categorical + set_index 방식,
+  지금 앱의 results_frame 단계), 파이프라인 전체 계산(캐시 없음)
+- 배치 처리량: score_batch / curve_batch 를 배치 크기별로 (프로필/초)
+- 할당: 한 번 호출할 때 tracemalloc 기준 최대 사용량(KB)과 호출 후 남은 블록 수
+
+결과는 JSON 으로 쓰고(--output), 저장된 기준값(--baseline)과 비교해서 hot path 지표가
+--threshold % 이상 나빠지면 종료 코드 1 로 끝납니다. --update-baseline 으로 기준값을 새로 저장합니다.
+
+실행: python bench/scoring_suite.py --output bench_results.json
+      python bench/scoring_suite.py --update-baseline
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import love_model  # noqa: E402
+import pipeline  # noqa: E402
+from bench.profiles import allocations, columns_to_params, covering_columns, covers_all_levels, time_per_call  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "scoring_suite.json")
+DEFAULT_THRESHOLD = 25.0 # %
+PROFILES = 256 # 단일 호출 측정에 돌려 쓰는 프로필 수
+BATCH_SIZES = (1, 100, 10_000, 100_000)
+# 지표별 좋은 방향: 지연/메모리는 낮을수록, 처리량은 높을수록
+LOWER_IS_BETTER = ('us', 'alloc_peak_kb')
+HIGHER_IS_BETTER = ('profiles_per_sec',)
+
+
+def legacy_results_table(encounter_prob, relationship_prob):
+    """예전 앱의 결과 표 만들기 (3/6/12 반복 + DataFrame + Categorical + set_index)"""
+    results = {'기간': [], '만남 확률 (%)': [], '연애 시작 확률 (%)': []}
+    period_order = ["3개월", "6개월", "12개월"]
+    for months in [3, 6, 12]:
+        encounter_p = love_model.apply_time_decay_v2(encounter_prob, months)
+        relationship_p = min(encounter_p, love_model.apply_time_decay_v2(relationship_prob, months))
+        results['기간'].append(f"{months}개월")
+        results['만남 확률 (%)'].append(round(encounter_p, 1))
+        results['연애 시작 확률 (%)'].append(round(relationship_p, 1))
+    results_df = pd.DataFrame(results)
+    results_df['기간'] = pd.Categorical(results_df['기간'], categories=period_order, ordered=True)
+    return results_df.set_index('기간')
+
+
+def single_call_cases(params_list):
+    """(이름, 함수, 인자 목록, hot path 여부)"""
+    scored = []
+    for params in params_list:
+        base = love_model.calculate_base_score_v2(params)
+        encounter = love_model.calculate_encounter_prob_v2(base, params)
+        scored.append((params, base, encounter, love_model.calculate_relationship_prob_v2(encounter, base, params)))
+    stages = pipeline.build_pipeline().stages
+    curves = [stages['curves'].func(params, encounter, relationship) for params, _, encounter, relationship in scored]
+
+    def pipeline_cold(params):
+        pipeline.build_pipeline().evaluate(params, targets=['texts'])
+
+    return [
+        ("calculate_base_score_v2", love_model.calculate_base_score_v2, [(p,) for p in params_list], True),
+        ("calculate_encounter_prob_v2", love_model.calculate_encounter_prob_v2,
+         [(base, p) for p, base, _, _ in scored], True),
+        ("calculate_relationship_prob_v2", love_model.calculate_relationship_prob_v2,
+         [(encounter, base, p) for p, base, encounter, _ in scored], True),
+        ("apply_time_decay_v2", love_model.apply_time_decay_v2,
+         [(relationship, months) for _, _, _, relationship in scored for months in love_model.PERIOD_MONTHS], True),
+        ("get_character_image_path", love_model.get_character_image_path,
+         [(relationship, p['gender']) for p, _, _, relationship in scored], True),
+        ("results_table_legacy", legacy_results_table,
+         [(encounter, relationship) for _, _, encounter, relationship in scored], False),
+        ("results_frame", stages['results_frame'].func, [(p, curve) for p, curve in zip(params_list, curves)], True),
+        ("pipeline_cold", pipeline_cold, [(p,) for p in params_list[:32]], True),
+    ]
+
+
+def run_suite(seed, repeat):
+    rng = np.random.default_rng(seed)
+    columns = covering_columns(rng, PROFILES)
+    assert covers_all_levels(columns)
+    params_list = columns_to_params(columns)
+    results = {}
+
+    for name, func, args_list, hot in single_call_cases(params_list):
+        best, median = time_per_call(func, args_list, repeat)
+        peak_kb, blocks = allocations(func, args_list[0])
+        results[name] = {'kind': 'single_call', 'hot': hot, 'us': best, 'us_median': median,
+                         'alloc_peak_kb': peak_kb, 'alloc_blocks': blocks}
+        print(f"{name:32s} {best:9.2f}us (중앙값 {median:.2f}us), 최대 할당 {peak_kb:.1f}KB, 남은 블록 {blocks}")
+
+    for name, func in (("score_batch", love_model.score_batch),
+                       ("curve_batch", lambda data: love_model.curve_batch(data, horizon=36))):
+        for size in BATCH_SIZES:
+            batch = covering_columns(rng, max(size, 64))
+            batch = {field: values[:size] for field, values in batch.items()}
+            calls = max(1, 2_000 // size) # 배치가 작으면 여러 번 반복해서 평균
+            best, _ = time_per_call(func, [(batch,)] * calls, max(3, repeat // 2))
+            peak_kb, _ = allocations(func, (batch,))
+            key = f"{name}[{size}]"
+            results[key] = {'kind': 'throughput', 'hot': size >= 100, 'batch_size': size,
+                            'profiles_per_sec': size / (best / 1e6), 'us': best, 'alloc_peak_kb': peak_kb}
+            print(f"{key:32s} {size / (best / 1e6):12,.0f} 프로필/초 ({best / 1000:.2f}ms/배치), 최대 할당 {peak_kb:.0f}KB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """hot path 지표 중 threshold % 넘게 나빠진 것 목록"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not current.get('hot') or base is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if metric not in current or metric not in base or not base[metric]:
+                continue
+            change = (current[metric] - base[metric]) / base[metric] * 100
+            worse = change if metric in LOWER_IS_BETTER else -change
+            if worse > threshold:
+                regressions.append((name, metric, base[metric], current[metric], worse))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="결과 JSON 경로")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="허용 악화율 (%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_suite(args.seed, args.repeat)
+    report = {
+        'meta': {
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'platform': platform.platform(), 'seed': args.seed, 'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"기준값 파일이 없습니다: {args.baseline} (--update-baseline 으로 생성)")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, before, after, worse in regressions:
+        print(f"회귀: {name} {metric} {before:.4g} → {after:.4g} ({worse:+.1f}% 악화, 허용 {args.threshold:g}%)")
+    if not regressions:
+        print(f"hot path 회귀 없음 (허용 {args.threshold:g}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""공유 카드 벤치마크: 레이어 준비 시간, 캐시 없이 그리기 vs 캐시 hit, 메모리 상한과 LRU 제거
+
+- 레이어 준비: ShareCardRenderer 생성 (배경/캐릭터 디코딩·축소/글꼴, 프로세스당 한 번)
+- 캐시 없이 그리기: 미리 만든 레이어로 합성 + PNG/미리보기 인코딩 (클릭마다 그리면 드는 비용)
+- 캐시 hit: 같은 내용 키로 다시 요청
+- 메모리 상한: --max-mb 캐시에 서로 다른 카드 --cards 장을 넣었을 때 남는 바이트/장 수, 제거 횟수
+
+실행: python bench/share_card_bench.py --renders 20 --cards 64 --max-mb 16
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import love_model  # noqa: E402
+import share_card  # noqa: E402
+from bench.profiles import call_samples  # noqa: E402
+
+GENDERS = ("남성", "여성")
+
+
+def random_cards(rng, n):
+    """(6개월 연애 확률, 성별, 활동) n 개"""
+    activities = list(love_model.activities_options)
+    return [(float(rng.uniform(0, 100)), GENDERS[int(rng.integers(2))], activities[int(rng.integers(len(activities)))])
+            for _ in range(n)]
+
+
+def timings(func, args_list):
+    """호출마다 걸린 ms"""
+    return np.array(call_samples(func, args_list)) * 1000
+
+
+def describe(samples):
+    p50, p99 = np.percentile(samples, [50, 99])
+    return f"p50 {p50:8.3f}ms, p99 {p99:8.3f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--renders", type=int, default=20, help="캐시 없이 그릴 카드 수")
+    parser.add_argument("--hits", type=int, default=10_000, help="캐시 hit 요청 수")
+    parser.add_argument("--cards", type=int, default=64, help="메모리 상한 확인에 넣을 서로 다른 카드 수")
+    parser.add_argument("--max-mb", type=float, default=16.0, help="메모리 상한 확인용 캐시 크기")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    t0 = time.perf_counter()
+    renderer = share_card.ShareCardRenderer()
+    print(f"레이어 준비: {(time.perf_counter() - t0) * 1000:.0f}ms "
+          f"(글꼴 {renderer.font_path or 'Pillow 기본 글꼴 (한글 없음)'})")
+
+    cards = random_cards(rng, args.renders)
+    renderer.render(*cards[0]) # 워밍업
+    uncached = timings(renderer.render, cards)
+    sample = renderer.render(*cards[0])
+    print(f"캐시 없이 그리기: {describe(uncached)} (PNG {len(sample.png) / 1024:.0f}KB + "
+          f"미리보기 {len(sample.preview) / 1024:.0f}KB)")
+
+    cache = share_card.ShareCardCache(renderer)
+    for card in cards:
+        cache.get(*card)
+    hits = timings(cache.get, [cards[i % len(cards)] for i in range(args.hits)])
+    print(f"캐시 hit:        {describe(hits)} → 중앙값 기준 {np.median(uncached) / np.median(hits):,.0f}배 빠름")
+
+    cache = share_card.ShareCardCache(renderer, max_bytes=int(args.max_mb * 2**20))
+    t0 = time.perf_counter()
+    for card in random_cards(rng, args.cards):
+        cache.get(*card)
+    print(f"메모리 상한 {args.max_mb:g}MB: 카드 {args.cards}장 요청({time.perf_counter() - t0:.1f}s) → "
+          f"{len(cache)}장 {cache.nbytes / 2**20:.1f}MB 보관, 제거 {cache.evictions}회")
+    assert cache.nbytes <= cache.max_bytes
+
+
+if __name__ == "__main__":
+    main()
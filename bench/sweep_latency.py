@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""민감도 분석(sensitivity_sweep) 지연 시간 측정: 무작위 프로필마다 전체 변형 계산
+
+실행: python bench/sweep_latency.py --profiles 200
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sensitivity  # noqa: E402
+from bench.profiles import random_params  # noqa: E402
+
+BUDGET_MS = 50 # 매 실행마다 보여줄 수 있는 목표 시간
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    sensitivity.sensitivity_sweep(random_params(rng)) # 첫 호출(임포트/캐시 워밍업) 제외
+    samples, variants = [], []
+    for _ in range(args.profiles):
+        params = random_params(rng)
+        t0 = time.perf_counter()
+        sweep = sensitivity.sensitivity_sweep(params)
+        samples.append((time.perf_counter() - t0) * 1000)
+        variants.append(len(sweep))
+    p50, p99 = np.percentile(samples, [50, 99])
+    print(f"프로필 {args.profiles}개, 변형 {min(variants)}~{max(variants)}개/프로필: "
+          f"p50 {p50:.2f}ms, p99 {p99:.2f}ms, max {max(samples):.2f}ms (목표 {BUDGET_MS}ms)")
+    return 0 if p99 < BUDGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
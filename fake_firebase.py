@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""로컬 테스트용 Firebase Realtime Database REST API 대역 서버
+
+카운트 기능에 필요한 만큼만 흉내 냅니다.
+- GET  /<path>.json            : 저장된 JSON 값 (없으면 null)
+  요청 헤더 X-Firebase-ETag: true 이면 응답 헤더에 ETag 포함
+- PUT  /<path>.json            : 값 저장
+  요청 헤더 if-match 가 현재 ETag 와 다르면 412 + 현재 값/ETag 반환
+
+부하 테스트용 장애 주입 (실행 중에도 속성으로 바꿀 수 있음):
+- latency + 0~jitter 초 만큼 응답을 늦춤
+- error_rate 확률로 값을 건드리지 않고 503 반환 (PUT 도 반영 전에 실패)
+
+실행: python fake_firebase.py --port 9000 --latency 0.05 --error-rate 0.1
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+NULL_ETAG = "null_etag"
+
+
+def make_etag(value):
+    """값의 ETag (Firebase 처럼 값 내용으로 결정)"""
+    if value is None:
+        return NULL_ETAG
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class FakeFirebaseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep-alive 지원
+
+    def log_message(self, format, *args):
+        pass # 요청마다 stderr 에 찍지 않음
+
+    def _send(self, status, value, etag=None):
+        body = json.dumps(value).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _injected_failure(self):
+        """설정된 지연을 넣고, 오류를 주입할 차례면 503 을 보내고 True"""
+        if not self.server.inject_fault():
+            return False
+        self._send(503, {"error": "Injected failure (fake_firebase)"})
+        return True
+
+    def do_GET(self):
+        server = self.server
+        if self._injected_failure():
+            return
+        with server.lock:
+            server.stats['get'] += 1
+            value = server.data.get(self.path)
+        etag = make_etag(value) if self.headers.get("X-Firebase-ETag", "").lower() == "true" else None
+        self._send(200, value, etag)
+
+    def do_PUT(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            value = json.loads(self.rfile.read(length) or b"null")
+        except json.JSONDecodeError:
+            self._send(400, {"error": "Invalid data; couldn't parse JSON object."})
+            return
+        if self._injected_failure():
+            return
+        if_match = self.headers.get("if-match")
+        with server.lock:
+            server.stats['put'] += 1
+            current = server.data.get(self.path)
+            if if_match is not None and if_match != make_etag(current):
+                server.stats['conflict'] += 1
+                status, value, etag = 412, current, make_etag(current)
+            else:
+                server.data[self.path] = value
+                status, etag = 200, make_etag(value)
+        self._send(status, value, etag)
+
+
+class FakeFirebaseServer(ThreadingHTTPServer):
+    """메모리에 값을 저장하는 스레드 HTTP 서버 (경로 → JSON 값)"""
+
+    daemon_threads = True
+    request_queue_size = 128 # 동시 접속 테스트 시 연결이 거절되지 않도록
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        super().__init__((host, port), FakeFirebaseHandler)
+        self.lock = threading.Lock()
+        self.data = {}
+        self.stats = {'get': 0, 'put': 0, 'conflict': 0, 'injected_error': 0}
+        self.latency = latency # 초
+        self.jitter = jitter # 초, 0~jitter 균등 분포로 추가
+        self.error_rate = error_rate # 0~1
+        self._random = random.Random(seed)
+        self._thread = None
+
+    def inject_fault(self):
+        """요청 하나에 지연을 넣고 오류를 주입할지 결정 (핸들러 스레드에서 호출)"""
+        with self.lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.stats['injected_error'] += 1
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    @property
+    def url(self):
+        """FIREBASE_DB_URL 자리에 넣을 주소 (끝에 / 없음, 경로는 /로 시작)"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버 실행"""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-firebase", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 Firebase Realtime DB REST 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 지연 최대값 (초, 균등 분포)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 을 돌려줄 확률 (0~1)")
+    args = parser.parse_args()
+    server = FakeFirebaseServer(args.host, args.port, args.latency, args.jitter, args.error_rate)
+    print(f"Fake Firebase listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
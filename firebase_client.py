@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Firebase REST 호출용 공유 HTTP 클라이언트
+
+- requests.Session + 커넥션 풀로 keep-alive 연결 재사용
+- 모든 요청에 연결/읽기 타임아웃
+- 연결 실패와 GET 의 일시 오류(5xx/429)는 백오프를 두고 제한된 횟수만 재시도
+- 연속 실패 시 회로 차단(circuit breaker): 일정 시간 동안 요청을 보내지 않고 바로 실패
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (3.05, 5) # (연결, 읽기) 초
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """회로 차단 중이라 요청을 보내지 않음"""
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 회로 차단기
+
+    closed: 정상 / open: reset_timeout 동안 모든 요청 즉시 실패 /
+    half_open: reset_timeout 이 지나면 요청 하나만 시험으로 통과시키고 결과에 따라 닫거나 다시 엶
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self):
+        """요청을 보내도 되는지 (half_open 에서는 한 번에 하나만 허용)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic() # 시험 요청 실패 시 다시 reset_timeout 동안 차단
+
+
+class FirebaseClient:
+    """커넥션 풀 + 타임아웃 + 재시도 + 회로 차단을 갖춘 Firebase REST 클라이언트"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=2, backoff_factor=0.3, pool_maxsize=10, breaker=None):
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        # PUT 은 연결 실패(요청이 안 나간 경우)만 재시도: 응답 유실 후 재전송하면 증가분이 두 번 반영될 수 있음
+        retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                      allowed_methods=frozenset(["GET"]), status_forcelist=(429, 500, 502, 503, 504),
+                      backoff_factor=backoff_factor, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        """회로가 열려 있으면 CircuitOpenError, 아니면 요청 후 결과를 회로 차단기에 기록"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Firebase 응답 오류가 계속되어 잠시 요청을 멈춘 상태입니다.")
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            self.breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_client():
+    """프로세스 전체에서 하나의 클라이언트(커넥션 풀, 회로 차단 상태)를 공유"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = FirebaseClient()
+        return _shared_client
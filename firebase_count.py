@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""Firebase Realtime Database 누적 카운트 읽기/증가 + 프로세스 공유 캐시
+
+Streamlit 은 위젯을 건드릴 때마다 스크립트 전체를 다시 실행하므로,
+매 rerun 마다 Firebase 에 GET 을 보내지 않도록 마지막으로 읽은 값을 메모리에 두고
+TTL 이 지나면 백그라운드 스레드에서 갱신합니다 (stale-while-revalidate).
+
+카운트 증가도 버튼 클릭 시점에는 메모리에만 쌓아두고(CountWriter),
+백그라운드 스레드가 모아서 한 번의 조건부 쓰기(ETag / if-match)로 반영합니다.
+모든 HTTP 호출은 firebase_client 의 공유 클라이언트(커넥션 풀, 타임아웃, 회로 차단)를 거칩니다.
+"""
+import atexit
+import json
+import threading
+import time
+from collections import namedtuple
+
+import requests
+
+from firebase_client import CircuitOpenError, get_shared_client
+
+NULL_ETAG = "null_etag" # if-match 에 쓰면 "경로에 값이 없을 때만" 쓰기
+
+
+# Firebase에서 현재 카운트 읽어오는 함수
+def get_firebase_count(db_url, path, client=None):
+    """Firebase Realtime Database에서 카운트를 읽어옵니다.
+
+    경로에 값이 없을(null) 때만 0 으로 초기화하고, 그것도 조건부 쓰기(if-match: null_etag)라서
+    그 사이 다른 쪽이 값을 썼으면 건드리지 않습니다. 정수가 아니거나 JSON 이 아닌 응답(프록시 오류 페이지 등)은
+    오류로만 돌려주고 저장된 값은 그대로 둡니다 (읽기 쪽 일시 오류로 전체 카운트가 지워지지 않도록).
+    """
+    if not db_url:
+        return 0, "Firebase DB URL이 secrets.toml에 설정되지 않았습니다."
+    client = client or get_shared_client()
+    try:
+        response = client.get(db_url + path)
+        response.raise_for_status() # HTTP 오류 발생 시 예외 발생
+        count = response.json()
+        if count is None: # 경로에 데이터가 없는 경우
+            # 경로가 여전히 비어 있을 때만 0으로 초기값 쓰기
+            try:
+                init_response = client.put(db_url + path, json=0, headers={'if-match': NULL_ETAG})
+                if init_response.status_code == 412: # 그 사이 다른 쪽이 값을 씀 → 그 값을 사용
+                    current = init_response.json()
+                    if isinstance(current, int):
+                        return current, None
+                    return 0, "카운트 초기화 건너뜀 (그 사이 값이 생김)."
+                init_response.raise_for_status()
+                return 0, "카운트 초기화 완료 (값이 없었음)."
+            except (requests.exceptions.RequestException, json.JSONDecodeError) as init_e:
+                return 0, f"카운트 초기화 실패: {init_e}"
+        elif isinstance(count, int) and not isinstance(count, bool):
+            return count, None # 정상적으로 정수 카운트 반환
+        else:
+            # 데이터 형식이 정수가 아닌 경우: 저장된 값은 그대로 두고 오류만 알림
+            return 0, f"카운트 형식 오류 ({type(count).__name__}), 저장된 값은 바꾸지 않았습니다."
+
+    except requests.exceptions.RequestException as e:
+        return 0, f"Firebase 연결 오류: {e}"
+    except json.JSONDecodeError:
+        # 프록시/게이트웨이 오류 페이지(HTML) 등 일시적인 응답일 수 있으므로 쓰지 않음
+        return 0, "Firebase 응답 형식 오류 (JSON 아님), 저장된 값은 바꾸지 않았습니다."
+    except Exception as e:
+        return 0, f"카운트 로딩 중 알 수 없는 오류: {e}"
+
+
+# rerun 에서 읽어가는 카운트 스냅샷
+# value: 마지막으로 알려진 값 (한 번도 못 읽었으면 None)
+# error: 마지막 갱신 시도의 오류 메시지 (성공이면 None)
+# refreshed_at: 마지막으로 값을 성공적으로 읽은 시각 (time.time(), 없으면 None)
+# age: refreshed_at 이후 경과 초 / stale: TTL 초과 여부
+CountSnapshot = namedtuple('CountSnapshot', ['value', 'error', 'refreshed_at', 'age', 'stale'])
+
+
+class CachedCount:
+    """TTL 기반 공유 카운트 캐시 (읽기는 네트워크 I/O 없이 메모리에서만)"""
+
+    def __init__(self, db_url, path, ttl=30.0, fetch=get_firebase_count):
+        self.db_url = db_url
+        self.path = path
+        self.ttl = ttl
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._value = None
+        self._error = None
+        self._refreshed_at = None
+        self._attempted_at = None # 마지막 갱신 시도 시각 (실패 포함)
+        self._refreshing = False
+        self.refresh_count = 0 # 갱신 시도 횟수 (실패 포함)
+        self.error_count = 0 # 실패한 갱신 횟수
+
+    def snapshot(self):
+        """마지막으로 알려진 값을 반환하고, 오래됐으면 백그라운드 갱신을 예약"""
+        now = time.time()
+        with self._lock:
+            age = None if self._refreshed_at is None else now - self._refreshed_at
+            stale = age is None or age >= self.ttl
+            snap = CountSnapshot(self._value, self._error, self._refreshed_at, age, stale)
+            # 실패했을 때도 TTL 동안은 재시도하지 않음 (Firebase 장애 시 요청 폭주 방지)
+            due = self._attempted_at is None or now - self._attempted_at >= self.ttl
+            start_refresh = stale and due and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+                self._attempted_at = now
+        if start_refresh:
+            threading.Thread(target=self._refresh, name="firebase-count-refresh", daemon=True).start()
+        return snap
+
+    def refresh_now(self):
+        """동기 갱신 (최초 로딩을 기다리고 싶을 때 사용)"""
+        with self._lock:
+            self._refreshing = True
+            self._attempted_at = time.time()
+        self._refresh()
+        return self.snapshot()
+
+    def set(self, value):
+        """다른 경로(카운트 업데이트 등)로 알게 된 최신 값을 반영"""
+        with self._lock:
+            self._value = value
+            self._error = None
+            self._refreshed_at = time.time()
+
+    def _refresh(self):
+        try:
+            count, error_msg = self._fetch(self.db_url, self.path)
+        except Exception as e: # fetch 함수가 예외를 던져도 캐시는 살아 있어야 함
+            count, error_msg = None, f"카운트 로딩 중 알 수 없는 오류: {e}"
+        with self._lock:
+            self._refreshing = False
+            self._error = error_msg
+            self.refresh_count += 1
+            self.error_count += error_msg is not None
+            if error_msg is None:
+                self._value = count
+                self._refreshed_at = time.time()
+            elif self._value is None:
+                # 한 번도 읽지 못했으면 fetch 가 돌려준 대체값(0)을 사용, 아니면 마지막 값 유지
+                self._value = count
+
+
+class CountConflict(Exception):
+    """조건부 쓰기가 재시도 횟수 안에 성공하지 못함 (다른 쪽에서 계속 값을 바꾸는 중)"""
+
+
+class CountUncertain(Exception):
+    """PUT 을 보냈지만 응답을 못 받았고, 다시 읽어봐도 반영됐는지 알 수 없음"""
+
+
+def _read_with_etag(client, url):
+    """(값, ETag) — ETag 가 없으면 조건부 쓰기를 할 수 없으므로 오류"""
+    response = client.get(url, headers={'X-Firebase-ETag': 'true'})
+    response.raise_for_status()
+    etag = response.headers.get('ETag')
+    if not etag:
+        raise CountConflict("응답에 ETag 가 없어 조건부 쓰기를 할 수 없습니다")
+    return response.json(), etag
+
+
+def _put_may_have_applied(error):
+    """PUT 이 서버에 닿은 뒤 응답만 잃었을 수 있는 오류인지 (연결 전 실패/회로 차단은 아님)"""
+    if isinstance(error, (requests.exceptions.ConnectTimeout, CircuitOpenError)):
+        return False
+    return isinstance(error, (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError,
+                              requests.exceptions.ChunkedEncodingError))
+
+
+def update_firebase_count(db_url, path, delta=1, max_retries=5, client=None):
+    """Firebase Realtime Database의 카운트를 delta 만큼 증가시킵니다.
+
+    ETag 로 읽은 값을 기준으로 if-match 조건부 PUT 을 보내고, 그 사이 다른 곳에서
+    값을 바꿨으면(412) 응답에 담긴 최신 값/ETag 로 다시 시도하므로 증가분이 누락되지 않습니다.
+    ETag 가 없으면 덮어쓰기가 되므로 쓰지 않고 오류로 돌려줍니다.
+
+    PUT 응답을 잃으면(읽기 타임아웃 등) 다시 읽어서 확인합니다: ETag 가 그대로면 반영 안 된 것이라 다시 시도,
+    값이 보낸 값과 같으면 반영된 것으로 봄, 그 밖에는 반영 여부를 알 수 없어서 (None, 메시지) 를 돌려줍니다
+    (호출한 쪽이 다시 더하면 두 번 셀 수 있음).
+    """
+    if not db_url:
+        return False, "Firebase DB URL이 설정되지 않았습니다."
+    client = client or get_shared_client()
+    url = db_url + path
+    try:
+        # 1. 현재 값과 ETag 읽기
+        current_count, etag = _read_with_etag(client, url)
+        for _ in range(max_retries):
+            # 현재 값이 null이거나 정수가 아니면 0으로 간주
+            if not isinstance(current_count, int):
+                current_count = 0
+            # 2. 읽은 값이 그대로일 때만 쓰기
+            new_count = current_count + delta
+            try:
+                put_response = client.put(url, json=new_count, headers={'if-match': etag})
+            except requests.exceptions.RequestException as e:
+                if not _put_may_have_applied(e):
+                    raise
+                try:
+                    value, check_etag = _read_with_etag(client, url)
+                except (requests.exceptions.RequestException, json.JSONDecodeError, CountConflict):
+                    raise CountUncertain(f"쓰기 응답을 못 받았고 다시 읽지도 못함 ({e})") from e
+                if check_etag == etag: # 값이 그대로 → PUT 은 반영되지 않음, 같은 조건으로 다시 시도
+                    continue
+                if value == new_count:
+                    return True, new_count
+                raise CountUncertain(f"쓰기 응답을 못 받았고 그 사이 값이 {value} 로 바뀜 ({e})") from e
+            if put_response.status_code != 412:
+                put_response.raise_for_status()
+                return True, new_count # 성공 시 새 카운트 반환
+            # 412: 그 사이 값이 바뀜 → 응답의 최신 값과 ETag 로 재시도
+            etag = put_response.headers.get('ETag')
+            if not etag:
+                raise CountConflict("412 응답에 ETag 가 없어 다시 시도할 수 없습니다")
+            current_count = put_response.json()
+        raise CountConflict(f"{max_retries}번 재시도 후에도 충돌")
+
+    except CountUncertain as e:
+        return None, f"카운트 반영 여부 불명: {e}"
+    except CountConflict as e:
+        return False, f"카운트 충돌: {e}"
+    except requests.exceptions.RequestException as e:
+        return False, f"Firebase 연결 오류: {e}"
+    except json.JSONDecodeError:
+        return False, "Firebase 응답 형식 오류 (JSON 아님)"
+    except Exception as e:
+        return False, f"알 수 없는 오류: {e}"
+
+
+class CountWriter:
+    """카운트 증가 write-behind 버퍼
+
+    add() 는 메모리의 대기 증가분만 올리고 바로 돌아옵니다 (네트워크 대기 없음).
+    백그라운드 스레드가 flush_interval 초마다, 또는 대기분이 max_pending 이상이 되면
+    모아둔 증가분을 update_firebase_count 한 번으로 반영하고, 실패하면 대기분으로 되돌려
+    다음 주기에 다시 시도합니다. 반영됐는지 알 수 없는 실패(쓰기 응답 유실)는 두 번 세지 않도록
+    되돌리지 않고 uncertain_total 에 기록만 합니다.
+    """
+
+    def __init__(self, db_url, path, flush_interval=2.0, max_pending=20, on_flush=None, update=update_firebase_count):
+        self.db_url = db_url
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.on_flush = on_flush # 성공 시 새 카운트를 받는 콜백 (예: CachedCount.set)
+        self._update = update
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock() # 동시에 두 번 쓰지 않도록
+        self._wakeup = threading.Event()
+        self._pending = 0
+        self._thread = None
+        self._closed = False
+        self.flushed_total = 0 # Firebase 에 반영된 증가분 합계
+        self.flush_count = 0
+        self.error_count = 0 # 실패한 반영 시도 횟수
+        self.uncertain_total = 0 # 반영 여부를 알 수 없어 되돌리지 않은 증가분 합계
+        self.last_error = None
+        self.last_flush_at = None
+
+    @property
+    def pending(self):
+        with self._lock:
+            return self._pending
+
+    def add(self, n=1):
+        """증가분을 대기열에 올림 (버튼 클릭 경로에서 호출, 즉시 반환)"""
+        if not self.db_url:
+            self.last_error = "Firebase DB URL이 설정되지 않았습니다."
+            return
+        with self._lock:
+            self._pending += n
+            full = self._pending >= self.max_pending
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="firebase-count-writer", daemon=True)
+                self._thread.start()
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """대기 중인 증가분을 지금 반영 (성공하면 True)"""
+        with self._flush_lock:
+            with self._lock:
+                delta, self._pending = self._pending, 0
+            if delta == 0:
+                return True
+            success, result = self._update(self.db_url, self.path, delta)
+            if success is None: # 반영됐을 수도 있음 → 다시 더하지 않음
+                self.uncertain_total += delta
+                self.error_count += 1
+                self.last_error = result
+                return False
+            if not success:
+                with self._lock:
+                    self._pending += delta # 실패한 증가분은 버리지 않고 다음 주기에 재시도
+                self.error_count += 1
+                self.last_error = result
+                return False
+            self.flushed_total += delta
+            self.flush_count += 1
+            self.last_error = None
+            self.last_flush_at = time.time()
+        if self.on_flush is not None:
+            self.on_flush(result)
+        return True
+
+    def close(self):
+        """백그라운드 스레드를 멈추고 남은 증가분을 마지막으로 반영"""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 10)
+        return self.flush()
+
+    def _run(self):
+        atexit.register(self.close) # 프로세스 종료 시 남은 증가분 반영
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self._closed:
+                self.flush()
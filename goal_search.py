@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""목표 확률 역산: 6개월 연애 확률 목표에 닿는 '가장 적은 노력'의 입력 변경 찾기
+
+모델 구조를 이용한 분기 한정(branch-and-bound) 탐색입니다.
+- 6개월 연애 확률은 기본 점수(B), 활동 점수(A), 매력 관리 점수(C) 세 값에 대해 단조 증가
+- B 와 C 는 항목별 점수의 단순 합 → 항목을 하나씩 더해가며 (비용, 점수 증가) 파레토 전선만 유지
+  (B 는 0~100 으로 잘리므로 100 을 넘는 증가분은 같은 값으로 취급해서 가지치기)
+- A 는 활동 1/2 × 빈도 × 새로운 시도 × 참고 의향 조합(수천 개)을 한 번에 계산해서 파레토 전선만 유지
+- (A, C) 조합을 비용 순으로 훑으며, 지금까지 찾은 최소 비용 이상이면 중단하고,
+  B 를 최대로 올려도 목표에 못 미치는 조합은 건너뜀. 남은 조합마다 B 전선에서 필요한 최소 지점을 찾음
+
+한 칸 비용(step_costs)은 입력별로 바꿀 수 있고, None 이면 그 입력은 고정합니다.
+"""
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import love_model
+from love_model import ACTIVITY_FIELDS, BASE_FIELDS, CHARM_FIELDS
+
+# 한 칸 = 슬라이더/숫자 입력 한 단위(외모는 0.5점), select_slider 한 단계, 활동/주거 환경/체크박스는 바꿀 때마다 한 칸
+DEFAULT_STEP_COSTS = {field: 1.0 for field in BASE_FIELDS + CHARM_FIELDS + ACTIVITY_FIELDS}
+DEFAULT_TIME_BUDGET = 0.25 # 초, 화면에서 바로 보여줄 수 있는 수준
+
+Change = namedtuple('Change', ['field', 'label', 'from_value', 'to_value', 'steps', 'cost'])
+# reachable: 목표 도달 가능 여부 / changes: Change 목록 / complete: 시간 안에 탐색을 끝냈는지 (False 면 찾은 것 중 최선)
+GoalResult = namedtuple('GoalResult', ['reachable', 'target', 'start_prob', 'achieved_prob', 'max_prob', 'cost',
+                                       'changes', 'complete', 'elapsed', 'combos_checked'])
+
+_EPS = 1e-9
+
+
+def _step_cost(step_costs, field):
+    cost = step_costs.get(field, DEFAULT_STEP_COSTS.get(field))
+    return None if cost is None or not np.isfinite(cost) else float(cost)
+
+
+def _field_options(params, field, step_cost):
+    """입력 하나의 선택지: (값 배열, 칸 수 배열) — 고정이면 현재 값 하나"""
+    if field in love_model.NUMERIC_RANGES:
+        low, high, step = love_model.NUMERIC_RANGES[field]
+        current = float(params[field])
+        values = np.arange(low, high + step / 2, step) if step_cost is not None else np.array([current])
+        return values, np.abs(values - current) / step
+    if field == 'apply_sim_result':
+        current = bool(params[field])
+        values = np.array([current, not current]) if step_cost is not None else np.array([current])
+        return values, (values != current).astype(np.float64)
+    current = love_model.CATEGORY_LEVELS[field].index(params[field])
+    codes = np.arange(len(love_model.CATEGORY_LEVELS[field])) if step_cost is not None else np.array([current])
+    return codes, np.abs(codes - current).astype(np.float64)
+
+
+def _pareto(cost, gain):
+    """비용이 더 들면서 점수가 같거나 낮은 점을 제거한 인덱스 (비용 오름차순)"""
+    order = np.lexsort((-gain, cost))
+    sorted_gain = gain[order]
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], sorted_gain[:-1])))
+    return order[sorted_gain > best_before + _EPS]
+
+
+def _additive_frontier(params, fields, step_costs, score_fn, cap):
+    """항목별 점수 합 그룹의 (비용, 증가분) 파레토 전선과 되짚기용 포인터"""
+    options = [(field, *_field_options(params, field, _step_cost(step_costs, field))) for field in fields]
+    n = sum(len(values) for _, values, _ in options)
+    columns = love_model.profile_columns(params, n + 1)
+    start = 1
+    for field, values, _ in options:
+        columns[field][start:start + len(values)] = values
+        start += len(values)
+    scores = score_fn(columns)
+    gains = scores[1:] - scores[0] # 0번 행은 현재 값
+
+    frontier_cost, frontier_gain = np.zeros(1), np.zeros(1)
+    back = []
+    start = 0
+    for field, values, steps in options:
+        option_cost = steps * (_step_cost(step_costs, field) or 0.0)
+        option_gain = gains[start:start + len(values)]
+        start += len(values)
+        cost = (frontier_cost[:, None] + option_cost[None, :]).ravel()
+        gain = np.minimum(frontier_gain[:, None] + option_gain[None, :], cap).ravel()
+        keep = _pareto(cost, gain)
+        back.append((field, values, steps, keep // len(values), keep % len(values)))
+        frontier_cost, frontier_gain = cost[keep], gain[keep]
+    return frontier_cost, frontier_gain, back
+
+
+def _trace_back(back, index):
+    """전선의 index 지점을 만드는 입력별 선택 [(field, 값, 칸 수)]"""
+    picks = []
+    for field, values, steps, parent, option in reversed(back):
+        picks.append((field, values[option[index]], steps[option[index]]))
+        index = parent[index]
+    return picks[::-1]
+
+
+def _activity_frontier(params, step_costs, activities_options):
+    """활동 그룹 조합 전체의 (비용, 활동 점수) 파레토 전선"""
+    names = list(activities_options)
+    slot_options = []
+    for field in ('activity1', 'activity2'):
+        current = names.index(params[field]) if params[field] in names else len(names)
+        step_cost = _step_cost(step_costs, field)
+        codes = np.arange(len(names)) if step_cost is not None else np.array([current])
+        if current not in codes:
+            codes = np.append(codes, current)
+        slot_options.append((codes, (codes != current) * (step_cost or 0.0)))
+    other_options = [(field, *_field_options(params, field, _step_cost(step_costs, field)))
+                     for field in ('activity_freq', 'new_activity_try', 'apply_sim_result')]
+
+    grids = np.meshgrid(*[codes for codes, _ in slot_options], *[values for _, values, _ in other_options],
+                        indexing='ij')
+    cost_grids = np.meshgrid(*[cost for _, cost in slot_options],
+                             *[steps * (_step_cost(step_costs, field) or 0.0) for field, _, steps in other_options],
+                             indexing='ij')
+    fields = ('activity1', 'activity2', 'activity_freq', 'new_activity_try', 'apply_sim_result')
+    columns = {field: grid.ravel() for field, grid in zip(fields, grids)}
+    score = love_model.activity_score_batch(columns, activities_options)
+    cost = sum(grid.ravel() for grid in cost_grids)
+    keep = _pareto(cost, score)
+    return cost[keep], score[keep], {field: columns[field][keep] for field in fields}
+
+
+def _relationship(base, activity, charm):
+    encounter = love_model.encounter_prob_from_total(base + activity)
+    return love_model.relationship_prob_from_charm(encounter, base, charm)
+
+
+def _display_value(field, value, activities_options):
+    if field in love_model.NUMERIC_RANGES:
+        return f"{value:.1f}" if field == 'appearance' else f"{value:.0f}"
+    if field == 'apply_sim_result':
+        return "예" if value else "아니오"
+    if field in ('activity1', 'activity2'):
+        names = list(activities_options)
+        return names[value] if value < len(names) else str(value)
+    return love_model.CATEGORY_LEVELS[field][value]
+
+
+def find_min_effort(params, target, step_costs=None, time_budget=DEFAULT_TIME_BUDGET,
+                    activities_options=love_model.activities_options):
+    """6개월 연애 확률 target(%) 이상이 되는 최소 비용 입력 변경 조합"""
+    started = time.perf_counter()
+    step_costs = dict(DEFAULT_STEP_COSTS, **(step_costs or {}))
+    current = love_model.profile_columns(params, 1, activities_options)
+    raw0 = love_model.base_score_raw_batch(current)[0]
+    charm0 = love_model.charm_score_batch(current)[0]
+    start_prob = love_model.score_batch(current, activities_options)['relationship_6m'][0]
+    # 6개월 연애 확률 = 연애 시작 확률 (6개월 보정 계수 1.0)
+
+    base_cost, base_gain, base_back = _additive_frontier(
+        params, BASE_FIELDS, step_costs, love_model.base_score_raw_batch, cap=max(0.0, 100 - raw0))
+    charm_cost, charm_gain, charm_back = _additive_frontier(
+        params, CHARM_FIELDS, step_costs, love_model.charm_score_batch, cap=np.inf)
+    activity_cost, activity_score, activity_picks = _activity_frontier(params, step_costs, activities_options)
+    base_values = np.clip(raw0 + base_gain, 0, 100)
+    charm_values = charm0 + charm_gain
+
+    max_prob = float(_relationship(base_values[-1], activity_score[-1], charm_values[-1]))
+    if start_prob >= target - _EPS or max_prob < target - _EPS:
+        reachable = start_prob >= target - _EPS
+        return GoalResult(reachable, target, start_prob, start_prob, max_prob, 0.0 if reachable else None, [],
+                          True, time.perf_counter() - started, 0)
+
+    # (활동, 매력) 조합을 비용 순으로 정렬하고, B 최대일 때도 목표 미달인 조합은 미리 제외
+    pair_cost = (activity_cost[:, None] + charm_cost[None, :]).ravel()
+    pair_best = _relationship(base_values[-1], activity_score[:, None], charm_values[None, :]).ravel()
+    candidates = np.flatnonzero(pair_best >= target - _EPS)
+    candidates = candidates[np.argsort(pair_cost[candidates], kind='stable')]
+
+    best = None # (비용, -확률, 활동 idx, 매력 idx, 기본 idx)
+    checked = 0
+    complete = True
+    for pair in candidates:
+        if best is not None and pair_cost[pair] >= best[0] - _EPS:
+            break # 이후 조합은 비용이 더 크거나 같음 → 한정(bound)
+        if time.perf_counter() - started > time_budget:
+            complete = False
+            break
+        a, c = divmod(pair, len(charm_cost))
+        checked += 1
+        rel = _relationship(base_values, activity_score[a], charm_values[c])
+        b = int(np.argmax(rel >= target - _EPS)) # B 전선은 비용과 점수가 함께 증가 → 처음 도달 지점이 최소 비용
+        candidate = (pair_cost[pair] + base_cost[b], -rel[b], a, c, b)
+        if best is None or candidate[:2] < best[:2]:
+            best = candidate
+
+    if best is None: # 시간 초과로 하나도 못 찾은 경우
+        return GoalResult(False, target, start_prob, start_prob, max_prob, None, [], complete,
+                          time.perf_counter() - started, checked)
+
+    total_cost, _, a, c, b = best
+    picks = _trace_back(base_back, b) + _trace_back(charm_back, c)
+    changes = []
+    for field, value, steps in picks:
+        if steps > 0:
+            changes.append((field, value, steps))
+    for field in ('activity1', 'activity2', 'activity_freq', 'new_activity_try', 'apply_sim_result'):
+        value = activity_picks[field][a]
+        original = current[field][0]
+        if value != original:
+            steps = 1.0 if field in ('activity1', 'activity2', 'apply_sim_result') else abs(int(value) - int(original))
+            changes.append((field, value, steps))
+
+    final = {field: column.copy() for field, column in current.items()}
+    result_changes = []
+    for field, value, steps in changes:
+        final[field][0] = value
+        result_changes.append(Change(
+            field, love_model.INPUT_LABELS.get(field, field),
+            _display_value(field, current[field][0], activities_options), _display_value(field, value, activities_options),
+            int(round(steps)), steps * _step_cost(step_costs, field)))
+    achieved = float(love_model.score_batch(final, activities_options)['relationship_6m'][0])
+    return GoalResult(achieved >= target - 1e-6, target, start_prob, achieved, max_prob, float(total_cost),
+                      result_changes, complete, time.perf_counter() - started, checked)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""캐릭터 이미지 사전 디코딩/축소 캐시
+
+images/ 의 원본 PNG(장당 약 900KB)를 프로세스 시작 시 한 번만 디코딩해서
+화면 표시 너비로 줄이고, 작게 다시 인코딩한 바이트를 메모리에 보관합니다.
+
+st.image 는 RGB 이미지를 JPEG 으로 내보내고, 지정 너비보다 크거나 형식이 다르면
+매번 다시 디코딩/축소/인코딩합니다. 그래서 캐시에는 표시 너비 그대로의 JPEG 을 넣어
+st.image 가 바이트를 손대지 않고 그대로 보내도록 합니다. (알파 채널이 있는 이미지는 PNG)
+"""
+import io
+import os
+import threading
+import time
+from collections import namedtuple
+
+from PIL import Image
+
+IMAGE_DIR = "images"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# get_character_image_path 가 만드는 경로 조합 (성별 접두사 × 확률 구간 접미사)
+CHARACTER_PREFIXES = ("female_char", "male_char")
+CHARACTER_SUFFIXES = ("0_15.png", "15_35.png", "35_60.png", "60_plus.png")
+CHARACTER_IMAGE_WIDTH = 150 # 앱의 캐릭터 이미지 표시 너비
+DISPLAY_WIDTHS = (CHARACTER_IMAGE_WIDTH,) # 미리 만들어 둘 너비 목록
+JPEG_QUALITY = 85
+
+# 캐시 항목: 인코딩된 바이트와 크기/시간 정보
+CachedImage = namedtuple('CachedImage', ['data', 'format', 'width', 'height', 'source_bytes', 'build_seconds'])
+
+
+def character_image_paths():
+    """get_character_image_path 가 반환할 수 있는 여덟 가지 경로"""
+    return [f"{IMAGE_DIR}/{prefix}_{suffix}" for prefix in CHARACTER_PREFIXES for suffix in CHARACTER_SUFFIXES]
+
+
+def encode_thumbnail(image, width):
+    """이미지를 width 로 축소해서 (바이트, 형식, 크기) 반환"""
+    height = max(1, round(image.height * width / image.width))
+    thumb = image.resize((width, height), Image.LANCZOS) if image.width > width else image
+    buffer = io.BytesIO()
+    if thumb.mode in ("RGBA", "LA", "P"): # st.image 가 알파 채널 이미지는 PNG 로 보냄
+        fmt = "PNG"
+        thumb.save(buffer, fmt, optimize=True)
+    else:
+        fmt = "JPEG"
+        thumb.convert("RGB").save(buffer, fmt, quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue(), fmt, thumb.size
+
+
+class ImageCache:
+    """(이미지 경로, 표시 너비) → CachedImage"""
+
+    def __init__(self, base_dir=BASE_DIR, widths=DISPLAY_WIDTHS):
+        self.base_dir = base_dir
+        self.widths = tuple(widths)
+        self._items = {}
+        self.errors = {} # 경로 → 오류 메시지 (파일 없음 등)
+        self.build_seconds = 0.0
+        self.hits = 0
+        self.misses = 0 # 캐시에 없어서 원본 경로로 표시한 횟수
+
+    def build(self, paths=None):
+        """모든 캐릭터 이미지를 디코딩/축소/인코딩해서 캐시에 올림"""
+        started = time.perf_counter()
+        for path in paths or character_image_paths():
+            t0 = time.perf_counter()
+            full_path = os.path.join(self.base_dir, path)
+            try:
+                source_bytes = os.path.getsize(full_path)
+                with Image.open(full_path) as image:
+                    image.load()
+                    for width in self.widths:
+                        data, fmt, (w, h) = encode_thumbnail(image, width)
+                        self._items[(path, width)] = CachedImage(data, fmt, w, h, source_bytes, time.perf_counter() - t0)
+            except (OSError, ValueError) as e: # 파일이 없거나 깨진 경우: 앱은 원래 경로로 대체 표시
+                self.errors[path] = str(e)
+        self.build_seconds = time.perf_counter() - started
+        return self
+
+    def get(self, path, width):
+        """캐시된 바이트 (없으면 None)"""
+        item = self._items.get((path, width))
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return item.data
+
+    def stats(self):
+        """경로/너비별 원본 크기 대비 캐시 크기"""
+        rows = []
+        for (path, width), item in sorted(self._items.items()):
+            rows.append({
+                'path': path, 'width': width, 'format': item.format,
+                'source_bytes': item.source_bytes, 'cached_bytes': len(item.data),
+                'ratio': len(item.data) / item.source_bytes if item.source_bytes else None,
+                'build_ms': item.build_seconds * 1000,
+            })
+        return rows
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_image_cache():
+    """프로세스 전체에서 공유하는 캐시 (처음 호출할 때 한 번만 빌드)"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ImageCache().build()
+        return _shared_cache
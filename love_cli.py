@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""연애 확률 일괄 계산 CLI (Streamlit 없이 실행)
+
+CSV/Parquet 프로필 파일을 고정 크기 청크로 읽어 love_model.score_batch 로 계산하고,
+결과를 청크마다 바로 출력 파일에 이어 씁니다. 입력 크기와 상관없이 메모리는 청크 하나 분량만 사용합니다.
+
+입력 열은 앱의 params 와 같은 이름을 씁니다 (appearance 대신 appearance_self/appearance_others 도 가능).
+
+예:
+    python love_cli.py profiles.csv -o scored.csv
+    python love_cli.py profiles.parquet -o scored.parquet --chunk-size 200000 --stats
+"""
+import time
+
+_import_started = time.perf_counter()
+import argparse  # noqa: E402
+import sys  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+import love_model  # noqa: E402
+
+IMPORT_SECONDS = time.perf_counter() - _import_started # 모델/의존성 import 시간
+
+DEFAULT_CHUNK_SIZE = 100_000
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+SCORE_COLUMNS = ['base_score', 'encounter_prob', 'relationship_prob'] + [
+    f'{kind}_{months}m' for months in love_model.PERIOD_MONTHS for kind in ('encounter', 'relationship')]
+
+
+def detect_format(path, fmt):
+    """명시한 형식이 없으면 확장자로 csv / parquet 판단"""
+    if fmt:
+        return fmt
+    return "parquet" if path.lower().endswith(PARQUET_EXTENSIONS) else "csv"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet 입출력에는 pyarrow 가 필요합니다: pip install pyarrow")
+    return pq
+
+
+def read_chunks(path, fmt, chunk_size):
+    """입력 파일을 chunk_size 행씩 DataFrame 으로 읽음"""
+    if fmt == "parquet":
+        pq = _require_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path if path != "-" else sys.stdin, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """청크 단위로 결과를 이어 쓰는 출력기 (CSV 는 첫 청크만 헤더 포함)"""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, df):
+        if self.fmt == "parquet":
+            pq = _require_pyarrow()
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            target = sys.stdout if self.path == "-" else self.path
+            df.to_csv(target, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_frame(df, round_digits=None):
+    """입력 DataFrame 에 점수/확률 열을 붙여 반환"""
+    if 'appearance' not in df.columns:
+        # 앱과 같은 방식: 스스로 평가와 주변 평가의 평균
+        df = df.assign(appearance=(df['appearance_self'] + df['appearance_others']) / 2)
+    scores = pd.DataFrame(love_model.score_batch(df), index=df.index)[SCORE_COLUMNS]
+    if round_digits is not None:
+        scores = scores.round(round_digits)
+    return pd.concat([df, scores], axis=1)
+
+
+def peak_rss_mb():
+    """프로세스 최대 메모리 사용량 (MB, 지원되지 않으면 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="연애 확률 일괄 계산 (CSV/Parquet 스트리밍)")
+    parser.add_argument("input", help="입력 파일 (CSV 는 - 로 stdin 가능)")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본: stdout, CSV)")
+    parser.add_argument("--input-format", choices=["csv", "parquet"], help="기본: 확장자로 판단")
+    parser.add_argument("--output-format", choices=["csv", "parquet"], help="기본: 확장자로 판단")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="한 번에 처리할 행 수")
+    parser.add_argument("--round", type=int, default=None, dest="round_digits", help="결과 소수점 자릿수")
+    parser.add_argument("--stats", action="store_true", help="import 시간, 처리량(rows/sec), 최대 메모리를 stderr 에 출력")
+    args = parser.parse_args(argv)
+
+    input_format = detect_format(args.input, args.input_format)
+    output_format = detect_format(args.output, args.output_format)
+    if output_format == "parquet" and args.output == "-":
+        parser.error("Parquet 출력은 파일 경로가 필요합니다.")
+
+    writer = ChunkWriter(args.output, output_format)
+    rows = 0
+    started = time.perf_counter()
+    try:
+        for chunk in read_chunks(args.input, input_format, args.chunk_size):
+            writer.write(score_frame(chunk, args.round_digits))
+            rows += len(chunk)
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+
+    if args.stats:
+        rss = peak_rss_mb()
+        print(f"import {IMPORT_SECONDS * 1000:.0f}ms, {rows:,} rows in {elapsed:.2f}s "
+              f"({rows / elapsed if elapsed else 0:,.0f} rows/sec)"
+              + (f", peak RSS {rss:.0f}MB" if rss is not None else ""), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
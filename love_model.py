@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""연애 확률 시뮬레이터 점수 계산 모델 (Streamlit/네트워크 없이 import 가능)
+
+- 프로필 하나용 함수: calculate_base_score_v2, calculate_encounter_prob_v2,
+  calculate_relationship_prob_v2, apply_time_decay_v2, get_character_image_path
+- 여러 프로필용 배치 엔진 (NumPy 벡터화): score_batch 등 *_batch 함수
+  입력은 params 와 같은 필드를 가진 DataFrame / 구조화 배열 / 열 딕셔너리입니다.
+프로필 하나용 함수도 내부적으로 배치 엔진을 호출하므로 두 경로의 계산 결과는 같습니다.
+(love_profile.Profile 을 넘기면 라벨 변환 없이 정수 코드 한 행으로 배치 엔진에 넣습니다.)
+"""
+import numpy as np
+import pandas as pd
+
+# --- 활동별 점수 (앱의 '활동 1/2' 선택지) ---
+activities_options = {
+    "선택 안 함": 0, "집콕(영화/게임/독서 등)": -5, "스터디/외국어 학원": 5,
+    "공연/전시/사진/글쓰기": 10, "봉사활동/종교활동": 15, "요가/필라테스": 10,
+    "등산/여행 동호회": 15, "러닝 크루 (건강+균형)": 20, "댄스/음악/미술 학원": 12,
+    "헬스장(주로 혼자)": 3, "축구/농구/야구 동호회": 8, "주짓수/격투기/서핑": 25,
+    "게임/IT 동아리": 5, "자동차/바이크 동호회": 8
+}
+
+# --- 범주형 입력값 목록 (위젯 옵션 순서 그대로, 리스트 위치 = 정수 코드) ---
+CATEGORY_LEVELS = {
+    'activity_range': ["집-회사 위주", "동네 중심", "시내/핫플 자주 감", "지역/해외 이동 잦음"],
+    'living_env': ["부모님과 거주", "자취/독립"],
+    'proactiveness': ["거의 없음", "분기 1회", "월 1회", "주 1회 이상"],
+    'style_effort': ["거의 안 함", "가끔 신경 씀", "적극 투자/컨설팅"],
+    'skin_hair_care': ["기본만", "주기적 관리", "시술/전문 관리"],
+    'body_care_effort': ["안 함", "주 1-2회", "주 3회 이상", "PT/식단 병행"],
+    'manner_effort': ["의식 안 함", "가끔 노력", "적극 교정/학습"],
+    'health_care': ["관리 안 함", "노력 중", "성공/비해당"],
+    'activity_freq': ["월 1회 미만", "월 1-2회", "주 1회", "주 2회 이상"],
+    'new_activity_try': ["안 함", "연 1-2회", "분기 1회", "적극적"],
+}
+
+# --- 숫자 입력값 범위 (최소, 최대, 한 칸) : 앱의 slider / number_input 과 동일 ---
+# appearance 는 두 외모 슬라이더(1~10)의 평균이라 0.5 단위
+NUMERIC_RANGES = {
+    'appearance': (1, 10, 0.5),
+    'work_gender_ratio': (0, 100, 1),
+    'network_size': (0, 50, 1),
+    'network_quality': (1, 5, 1),
+    'resilience': (1, 5, 1),
+    'confidence': (1, 10, 1),
+    'openness': (1, 5, 1),
+    'high_filters': (0, 10, 1),
+    'medium_filters': (0, 10, 1),
+    'low_filters': (0, 10, 1),
+}
+
+# 입력값 화면 이름 (분석 결과 표시용)
+INPUT_LABELS = {
+    'appearance': "종합 외모 매력도", 'style_effort': "스타일링/패션 개선 노력", 'skin_hair_care': "피부/헤어 관리 수준",
+    'body_care_effort': "다이어트/운동", 'manner_effort': "표정/자세/말투 개선 노력", 'health_care': "건강 관리",
+    'activity_range': "주요 활동 반경", 'network_size': "소개 가능한 친구/지인 수", 'work_gender_ratio': "직장 내 이성 비율",
+    'network_quality': "친구/지인의 소개 적극성", 'living_env': "주거 환경", 'proactiveness': "새로운 만남 시도 빈도",
+    'resilience': "거절/실패 회복탄력성", 'confidence': "자기 자신감 수준", 'openness': "타인에 대한 개방성/호기심",
+    'high_filters': "높은 장벽 필터 개수", 'medium_filters': "중간 장벽 필터 개수", 'low_filters': "낮은 장벽 필터 개수",
+    'apply_sim_result': "결과 참고 노력 의향", 'activities': "활동 1/2", 'activity1': "활동 1", 'activity2': "활동 2",
+    'activity_freq': "활동 참여 빈도", 'new_activity_try': "새로운 활동 시도 적극성",
+}
+
+# --- 코드별 점수 테이블 (CATEGORY_LEVELS 와 같은 순서) ---
+ACTIVITY_RANGE_POINTS = np.array([-5, 0, 3, 6], dtype=np.float64)
+LIVING_ENV_POINTS = np.array([0, 3], dtype=np.float64)
+PROACTIVENESS_POINTS = np.array([-10, 0, 3, 8], dtype=np.float64)
+ACTIVITY_FREQ_MULTIPLIERS = np.array([1.0, 1.2, 1.5, 1.8])
+NEW_ACTIVITY_TRY_POINTS = np.array([0, 0, 5, 10], dtype=np.float64)
+CHARM_POINTS = {
+    'style_effort': np.array([0, 3, 8], dtype=np.float64),
+    'skin_hair_care': np.array([0, 3, 7], dtype=np.float64),
+    'body_care_effort': np.array([0, 2, 5, 9], dtype=np.float64),
+    'manner_effort': np.array([0, 2, 6], dtype=np.float64),
+    'health_care': np.array([0, 1, 4], dtype=np.float64),
+}
+APPLY_SIM_RESULT_BONUS = 3.0
+
+# 단계별로 읽는 입력 (기본 점수 / 활동 점수 / 매력 관리 점수), 나머지 입력(솔로 기간, 나이대 등)은 모델이 읽지 않음
+BASE_FIELDS = ('appearance', 'activity_range', 'network_size', 'network_quality', 'work_gender_ratio', 'living_env',
+               'proactiveness', 'resilience', 'confidence', 'openness', 'high_filters', 'medium_filters', 'low_filters')
+ACTIVITY_FIELDS = ('activity1', 'activity2', 'activity_freq', 'new_activity_try', 'apply_sim_result')
+CHARM_FIELDS = tuple(CHARM_POINTS)
+MODEL_FIELDS = BASE_FIELDS + ACTIVITY_FIELDS + CHARM_FIELDS
+
+# 기간별 시간 보정 계수 (apply_time_decay_v2 와 동일)
+PERIOD_MONTHS = (3, 6, 12)
+PERIOD_DECAY_FACTORS = (0.6, 1.0, 1.3)
+
+# 월별 곡선: 모델 확률은 6개월 누적 확률로 봄
+REFERENCE_MONTHS = 6
+# 'legacy' 프리셋: 3/6/12개월 보정 계수를 지나는 꺾은선 (0개월 = 0, 12개월 이후는 1.3 유지), 최대 99%
+LEGACY_DECAY_POINTS = ((0, 0.0),) + tuple(zip(PERIOD_MONTHS, PERIOD_DECAY_FACTORS))
+LEGACY_MAX_PROB = 99.0
+CURVE_PRESETS = ('hazard', 'legacy')
+# 앱이 보여주는 곡선 (결과 표/차트, 가상 인구 순위, 몬테카를로 밴드가 모두 이 프리셋을 씀)
+APP_CURVE_PRESET = 'legacy'
+
+
+_SMALL_INPUT = 16 # 이 개수 이하의 라벨 목록은 룩업만으로 변환
+
+
+def _is_code_array(values):
+    """이미 정수 코드로 들어온 열인지 확인"""
+    dtype = getattr(values, 'dtype', None)
+    if dtype is None:
+        dtype = np.asarray(values).dtype
+    return dtype.kind in 'iu'
+
+
+def _label_codes(values, levels):
+    """라벨 배열 → levels 기준 정수 코드 (없는 라벨은 -1)
+
+    고유값만 먼저 뽑은 뒤(pd.factorize) 작은 룩업 테이블로 코드를 매깁니다.
+    """
+    lookup = {level: code for code, level in enumerate(levels)}
+    if isinstance(values, (list, tuple)) and len(values) <= _SMALL_INPUT:
+        # 프로필 몇 개(앱의 한 번 실행)는 pd.factorize 호출 비용이 더 커서 딕셔너리로 바로 변환
+        return np.array([lookup.get(value, -1) for value in values], dtype=np.intp), list(dict.fromkeys(values))
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object) if isinstance(values, (list, tuple)) else values)
+    table = np.array([lookup.get(u, -1) for u in uniques] + [-1], dtype=np.intp)
+    return table[codes], uniques
+
+
+def encode_category(values, name):
+    """범주형 라벨 배열을 정수 코드 배열로 변환 (이미 정수 코드면 범위만 확인)"""
+    levels = CATEGORY_LEVELS[name]
+    if _is_code_array(values):
+        codes = np.asarray(values, dtype=np.intp)
+        if codes.size <= _SMALL_INPUT: # 몇 개뿐이면 파이썬 min/max 가 ufunc reduce 두 번보다 빠름
+            values = codes.ravel().tolist()
+            low, high = (min(values), max(values)) if values else (0, 0)
+        else:
+            low, high = codes.min(), codes.max()
+        if low < 0 or high >= len(levels):
+            raise ValueError(f"'{name}' 코드는 0~{len(levels) - 1} 범위여야 합니다.")
+        return codes
+    codes, uniques = _label_codes(values, levels)
+    if codes.size and codes.min() < 0:
+        unknown = sorted(str(u) for u in uniques if u not in levels)
+        raise ValueError(f"알 수 없는 '{name}' 값: {unknown}")
+    return codes
+
+
+def _activity_point_table(activities_options):
+    """활동 점수표 배열, 마지막 칸에 0점을 붙여서 코드 -1 (없는 활동) 이 0점이 되도록 함"""
+    return np.append(np.fromiter(activities_options.values(), dtype=np.float64), 0.0)
+
+
+_DEFAULT_ACTIVITIES = activities_options
+_DEFAULT_ACTIVITY_POINTS = _activity_point_table(activities_options) # 기본 점수표는 매번 만들지 않음
+
+
+def activity_points(values, activities_options=activities_options):
+    """활동 이름 배열을 활동 점수 배열로 변환 (없는 활동은 0점)"""
+    points = _DEFAULT_ACTIVITY_POINTS if activities_options is _DEFAULT_ACTIVITIES else _activity_point_table(activities_options)
+    if _is_code_array(values):
+        return points[np.asarray(values, dtype=np.intp)]
+    codes, _ = _label_codes(values, list(activities_options))
+    return points[codes]
+
+
+def _column(data, name, dtype=np.float64):
+    return np.asarray(data[name], dtype=dtype)
+
+
+def base_score_raw_batch(data):
+    """0~100 으로 자르기 전의 기본 점수 (항목별 점수의 단순 합)"""
+    work_ratio = _column(data, 'work_gender_ratio')
+    score = np.full(work_ratio.shape, 50.0)
+    score += (_column(data, 'appearance') - 5) * 3.0
+    score += ACTIVITY_RANGE_POINTS[encode_category(data['activity_range'], 'activity_range')]
+    score += _column(data, 'network_size') * 0.8
+    score += (_column(data, 'network_quality') - 3) * 1.5
+    # 직장 이성 비율 (중심 50%에서 벗어날수록 감점 효과 유사)
+    score += np.where(work_ratio <= 50, (work_ratio / 100 - 0.5) * 10, (0.5 - work_ratio / 100) * 10)
+    score += LIVING_ENV_POINTS[encode_category(data['living_env'], 'living_env')]
+    score += PROACTIVENESS_POINTS[encode_category(data['proactiveness'], 'proactiveness')]
+    score += (_column(data, 'resilience') - 3) * 2.0
+    score += (_column(data, 'confidence') - 6) * 2.5
+    score += (_column(data, 'openness') - 3) * 2.0
+    filter_penalty = (_column(data, 'high_filters') * 5.0) + (_column(data, 'medium_filters') * 2.0) + (_column(data, 'low_filters') * 0.5)
+    score -= filter_penalty
+    return score
+
+
+def base_score_batch(data):
+    """calculate_base_score_v2 의 벡터화 버전 (0~100)"""
+    return np.clip(base_score_raw_batch(data), 0, 100)
+
+
+def activity_score_batch(data, activities_options=activities_options):
+    """활동(1/2, 빈도, 새로운 시도, 결과 참고 의향) 점수"""
+    activity_score = activity_points(data['activity1'], activities_options)
+    activity_score = activity_score + activity_points(data['activity2'], activities_options)
+    activity_score *= ACTIVITY_FREQ_MULTIPLIERS[encode_category(data['activity_freq'], 'activity_freq')]
+    activity_score += NEW_ACTIVITY_TRY_POINTS[encode_category(data['new_activity_try'], 'new_activity_try')]
+    activity_score += np.where(_column(data, 'apply_sim_result', bool), APPLY_SIM_RESULT_BONUS, 0.0)
+    return activity_score
+
+
+def encounter_prob_from_total(total_score):
+    """(기본 점수 + 활동 점수) → 만남 확률 (%)"""
+    prob = 1 / (1 + np.exp(-(np.asarray(total_score, dtype=np.float64) - 60) / 15))
+    return np.clip(prob, 0.05, 0.95) * 100
+
+
+def encounter_prob_batch(base_score, data, activities_options=activities_options):
+    """calculate_encounter_prob_v2 의 벡터화 버전 (%)"""
+    total_score = np.asarray(base_score, dtype=np.float64) + activity_score_batch(data, activities_options)
+    return encounter_prob_from_total(total_score)
+
+
+def charm_score_batch(data):
+    """외모/매력 관리 노력 점수 합계"""
+    charm = None
+    for name, points in CHARM_POINTS.items():
+        part = points[encode_category(data[name], name)]
+        charm = part if charm is None else charm + part
+    return charm
+
+
+def relationship_prob_from_charm(encounter_prob, base_score, charm_score):
+    """만남 확률, 기본 점수, 매력 관리 점수 → 연애 시작 확률 (%)"""
+    encounter_prob = np.asarray(encounter_prob, dtype=np.float64)
+    conversion_factor = (np.asarray(base_score, dtype=np.float64) + charm_score) / 200
+    conversion_factor = np.clip(0.1 + conversion_factor * 0.6, 0.1, 0.7)
+    prob = (encounter_prob / 100) * conversion_factor * 100
+    return np.maximum(0.0, np.minimum(encounter_prob, prob))
+
+
+def relationship_prob_batch(encounter_prob, base_score, data):
+    """calculate_relationship_prob_v2 의 벡터화 버전 (%)"""
+    return relationship_prob_from_charm(encounter_prob, base_score, charm_score_batch(data))
+
+
+def monthly_hazard(prob, months=REFERENCE_MONTHS):
+    """months 개월 누적 확률(%) → 매달 같은 확률로 일어난다고 볼 때의 월별 확률 (0~1)"""
+    return 1 - (1 - np.asarray(prob, dtype=np.float64) / 100) ** (1 / months)
+
+
+def legacy_decay_factors(months):
+    """'legacy' 프리셋의 개월별 보정 계수 (3/6/12개월은 0.6/1.0/1.3 그대로)"""
+    points_x, points_y = zip(*LEGACY_DECAY_POINTS)
+    return np.interp(np.asarray(months, dtype=np.float64), points_x, points_y)
+
+
+def probability_curves(encounter_prob, relationship_prob, months, preset='hazard'):
+    """6개월 기준 만남/연애 확률(%) 배열 → (프로필 수, 개월 수) 누적 확률 곡선 두 개
+
+    preset='hazard': 월별 확률이 일정하다고 보고 1 - (1 - p)^(m/6) (단조 증가, 100% 미만)
+    preset='legacy': 기존 apply_time_decay_v2 계수를 지나는 꺾은선 × 확률, 최대 99%
+    어느 쪽이든 연애 확률은 만남 확률을 넘지 않음
+    """
+    encounter_prob = np.asarray(encounter_prob, dtype=np.float64)[..., None]
+    relationship_prob = np.asarray(relationship_prob, dtype=np.float64)[..., None]
+    months = np.asarray(months, dtype=np.float64)
+    if preset == 'hazard':
+        exponent = months / REFERENCE_MONTHS
+        encounter = (1 - (1 - encounter_prob / 100) ** exponent) * 100
+        relationship = (1 - (1 - relationship_prob / 100) ** exponent) * 100
+    elif preset == 'legacy':
+        factors = legacy_decay_factors(months)
+        encounter = np.minimum(LEGACY_MAX_PROB, encounter_prob * factors)
+        relationship = np.minimum(LEGACY_MAX_PROB, relationship_prob * factors)
+    else:
+        raise ValueError(f"알 수 없는 곡선 프리셋입니다: {preset!r} (가능: {', '.join(CURVE_PRESETS)})")
+    return encounter, np.minimum(encounter, relationship)
+
+
+def curve_batch(data, horizon=12, preset='hazard', activities_options=activities_options):
+    """여러 프로필의 1~horizon 개월 누적 만남/연애 확률 곡선
+
+    반환: {'months': (개월,), 'encounter': (프로필, 개월), 'relationship': (프로필, 개월)} (%)
+    """
+    base_score = base_score_batch(data)
+    encounter_prob = encounter_prob_batch(base_score, data, activities_options)
+    relationship_prob = relationship_prob_batch(encounter_prob, base_score, data)
+    months = np.arange(1, horizon + 1)
+    encounter, relationship = probability_curves(encounter_prob, relationship_prob, months, preset)
+    return {'months': months, 'encounter': encounter, 'relationship': relationship}
+
+
+def score_batch(data, activities_options=activities_options):
+    """여러 프로필의 기본 점수, 만남/연애 확률과 3/6/12개월 확률을 한 번에 계산
+
+    반환값은 열 이름 → NumPy 배열 딕셔너리입니다 (pd.DataFrame(...) 으로 바로 변환 가능).
+    """
+    base_score = base_score_batch(data)
+    encounter_prob = encounter_prob_batch(base_score, data, activities_options)
+    relationship_prob = relationship_prob_batch(encounter_prob, base_score, data)
+    result = {
+        'base_score': base_score,
+        'encounter_prob': encounter_prob,
+        'relationship_prob': relationship_prob,
+    }
+    encounter, relationship = probability_curves(encounter_prob, relationship_prob, PERIOD_MONTHS, 'legacy')
+    for i, months in enumerate(PERIOD_MONTHS):
+        result[f'encounter_{months}m'] = encounter[:, i]
+        result[f'relationship_{months}m'] = relationship[:, i]
+    return result
+
+
+def params_to_columns(params):
+    """params 딕셔너리 하나를 길이 1 짜리 열 딕셔너리로 변환"""
+    return {key: [value] for key, value in params.items() if key != 'activities_options'}
+
+
+def profile_columns(params, n=1, activities_options=activities_options):
+    """현재 params 값을 n 행으로 복제한 열 딕셔너리 (범주형은 정수 코드, 변형 후보를 덮어쓸 바탕)"""
+    activity_names = list(activities_options)
+    columns = {}
+    for field in NUMERIC_RANGES:
+        columns[field] = np.full(n, float(params[field]))
+    for field, levels in CATEGORY_LEVELS.items():
+        columns[field] = np.full(n, levels.index(params[field]), dtype=np.intp)
+    columns['apply_sim_result'] = np.full(n, bool(params['apply_sim_result']))
+    for field in ('activity1', 'activity2'):
+        # 목록에 없는 활동은 마지막 코드(= 0점) 로
+        value = params[field]
+        columns[field] = np.full(n, activity_names.index(value) if value in activity_names else len(activity_names),
+                                 dtype=np.intp)
+    return columns
+
+
+def histogram_percentiles(counts, percentiles):
+    """0~100% 를 len(counts) 칸으로 나눈 히스토그램에서 백분위 값 (%, 칸 가운데)"""
+    cumulative = np.cumsum(counts)
+    ranks = np.asarray(percentiles, dtype=np.float64) / 100 * cumulative[-1]
+    bins = np.searchsorted(cumulative, np.maximum(ranks, 1), side='left')
+    return (bins + 0.5) * (100 / len(counts))
+
+
+def _is_profile(params):
+    """love_profile.Profile 인지 (love_profile 이 love_model 을 import 하므로 여기서 늦게 import)"""
+    from love_profile import Profile
+    return isinstance(params, Profile)
+
+
+def _single_columns(params):
+    """프로필 하나 → 배치 엔진 입력 (Profile 은 정수 코드 구조화 배열 한 행, 딕셔너리는 라벨 열)"""
+    if _is_profile(params):
+        return params.record()
+    return params_to_columns(params)
+
+
+# --- 시뮬레이션 로직 함수들 (v2.1 베이스, 프로필 하나용) ---
+# params: 앱의 params 딕셔너리 또는 love_profile.Profile (둘 다 배치 엔진으로 계산)
+def calculate_base_score_v2(params):
+    """입력 파라미터 기반으로 기본 점수 계산"""
+    return float(base_score_batch(_single_columns(params))[0])
+
+def calculate_encounter_prob_v2(base_score, params):
+    """기본 점수와 활동 기반으로 만남 확률 계산"""
+    columns = _single_columns(params)
+    return float(encounter_prob_batch([base_score], columns, params.get('activities_options', activities_options))[0])
+
+def calculate_relationship_prob_v2(encounter_prob, base_score, params):
+    """만남 확률과 매력 관리 기반으로 연애 시작 확률 계산"""
+    columns = _single_columns(params)
+    return float(relationship_prob_batch([encounter_prob], [base_score], columns)[0])
+
+def apply_time_decay_v2(prob, months):
+    """시간 경과에 따른 확률 조정 (단기 < 중기 < 장기)"""
+    if months == 3: decay_factor = 0.6 # 3개월 내에는 확률 낮게 조정
+    elif months == 6: decay_factor = 1.0 # 6개월 기준
+    else: decay_factor = 1.3 # 1년 내에는 확률 높게 조정
+    return min(99.0, prob * decay_factor) # 최대 99%
+
+# --- 성별 기반 캐릭터 이미지 선택 함수 ---
+def get_character_image_path(relationship_prob, user_gender):
+    """ 사용자의 성별에 따라 상대방 성별의 캐릭터 이미지 경로를 반환 """
+    # 사용자가 남성이면 여성 캐릭터, 여성이면 남성 캐릭터 표시
+    target_gender_prefix = "female_char" if user_gender == "남성" else "male_char"
+
+    # 확률 구간에 따라 파일명 접미사 결정
+    if relationship_prob < 15:
+        suffix = "0_15.png" # 예: images/female_char_0_15.png
+    elif relationship_prob < 35:
+        suffix = "15_35.png"
+    elif relationship_prob < 60:
+        suffix = "35_60.png"
+    else:
+        suffix = "60_plus.png"
+    # 최종 이미지 경로 반환 (images 폴더 안에 있다고 가정)
+    return f"images/{target_gender_prefix}_{suffix}"
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""작은 프로필 표현: 앱의 params 딕셔너리 대신 쓰는 정수 코드 레코드
+
+- Profile: 입력 하나 = 슬롯 하나 (__slots__), 범주형은 선택지 목록 위치(정수 코드), 숫자는 위젯 값 그대로.
+  읽기 전용 Mapping 이라 profile['activity_range'] 처럼 예전 params 와 같은 이름으로 라벨/값을 읽을 수 있어서
+  파이프라인/민감도 분석/목표 역산/실행 기록 코드는 그대로 씁니다. (activities_options 표는 들고 다니지 않음)
+- to_bytes / from_bytes: 모든 입력을 혼합 진법 정수 하나로 묶은 10바이트 (버전 1바이트 + 9바이트),
+  해시/캐시 키/저장용
+- pack_profiles / unpack_profiles: 여러 프로필을 열 단위 구조화 배열(행당 32바이트)로 묶음,
+  love_model 의 *_batch 함수에 그대로 넣을 수 있음
+
+love_model.calculate_*_v2 는 Profile 을 받으면 라벨 변환 없이 record() (구조화 배열 한 행) 를 배치 엔진에 넣습니다.
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+import love_model
+
+FORMAT_VERSION = 1 # 필드/범위가 바뀌면 올림 (예전 바이트는 from_bytes 에서 거부)
+
+# 모델이 읽지 않는 앱 입력 (위젯 선택지 순서 그대로)
+DISPLAY_LEVELS = {
+    'solo_duration': ["6개월 미만", "6개월~2년", "2년 이상", "모태솔로"],
+    'gender': ["여성", "남성"],
+    'age_group': ["20대 초반", "20대 중후반", "30대 초반", "30대 중후반", "40대+"],
+    'exp_level': ["있음", "없음"],
+}
+ACTIVITY_NAMES = list(love_model.activities_options)
+# 범주형 필드 → 선택지 목록 (코드 = 목록 위치)
+LEVELS = {**DISPLAY_LEVELS, **love_model.CATEGORY_LEVELS, 'activity1': ACTIVITY_NAMES, 'activity2': ACTIVITY_NAMES}
+# 숫자 필드 → (최소, 최대), 외모는 두 슬라이더 값으로 저장하고 appearance 는 평균으로 계산
+APPEARANCE_SLIDER = (1, 10)
+NUMERIC_FIELDS = {'appearance_self': APPEARANCE_SLIDER, 'appearance_others': APPEARANCE_SLIDER,
+                  **{field: (low, high) for field, (low, high, _) in love_model.NUMERIC_RANGES.items()
+                     if field != 'appearance'}}
+FIELDS = tuple(LEVELS) + tuple(NUMERIC_FIELDS) + ('apply_sim_result',)
+# params 와 같은 키 목록 (appearance 포함, activities_options 제외)
+KEYS = FIELDS[:len(DISPLAY_LEVELS)] + ('appearance',) + FIELDS[len(DISPLAY_LEVELS):]
+
+# 혼합 진법: 필드마다 (최솟값, 가짓수)
+_RADIX = ([(0, len(levels)) for levels in LEVELS.values()]
+          + [(low, high - low + 1) for low, high in NUMERIC_FIELDS.values()] + [(0, 2)])
+_CAPACITY = 1
+for _, _count in _RADIX:
+    _CAPACITY *= _count
+PACKED_SIZE = 1 + (_CAPACITY.bit_length() + 7) // 8
+
+# 열 단위 레코드: 코드/위젯 값은 uint8, appearance 는 batch 함수가 바로 읽도록 float32 (0.5 단위라 정확)
+PROFILE_DTYPE = np.dtype([(field, np.uint8) for field in FIELDS] + [('appearance', np.float32)])
+
+
+def _code(field, value):
+    levels = LEVELS[field]
+    try:
+        return levels.index(value)
+    except ValueError:
+        raise ValueError(f"알 수 없는 '{field}' 값: {value!r}") from None
+
+
+def _number(field, value):
+    low, high = NUMERIC_FIELDS[field]
+    number = int(value)
+    if number != value or not low <= number <= high:
+        raise ValueError(f"'{field}' 는 {low}~{high} 정수여야 합니다: {value!r}")
+    return number
+
+
+def split_appearance(appearance):
+    """외모 평균(0.5 단위) → (스스로 평가, 주변 평가) 슬라이더 값 하나 (appearance 만 있는 입력용)"""
+    doubled = round(float(appearance) * 2)
+    if doubled != float(appearance) * 2:
+        raise ValueError(f"'appearance' 는 0.5 단위여야 합니다: {appearance!r}")
+    return doubled // 2, doubled - doubled // 2
+
+
+class Profile(Mapping):
+    """입력값 하나하나를 정수로 들고 있는 불변 프로필"""
+
+    __slots__ = FIELDS + ('_record',) # _record: record() 결과 캐시 (불변이라 한 번만 만듦)
+
+    def __init__(self, **values):
+        """위젯 값(라벨/숫자)으로 생성, appearance_self/others 대신 appearance 만 줘도 됨"""
+        if 'appearance_self' not in values and 'appearance' in values:
+            values['appearance_self'], values['appearance_others'] = split_appearance(values['appearance'])
+        missing = [field for field in FIELDS if field not in values]
+        if missing:
+            raise ValueError(f"프로필 입력이 빠졌습니다: {missing}")
+        for field in LEVELS:
+            object.__setattr__(self, field, _code(field, values[field]))
+        for field in NUMERIC_FIELDS:
+            object.__setattr__(self, field, _number(field, values[field]))
+        object.__setattr__(self, 'apply_sim_result', int(bool(values['apply_sim_result'])))
+
+    @classmethod
+    def from_params(cls, params):
+        """앱의 params 딕셔너리 → Profile (activities_options 등 모르는 키는 무시)"""
+        return cls(**{key: value for key, value in params.items() if key in FIELDS or key == 'appearance'})
+
+    @classmethod
+    def from_codes(cls, codes):
+        """FIELDS 순서의 정수 코드 → Profile (범위를 벗어난 코드는 ValueError)"""
+        codes = [int(code) for code in codes]
+        if len(codes) != len(FIELDS):
+            raise ValueError(f"코드는 {len(FIELDS)}개여야 합니다: {len(codes)}개")
+        for field, (low, count), code in zip(FIELDS, _RADIX, codes):
+            if not low <= code < low + count:
+                raise ValueError(f"'{field}' 코드는 {low}~{low + count - 1} 범위여야 합니다: {code}")
+        return cls._from_valid_codes(codes)
+
+    @classmethod
+    def _from_valid_codes(cls, codes):
+        profile = object.__new__(cls)
+        for field, code in zip(FIELDS, codes):
+            object.__setattr__(profile, field, code)
+        return profile
+
+    def codes(self):
+        return tuple(getattr(self, field) for field in FIELDS)
+
+    def record(self):
+        """구조화 배열 한 행 (love_model 의 *_batch 입력, 읽기 전용)"""
+        try:
+            return self._record
+        except AttributeError:
+            record = np.array([self.codes() + (self.appearance,)], dtype=PROFILE_DTYPE)
+            record.flags.writeable = False
+            object.__setattr__(self, '_record', record)
+            return record
+
+    def to_params(self):
+        """예전 params 딕셔너리 (activities_options 포함, 위젯 값과 같음)"""
+        return {**dict(self), 'activities_options': love_model.activities_options}
+
+    @property
+    def appearance(self):
+        return (self.appearance_self + self.appearance_others) / 2
+
+    # --- Mapping: 라벨/위젯 값으로 읽기 ---
+    def __getitem__(self, key):
+        if key in LEVELS:
+            return LEVELS[key][getattr(self, key)]
+        if key in NUMERIC_FIELDS or key == 'appearance':
+            return getattr(self, key)
+        if key == 'apply_sim_result':
+            return bool(self.apply_sim_result)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(KEYS)
+
+    def __len__(self):
+        return len(KEYS)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Profile 은 바꿀 수 없습니다 (replace 로 새로 만들기)")
+
+    def replace(self, **values):
+        """일부 입력만 바꾼 새 Profile"""
+        base = dict(self)
+        if 'appearance' in values and 'appearance_self' not in values: # 평균만 바꾸면 슬라이더 두 값을 다시 나눔
+            del base['appearance_self'], base['appearance_others']
+        return Profile(**{**base, **values})
+
+    # --- 바이트 직렬화 / 해시 ---
+    def to_bytes(self):
+        packed = 0
+        for (low, count), code in zip(reversed(_RADIX), reversed(self.codes())):
+            packed = packed * count + (code - low)
+        return bytes((FORMAT_VERSION,)) + packed.to_bytes(PACKED_SIZE - 1, 'little')
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) != PACKED_SIZE or data[0] != FORMAT_VERSION:
+            raise ValueError(f"Profile 바이트 형식이 아닙니다 (버전 {FORMAT_VERSION}, {PACKED_SIZE}바이트)")
+        packed = int.from_bytes(data[1:], 'little')
+        if packed >= _CAPACITY:
+            raise ValueError("Profile 바이트 값이 범위를 벗어났습니다")
+        codes = []
+        for low, count in _RADIX:
+            packed, code = divmod(packed, count)
+            codes.append(code + low)
+        return cls._from_valid_codes(codes) # 혼합 진법 풀기 결과는 항상 범위 안
+
+    def __eq__(self, other):
+        if isinstance(other, Profile):
+            return self.codes() == other.codes()
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash(self.codes())
+
+    def __reduce__(self):
+        return Profile.from_bytes, (self.to_bytes(),)
+
+    def __repr__(self):
+        return f"Profile({', '.join(f'{key}={value!r}' for key, value in self.items())})"
+
+
+def pack_profiles(profiles):
+    """Profile 목록 → 구조화 배열 (PROFILE_DTYPE, love_model.*_batch 에 그대로 사용 가능)"""
+    profiles = list(profiles)
+    records = np.zeros(len(profiles), dtype=PROFILE_DTYPE)
+    if profiles:
+        codes = np.array([profile.codes() for profile in profiles], dtype=np.uint8)
+        for i, field in enumerate(FIELDS):
+            records[field] = codes[:, i]
+        records['appearance'] = (codes[:, FIELDS.index('appearance_self')].astype(np.float32)
+                                 + codes[:, FIELDS.index('appearance_others')]) / 2
+    return records
+
+
+def unpack_profiles(records):
+    """구조화 배열 → Profile 목록 (범위를 벗어난 코드가 있으면 ValueError)"""
+    columns = []
+    for field, (low, count) in zip(FIELDS, _RADIX):
+        values = np.asarray(records[field])
+        bad = (values < low) | (values >= low + count)
+        if bad.any():
+            raise ValueError(f"'{field}' 코드는 {low}~{low + count - 1} 범위여야 합니다: "
+                             f"{np.flatnonzero(bad).size}개 행 ({values[bad][0]!r} 등)")
+        columns.append(values.tolist())
+    return [Profile._from_valid_codes(codes) for codes in zip(*columns)]
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""rerun 단위 계측: 구간별 소요 시간 요약(p50/p95/p99)과 카운터
+
+앱은 rerun 마다 start_rerun() 으로 Rerun 을 만들고,
+- lap(name): 직전 체크포인트부터 지금까지를 name 구간으로 기록 (스크립트가 위에서부터 진행되는 순서대로)
+- finish(): rerun 전체 시간 기록, 설정 시 구조화 로그 한 줄 (예외/st.stop/st.rerun 으로 끝나도 부르도록 finally 에서)
+구간 하나의 기록 비용은 perf_counter 두 번 + deque append 수준입니다.
+
+노출 방법 (환경 변수):
+- LOVE_SIM_METRICS=0: 계측 끔 (모든 호출이 아무 일도 안 함)
+- LOVE_SIM_METRICS_PORT=9464: 127.0.0.1:포트 에서 /metrics (Prometheus 텍스트), /metrics.json 제공
+- LOVE_SIM_METRICS_FILE=metrics.prom (또는 .json): rerun 이 끝날 때 최대 METRICS_FILE_INTERVAL 초마다 파일로 씀
+- LOVE_SIM_METRICS_LOG=1: rerun 마다 'love_sim.metrics' 로거에 JSON 한 줄
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+METRICS_ENABLED = os.environ.get("LOVE_SIM_METRICS", "1") != "0"
+METRICS_PORT = int(os.environ.get("LOVE_SIM_METRICS_PORT") or 0)
+METRICS_FILE = os.environ.get("LOVE_SIM_METRICS_FILE")
+METRICS_LOG = os.environ.get("LOVE_SIM_METRICS_LOG", "0") == "1"
+METRICS_FILE_INTERVAL = 5.0 # 초
+SUMMARY_WINDOW = 2048 # 구간별로 백분위 계산에 쓰는 최근 기록 수
+QUANTILES = (0.5, 0.95, 0.99)
+PREFIX = "love_sim_"
+
+logger = logging.getLogger("love_sim.metrics")
+
+
+class Summary:
+    """최근 window 개 기록의 백분위 + 전체 누적 횟수/합계"""
+
+    def __init__(self, window=SUMMARY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantiles(self, quantiles=QUANTILES):
+        if not self._samples:
+            return {q: None for q in quantiles}
+        values = np.percentile(np.fromiter(self._samples, dtype=np.float64), [q * 100 for q in quantiles])
+        return dict(zip(quantiles, values.tolist()))
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = ('{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"')) for name, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+class Registry:
+    """프로세스 전체 계측 저장소 (카운터 + 요약 + 스크랩 시 읽는 collector)"""
+
+    def __init__(self, enabled=True, log=False):
+        self.enabled = enabled
+        self.log = log
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float) # (이름, 라벨) → 값
+        self._summaries = {} # (이름, 라벨) → Summary
+        self._collectors = {} # 이름 → 함수() -> [(지표 이름, 라벨 딕셔너리, 값)] (카운터 형태)
+        self._file_written_at = 0.0
+        self.server = None
+
+    def inc(self, name, value=1, **labels):
+        if self.enabled:
+            with self._lock:
+                self._counters[(name, _label_key(labels))] += value
+
+    def observe(self, name, value, **labels):
+        if self.enabled:
+            key = (name, _label_key(labels))
+            with self._lock:
+                summary = self._summaries.get(key)
+                if summary is None:
+                    summary = self._summaries[key] = Summary()
+                summary.observe(value)
+
+    def set_collector(self, name, func):
+        """스크랩 시점에 값을 읽어 갈 함수 등록 (같은 이름이면 교체, rerun 마다 불러도 됨)"""
+        self._collectors[name] = func
+
+    def start_rerun(self):
+        return Rerun(self) if self.enabled else _NULL_RERUN
+
+    def _collected(self):
+        rows = []
+        for name, func in list(self._collectors.items()):
+            try:
+                rows.extend(func())
+            except Exception as e: # collector 오류가 스크랩을 막지 않도록
+                logger.warning("metrics collector %s failed: %s", name, e)
+        return rows
+
+    def snapshot(self):
+        """JSON 으로 내보낼 딕셔너리"""
+        with self._lock:
+            counters = [(name, dict(key), value) for (name, key), value in self._counters.items()]
+            summaries = [(name, dict(key), summary.count, summary.total, summary.quantiles())
+                         for (name, key), summary in self._summaries.items()]
+        counters += self._collected()
+        return {
+            'generated_at': time.time(),
+            'counters': [{'name': name, 'labels': labels, 'value': value} for name, labels, value in counters],
+            'summaries': [{'name': name, 'labels': labels, 'count': count, 'sum': total,
+                           'quantiles': {str(q): value for q, value in quantiles.items()}}
+                          for name, labels, count, total, quantiles in summaries],
+        }
+
+    def prometheus_text(self):
+        """Prometheus 텍스트 형식 (카운터는 counter, 구간 시간은 summary)"""
+        snapshot = self.snapshot()
+        lines, typed = [], set()
+        for counter in sorted(snapshot['counters'], key=lambda c: c['name']):
+            name = PREFIX + counter['name']
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format_labels(_label_key(counter['labels']))} {counter['value']:g}")
+        for summary in sorted(snapshot['summaries'], key=lambda s: s['name']):
+            name = PREFIX + summary['name']
+            key = _label_key(summary['labels'])
+            if name not in typed:
+                lines.append(f"# TYPE {name} summary")
+                typed.add(name)
+            for q, value in summary['quantiles'].items():
+                if value is not None:
+                    lines.append(f"{name}{_format_labels(key, [('quantile', q)])} {value:.6g}")
+            lines.append(f"{name}_sum{_format_labels(key)} {summary['sum']:.6g}")
+            lines.append(f"{name}_count{_format_labels(key)} {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path, force=False):
+        """METRICS_FILE_INTERVAL 초에 한 번만 파일로 씀 (.json 이면 JSON, 아니면 Prometheus 텍스트)"""
+        now = time.time()
+        if not force and now - self._file_written_at < METRICS_FILE_INTERVAL:
+            return False
+        self._file_written_at = now
+        content = (json.dumps(self.snapshot(), ensure_ascii=False) if path.endswith(".json")
+                   else self.prometheus_text())
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path) # 스크랩하는 쪽이 반쯤 쓴 파일을 읽지 않도록
+        return True
+
+    def serve(self, port, host="127.0.0.1"):
+        """/metrics, /metrics.json 을 제공하는 HTTP 서버를 백그라운드 스레드로 시작"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body = json.dumps(registry.snapshot(), ensure_ascii=False).encode("utf-8")
+                    content_type = "application/json"
+                elif self.path.startswith("/metrics"):
+                    body = registry.prometheus_text().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True).start()
+        return self.server
+
+
+class Rerun:
+    """rerun 한 번의 구간 기록기"""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.spans = {} # 구간 이름 → 초 (로그용)
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self._record(name, now - self._last)
+        self._last = now
+
+    def _record(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+        self.registry.observe("span_seconds", seconds, span=name)
+
+    def finish(self, **fields):
+        """rerun 전체 시간 기록 (+ 파일/로그 출력), fields 는 로그 줄에 같이 남길 값"""
+        total = time.perf_counter() - self.started
+        registry = self.registry
+        registry.observe("rerun_seconds", total)
+        registry.inc("reruns_total")
+        if METRICS_FILE:
+            registry.write_file(METRICS_FILE)
+        if registry.log:
+            logger.info(json.dumps({'event': 'rerun', 'seconds': round(total, 6),
+                                    'spans': {name: round(seconds, 6) for name, seconds in self.spans.items()},
+                                    **fields}, ensure_ascii=False, default=str))
+        return total
+
+
+class _NullRerun:
+    """계측을 끈 경우의 Rerun (아무것도 기록하지 않음)"""
+
+    spans = {}
+
+    def lap(self, name):
+        pass
+
+    def finish(self, **fields):
+        return 0.0
+
+
+_NULL_RERUN = _NullRerun()
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def _enable_log_output():
+    """rerun 로그가 실제로 보이도록 'love_sim.metrics' 로거에 INFO 레벨 + stderr 핸들러를 붙임
+
+    로깅 설정이 없으면 로거의 실효 레벨이 WARNING 이라 logger.info 줄이 버려지기 때문.
+    이미 핸들러가 있으면(앱이 직접 설정한 경우) 레벨만 맞춤.
+    """
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False # 루트 로거 설정이 있어도 두 번 찍히지 않도록
+
+
+def get_registry():
+    """프로세스 공유 Registry (처음 부를 때 환경 변수대로 HTTP 서버 시작)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = Registry(enabled=METRICS_ENABLED, log=METRICS_LOG)
+            if METRICS_ENABLED and METRICS_LOG:
+                _enable_log_output()
+            if METRICS_ENABLED and METRICS_PORT:
+                try:
+                    _registry.serve(METRICS_PORT)
+                except OSError as e: # 포트 사용 중이어도 앱은 계속 동작
+                    logger.warning("metrics server on port %s failed: %s", METRICS_PORT, e)
+        return _registry
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""몬테카를로 모드: 입력의 불확실성을 반영한 기간별 확률 범위(백분위 밴드)
+
+외모 평가(스스로/주변)와 슬라이더 입력은 정확한 값이 아니라고 보고, 입력값 주변의 정규분포에서
+시나리오 N 개를 뽑습니다 (위젯 범위로 자름). 시나리오마다 love_model 로 6개월 만남/연애 확률을 계산하고
+결과 표와 같은 기간별 곡선(love_model.APP_CURVE_PRESET)을 누적 분포로 보고 첫 만남/첫 연애가 몇 번째 달에
+일어나는지 뽑습니다. 그래서 밴드는 표에 보이는 값을 둘러쌉니다 (입력 오차가 없으면 중앙값 = 표 값).
+
+- 밴드: 시나리오별 m개월 누적 확률의 백분위 (곡선은 6개월 확률에 대해 단조 → 6개월 확률의 히스토그램만 모으면 됨)
+- 시뮬레이션 값: 전체 시나리오 중 m개월 안에 실제로 사건이 일어난 비율
+
+모든 계산은 NumPy 배열 연산이고 chunk_size 개씩 나눠 처리하므로 메모리는 N 과 상관없이 청크 하나 + 히스토그램 분량입니다.
+"""
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import love_model
+
+DEFAULT_SCENARIOS = 100_000
+DEFAULT_CHUNK_SIZE = 25_000
+DEFAULT_HORIZON = 12 # 개월
+DEFAULT_PERCENTILES = (10, 50, 90)
+HIST_BINS = 10_000 # 0~100% 를 0.01%p 단위로 나눈 히스토그램
+
+# 입력별 불확실성 (정규분포 표준편차, 위젯 단위)
+NOISE_STD = {
+    'appearance_self': 1.0, 'appearance_others': 1.0,
+    'work_gender_ratio': 10.0, 'network_quality': 0.5,
+    'resilience': 0.5, 'confidence': 1.0, 'openness': 0.5,
+}
+APPEARANCE_RANGE = (1, 10) # 외모 평가 슬라이더 범위
+
+MonteCarloResult = namedtuple('MonteCarloResult', ['bands', 'scenarios', 'seed', 'elapsed'])
+
+
+def _sample_inputs(params, rng, n, noise_std):
+    """noise_std 에 있는 입력만 정규분포로 흔든 n 개 시나리오 열 딕셔너리"""
+    columns = love_model.profile_columns(params, n, params.get('activities_options', love_model.activities_options))
+    appearance = []
+    for field in ('appearance_self', 'appearance_others'):
+        center = float(params.get(field, params['appearance']))
+        values = center + rng.standard_normal(n) * noise_std.get(field, 0.0)
+        appearance.append(np.clip(values, *APPEARANCE_RANGE))
+    columns['appearance'] = (appearance[0] + appearance[1]) / 2
+    for field, std in noise_std.items():
+        if field in love_model.NUMERIC_RANGES and std:
+            low, high, _ = love_model.NUMERIC_RANGES[field]
+            columns[field] = np.clip(columns[field] + rng.standard_normal(n) * std, low, high)
+    return columns
+
+
+def _first_event_months(rng, encounter_curve, relationship_curve):
+    """첫 만남 / 첫 연애 달 (1부터, 기간 안에 없으면 개월 수 + 1)
+
+    (시나리오, 개월) 누적 확률(%) 곡선을 누적 분포로 보고 역함수로 뽑음 (u 이상이 되는 첫 달).
+    두 사건에 같은 u 를 쓰고 연애 곡선 ≤ 만남 곡선이라 연애가 만남보다 먼저 일어나지 않음
+    """
+    u = rng.random(len(encounter_curve))[:, None] * 100
+    return (encounter_curve < u).sum(axis=1) + 1, (relationship_curve < u).sum(axis=1) + 1
+
+
+def simulate_bands(params, scenarios=DEFAULT_SCENARIOS, horizon=DEFAULT_HORIZON, seed=0,
+                   chunk_size=DEFAULT_CHUNK_SIZE, noise_std=None, percentiles=DEFAULT_PERCENTILES):
+    """기간(1~horizon 개월)별 만남/연애 누적 확률의 백분위 밴드와 시뮬레이션 발생 비율
+
+    반환: MonteCarloResult — bands 는 '개월' 인덱스 DataFrame (st.line_chart 에 바로 사용 가능)
+    열: 만남/연애 × 백분위 (예: '연애 p10 (%)'), '만남 시뮬레이션 (%)', '연애 시뮬레이션 (%)'
+    """
+    started = time.perf_counter()
+    noise_std = NOISE_STD if noise_std is None else noise_std
+    rng = np.random.default_rng(seed)
+    encounter_hist = np.zeros(HIST_BINS, dtype=np.int64)
+    relationship_hist = np.zeros(HIST_BINS, dtype=np.int64)
+    encounter_events = np.zeros(horizon + 2, dtype=np.int64) # 인덱스 = 첫 사건 달 (horizon+1 = 기간 밖)
+    relationship_events = np.zeros(horizon + 2, dtype=np.int64)
+    months = np.arange(1, horizon + 1)
+
+    for start in range(0, scenarios, chunk_size):
+        n = min(chunk_size, scenarios - start)
+        scores = love_model.score_batch(_sample_inputs(params, rng, n, noise_std),
+                                        params.get('activities_options', love_model.activities_options))
+        encounter_prob, relationship_prob = scores['encounter_prob'], scores['relationship_prob']
+        for prob, hist in ((encounter_prob, encounter_hist), (relationship_prob, relationship_hist)):
+            hist += np.bincount(np.minimum((prob * (HIST_BINS / 100)).astype(np.intp), HIST_BINS - 1),
+                                minlength=HIST_BINS)
+        encounter_month, relationship_month = _first_event_months(
+            rng, *love_model.probability_curves(encounter_prob, relationship_prob, months, love_model.APP_CURVE_PRESET))
+        encounter_events += np.bincount(encounter_month, minlength=horizon + 2)
+        relationship_events += np.bincount(relationship_month, minlength=horizon + 2)
+
+    bands = {}
+    for label, hist, events in (("만남", encounter_hist, encounter_events),
+                                ("연애", relationship_hist, relationship_events)):
+        quantiles = love_model.histogram_percentiles(hist, percentiles)
+        curves, _ = love_model.probability_curves(quantiles, quantiles, months, love_model.APP_CURVE_PRESET) # (백분위, 개월)
+        for percentile, curve in zip(percentiles, curves):
+            bands[f"{label} p{percentile} (%)"] = curve
+        bands[f"{label} 시뮬레이션 (%)"] = np.cumsum(events[1:horizon + 1]) / scenarios * 100
+    frame = pd.DataFrame(bands, index=pd.Index(months, name='개월'))
+    return MonteCarloResult(frame, scenarios, seed, time.perf_counter() - started)
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""결과 계산 파이프라인: 단계별로 읽는 입력만 키로 쓰는 메모이제이션
+
+기본 점수 → 만남 확률 → 연애 확률 → 1~12개월 곡선 → 결과 DataFrame (3/6/12개월 세 행) → 코멘트/레시피 텍스트
+(+ 민감도 분석) 각 단계는 자신이 직접 읽는 params 항목과 앞 단계를 선언합니다.
+단계의 캐시 키는 앞 단계까지 거슬러 올라간 입력 항목 값의 튜플이라서, 예를 들어 솔로 기간/나이대처럼
+모델이 읽지 않는 입력만 바뀌면 모든 단계가 캐시에서, 성별만 바뀌면 텍스트 단계만 다시 계산됩니다.
+
+캐시는 세션별 LRU(작게) → 프로세스 공유 LRU(크게) 순서로 찾고, 단계별 hit/miss 를 셉니다.
+캐시 값은 모든 세션이 같이 쓰므로 저장할 때 읽기 전용으로 바꾸고 (배열 writeable=False, 딕셔너리 → MappingProxyType,
+리스트 → 튜플), DataFrame 은 꺼낼 때마다 복사해서 줍니다. 한 세션이 결과를 고쳐도 다른 세션에는 퍼지지 않습니다.
+"""
+import threading
+from collections import Counter, OrderedDict, namedtuple
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+import love_model
+import love_profile
+import sensitivity
+
+DEFAULT_GLOBAL_CACHE_SIZE = 2048 # 단계 결과 개수 (모든 세션 공유)
+DEFAULT_SESSION_CACHE_SIZE = 64 # 세션 하나당
+CURVE_HORIZON = 12 # 개월
+CURVE_PRESET = love_model.APP_CURVE_PRESET # 'legacy': 3/6/12개월 값은 기존 apply_time_decay_v2 와 동일
+
+Stage = namedtuple('Stage', ['name', 'fields', 'upstream', 'func', 'key_fields'])
+_MISSING = object()
+
+
+class LRUCache:
+    """크기 제한 LRU (스레드 안전)"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+                return value
+        return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SessionCache:
+    """세션(브라우저 탭) 하나의 캐시와 hit/miss 통계"""
+
+    def __init__(self, maxsize=DEFAULT_SESSION_CACHE_SIZE):
+        self.cache = LRUCache(maxsize)
+        self.stats = Counter() # (단계 이름, 'session_hit' | 'global_hit' | 'miss') → 횟수
+
+
+def _freeze(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _read_only(value):
+    """공유 캐시에 넣을 값: 배열/딕셔너리/리스트를 (안쪽까지) 읽기 전용으로"""
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, dict):
+        return MappingProxyType({key: _read_only(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_read_only(item) for item in value)
+    return value
+
+
+def _handout(value):
+    """캐시 값을 세션에 넘길 때: DataFrame 은 읽기 전용으로 만들 수 없어서 복사본을 줌"""
+    return value.copy() if isinstance(value, pd.DataFrame) else value
+
+
+class Pipeline:
+    """단계 등록/평가기 — 등록 순서가 곧 계산 순서"""
+
+    def __init__(self, global_cache_size=DEFAULT_GLOBAL_CACHE_SIZE, session_cache_size=DEFAULT_SESSION_CACHE_SIZE):
+        self.stages = OrderedDict()
+        self.global_cache = LRUCache(global_cache_size)
+        self.session_cache_size = session_cache_size
+        self.stats = Counter() # 모든 세션 합계
+        self._stats_lock = threading.Lock()
+
+    def stage(self, name, fields=(), upstream=()):
+        """단계 함수 등록 데코레이터: func(params, *앞 단계 결과)"""
+        def register(func):
+            key_fields = set(fields)
+            for parent in upstream:
+                key_fields.update(self.stages[parent].key_fields)
+            self.stages[name] = Stage(name, tuple(fields), tuple(upstream), func, tuple(sorted(key_fields)))
+            return func
+        return register
+
+    def new_session(self):
+        return SessionCache(self.session_cache_size)
+
+    def stage_key(self, name, params):
+        stage = self.stages[name]
+        return (name,) + tuple(_freeze(params[field]) for field in stage.key_fields)
+
+    def evaluate(self, params, session=None, targets=None):
+        """targets(기본: 전체) 단계와 그 앞 단계들을 계산해서 {단계 이름: 결과} 반환
+
+        결과는 캐시와 공유하지 않는 DataFrame 복사본이거나 읽기 전용 값 (배열/MappingProxyType/튜플)
+        """
+        needed = self._required(targets or list(self.stages))
+        values = {}
+        for name, stage in self.stages.items():
+            if name not in needed:
+                continue
+            key = self.stage_key(name, params)
+            value, outcome = _MISSING, 'miss'
+            if session is not None:
+                value = session.cache.get(key)
+                outcome = 'session_hit' if value is not _MISSING else 'miss'
+            if value is _MISSING:
+                value = self.global_cache.get(key)
+                outcome = 'global_hit' if value is not _MISSING else 'miss'
+            if value is _MISSING:
+                value = _read_only(stage.func(params, *[values[parent] for parent in stage.upstream]))
+                self.global_cache.put(key, value)
+            if session is not None and outcome != 'session_hit':
+                session.cache.put(key, value)
+            values[name] = value
+            self._count(session, name, outcome)
+        return {name: _handout(value) for name, value in values.items()}
+
+    def stats_frame(self, session=None):
+        """단계별 hit/miss 표 (session 을 주면 그 세션 기준)"""
+        stats = session.stats if session is not None else self.stats
+        rows = []
+        for name in self.stages:
+            session_hit, global_hit, miss = (stats[(name, outcome)] for outcome in ('session_hit', 'global_hit', 'miss'))
+            total = session_hit + global_hit + miss
+            rows.append({'단계': name, '세션 캐시': session_hit, '공유 캐시': global_hit, '계산': miss,
+                         '적중률 (%)': (session_hit + global_hit) / total * 100 if total else 0.0})
+        return pd.DataFrame(rows).set_index('단계')
+
+    def _required(self, targets):
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name].upstream)
+        return needed
+
+    def _count(self, session, name, outcome):
+        with self._stats_lock:
+            self.stats[(name, outcome)] += 1
+        if session is not None:
+            session.stats[(name, outcome)] += 1
+
+
+def _columns(params, fields):
+    """단계 입력 열: Profile 은 저장된 정수 코드 레코드(record(), 라벨 변환 없음), 딕셔너리는 라벨 한 행"""
+    if isinstance(params, love_profile.Profile):
+        return params.record()
+    return {field: [params[field]] for field in fields}
+
+
+def result_texts(relationship_prob_6m, user_gender):
+    """6개월 연애 확률과 성별 → 캐릭터 이미지 경로, 대명사, 결과 코멘트, 캐릭터 감정 표현, 액션 레시피 (st 함수 이름, 텍스트)"""
+    pronoun_target = "그녀" if user_gender == "남성" else "그" # 상대방 지칭 대명사
+    pronoun_user = "당신" # 사용자 지칭 (혹은 "나" 로 변경 가능)
+
+    if relationship_prob_6m < 15:
+        result_comment = f"{pronoun_target}를 만나려면 아직 {pronoun_user}의 준비가 더 필요해 보여요! 🌱"
+    elif relationship_prob_6m < 35:
+        result_comment = f"{pronoun_target}도 {pronoun_user}을 궁금해할지 몰라요! 가능성이 보이니 힘내봐요! 💪"
+    elif relationship_prob_6m < 60:
+        result_comment = f"오! {pronoun_target}가 {pronoun_user}에게 다가오고 있을지도? {pronoun_target}가 웃고 있어요! 😊"
+    else:
+        result_comment = f"와우! {pronoun_target}가 {pronoun_user}을 향해 오고 있어요! {pronoun_target}의 환한 미소! 곧 좋은 소식 기대할게요! 💖"
+
+    # 확률 구간별 캐릭터 감정 표현 (공유 텍스트/공유 카드용)
+    if relationship_prob_6m < 15: char_feeling_text = f"{pronoun_target} 만나긴 멀었나... 캐릭터 눈물 😭"
+    elif relationship_prob_6m < 35: char_feeling_text = f"{pronoun_target} 올까 말까 고민 중... 🤔"
+    elif relationship_prob_6m < 60: char_feeling_text = f"{pronoun_target} 웃고 있다! 😊"
+    else: char_feeling_text = f"{pronoun_target} 완전 반했나봐! 🥰"
+
+    if relationship_prob_6m < 20:
+        recipe = ('info', f"🌱 **{pronoun_target}의 눈길 끌기 단계:** 지금은 {pronoun_target}의 시선을 사로잡을 만남 기회를 늘리는 게 중요해요! '주짓수'나 '러닝 크루' 같은 새로운 활동으로 매력을 보여주거나, '소개 가능한 친구'에게 {pronoun_target}같은 사람 없는지 물어보는 건 어떨까요? **'높은 장벽 필터'**가 {pronoun_target}의 접근을 막고 있진 않은지 점검해보세요!")
+    elif relationship_prob_6m < 50:
+        recipe = ('info', f"💪 **{pronoun_target}에게 다가가기 단계:** {pronoun_target}이 {pronoun_user} 주변에 나타나기 시작했어요! 이제 관계를 발전시킬 차례. '스타일링'에 투자해서 {pronoun_target}의 시선을 끌거나, '자신감'을 높여 {pronoun_user}의 매력을 어필해요. **{pronoun_target}가 당신에게 오기 위해 준비를 마쳤지만, {pronoun_user}의 '중간 장벽 필터' 한두 개만 낮춰주면 {pronoun_target}가 웃을지도 몰라요!** 😉")
+    else: # 50% 이상
+        recipe = ('success', f"🚀 **{pronoun_target} 맞이하기 단계:** 확률이 아주 높아요! {pronoun_target}가 거의 다 왔습니다! 지금처럼 꾸준히 매력을 유지하면서, 만나는 사람들과 진솔하게 교류하는 데 집중하세요. {pronoun_target}와의 좋은 결과가 곧 있을 거예요! **'낮은 장벽 필터'**는 너무 신경 쓰지 않아도 {pronoun_target}는 당신에게 반할 거예요!")
+
+    return {
+        'character_image_path': love_model.get_character_image_path(relationship_prob_6m, user_gender),
+        'pronoun_target': pronoun_target,
+        'pronoun_user': pronoun_user,
+        'result_comment': result_comment,
+        'char_feeling_text': char_feeling_text,
+        'recipe': recipe,
+    }
+
+
+def build_pipeline(global_cache_size=DEFAULT_GLOBAL_CACHE_SIZE, session_cache_size=DEFAULT_SESSION_CACHE_SIZE):
+    """앱 결과 화면용 파이프라인 (activities_options 는 love_model 기본 테이블 기준)"""
+    pipeline = Pipeline(global_cache_size, session_cache_size)
+
+    @pipeline.stage('base_score', fields=love_model.BASE_FIELDS)
+    def base_score(params):
+        return float(love_model.base_score_batch(_columns(params, love_model.BASE_FIELDS))[0])
+
+    @pipeline.stage('encounter_prob', fields=love_model.ACTIVITY_FIELDS, upstream=('base_score',))
+    def encounter_prob(params, base):
+        return float(love_model.encounter_prob_batch([base], _columns(params, love_model.ACTIVITY_FIELDS))[0])
+
+    @pipeline.stage('relationship_prob', fields=love_model.CHARM_FIELDS, upstream=('base_score', 'encounter_prob'))
+    def relationship_prob(params, base, encounter):
+        return float(love_model.relationship_prob_batch([encounter], [base], _columns(params, love_model.CHARM_FIELDS))[0])
+
+    @pipeline.stage('curves', upstream=('encounter_prob', 'relationship_prob'))
+    def curves(params, encounter, relationship):
+        months = np.arange(1, CURVE_HORIZON + 1)
+        encounter_curve, relationship_curve = love_model.probability_curves(encounter, relationship, months, CURVE_PRESET)
+        return {'months': months, 'encounter': encounter_curve, 'relationship': relationship_curve}
+
+    @pipeline.stage('results_frame', upstream=('curves',))
+    def results_frame(params, curve):
+        """앱에 보여주는 표/차트: 예전과 같은 3/6/12개월 세 행 (월별 곡선은 curves 단계)"""
+        rows = np.searchsorted(curve['months'], love_model.PERIOD_MONTHS)
+        period_labels = [f"{months}개월" for months in love_model.PERIOD_MONTHS]
+        # 반올림은 예전처럼 파이썬 round (DataFrame.round 는 0.05 경계에서 결과가 다를 수 있음)
+        return pd.DataFrame({
+            '만남 확률 (%)': [round(value, 1) for value in curve['encounter'][rows].tolist()],
+            '연애 시작 확률 (%)': [round(value, 1) for value in curve['relationship'][rows].tolist()],
+        }, index=pd.CategoricalIndex(period_labels, categories=period_labels, ordered=True, name='기간'))
+
+    @pipeline.stage('texts', fields=('gender',), upstream=('results_frame',))
+    def texts(params, results_df):
+        return result_texts(results_df.loc['6개월', '연애 시작 확률 (%)'], params['gender'])
+
+    @pipeline.stage('sensitivity', fields=love_model.MODEL_FIELDS)
+    def sensitivity_sweep(params):
+        return sensitivity.sensitivity_sweep(params)
+
+    return pipeline
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""가상 인구 분포: "내 6개월 연애 확률은 상위 몇 %?"
+
+모든 입력(다섯 개 입력 영역의 슬라이더/선택지, 활동 1·2 조합, 필터 개수)을 위젯 범위 안에서 균등하게 뽑은
+가상 인구 수천만 명을 chunk_size 명씩 love_model 로 계산하고, 6개월 만남/연애 확률의 히스토그램(0.01%p 단위)만
+누적합니다. 메모리는 인구 크기와 상관없이 청크 하나 + 히스토그램 분량입니다.
+
+완성된 분포는 모델 코드/샘플링 설정으로 정한 키의 .npz 파일로 디스크에 캐시하고, 불러올 때 "이 값 이상인 비율"
+표를 미리 만들어 두므로 요청 시점의 순위 조회는 배열 인덱스 하나(O(1))입니다.
+
+미리 만들기: python population.py --size 20000000
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+import love_model
+from monte_carlo import HIST_BINS
+
+DEFAULT_POPULATION = 20_000_000
+DEFAULT_CHUNK_SIZE = 250_000
+DEFAULT_CACHE_DIR = os.environ.get("LOVE_SIM_POPULATION_DIR",
+                                   os.path.join(os.path.dirname(os.path.abspath(__file__)), "population_cache"))
+SAMPLER_VERSION = 1 # 샘플링 방식을 바꾸면 올려서 예전 캐시를 쓰지 않도록
+KINDS = ('encounter', 'relationship') # 6개월 만남 / 연애 확률
+APPEARANCE_RANGE = (1, 10) # 외모 평가 슬라이더 두 개의 범위 (앱은 두 값의 평균을 씀)
+
+
+def sample_population(rng, n, activities_options=love_model.activities_options):
+    """n 명의 가상 프로필 열 딕셔너리 (범주형은 정수 코드, 숫자는 위젯 단위 그대로 균등 분포)"""
+    columns = {}
+    appearance_self = rng.integers(APPEARANCE_RANGE[0], APPEARANCE_RANGE[1] + 1, n)
+    appearance_others = rng.integers(APPEARANCE_RANGE[0], APPEARANCE_RANGE[1] + 1, n)
+    columns['appearance'] = (appearance_self + appearance_others) / 2
+    for field, (low, high, step) in love_model.NUMERIC_RANGES.items():
+        if field != 'appearance':
+            columns[field] = low + step * rng.integers(0, round((high - low) / step) + 1, n)
+    for field, levels in love_model.CATEGORY_LEVELS.items():
+        columns[field] = rng.integers(0, len(levels), n, dtype=np.int8)
+    columns['activity1'] = rng.integers(0, len(activities_options), n, dtype=np.int8)
+    columns['activity2'] = rng.integers(0, len(activities_options), n, dtype=np.int8)
+    columns['apply_sim_result'] = rng.random(n) < 0.5
+    return columns
+
+
+def _bins(prob):
+    """확률(%) → 히스토그램 칸 번호"""
+    return np.minimum((np.asarray(prob, dtype=np.float64) * (HIST_BINS / 100)).astype(np.intp), HIST_BINS - 1)
+
+
+def model_key(size, seed, chunk_size, activities_options=love_model.activities_options):
+    """캐시 파일 키: 모델 코드 + 활동 점수표 + 샘플링 설정이 같으면 같은 분포"""
+    digest = hashlib.sha1()
+    with open(love_model.__file__, "rb") as f:
+        digest.update(f.read())
+    digest.update(json.dumps([activities_options, SAMPLER_VERSION, HIST_BINS, size, seed, chunk_size],
+                             ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class PopulationStats:
+    """6개월 만남/연애 확률 히스토그램과 미리 계산한 순위 표"""
+
+    def __init__(self, counts, meta):
+        self.counts = counts # 종류 → (HIST_BINS,) int64
+        self.meta = meta
+        self.size = int(meta['size'])
+        # 칸 i 값 이상인 비율 (같은 칸 안은 절반만 위로 셈) → 조회는 인덱스 하나
+        self._top_share = {}
+        for kind, kind_counts in counts.items():
+            above = self.size - np.cumsum(kind_counts)
+            self._top_share[kind] = (above + kind_counts / 2) / max(self.size, 1) * 100
+
+    def top_percent(self, prob, kind='relationship'):
+        """prob(%) 가 가상 인구 중 상위 몇 % 인지 (작을수록 높은 순위)"""
+        index = int(float(prob) * (HIST_BINS / 100))
+        return float(self._top_share[kind][min(max(index, 0), HIST_BINS - 1)])
+
+    def percentiles(self, percentiles, kind='relationship'):
+        """가상 인구 분포의 백분위 값 (%)"""
+        return love_model.histogram_percentiles(self.counts[kind], percentiles)
+
+    def save(self, path):
+        """임시 파일에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path, meta=np.array(json.dumps(self.meta, ensure_ascii=False)),
+                 **{f"{kind}_counts": kind_counts for kind, kind_counts in self.counts.items()})
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            counts = {kind: data[f"{kind}_counts"].astype(np.int64) for kind in KINDS}
+        return cls(counts, meta)
+
+
+def build_population(size=DEFAULT_POPULATION, seed=0, chunk_size=DEFAULT_CHUNK_SIZE,
+                     activities_options=love_model.activities_options):
+    """가상 인구를 청크 단위로 뽑아 계산하면서 히스토그램만 누적"""
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    counts = {kind: np.zeros(HIST_BINS, dtype=np.int64) for kind in KINDS}
+    totals = {kind: 0.0 for kind in KINDS}
+    for start in range(0, size, chunk_size):
+        data = sample_population(rng, min(chunk_size, size - start), activities_options)
+        base_score = love_model.base_score_batch(data)
+        encounter_prob = love_model.encounter_prob_batch(base_score, data, activities_options)
+        relationship_prob = love_model.relationship_prob_batch(encounter_prob, base_score, data)
+        # 앱이 보여주는 6개월 값과 같은 곡선 계산
+        encounter, relationship = love_model.probability_curves(encounter_prob, relationship_prob,
+                                                                (love_model.REFERENCE_MONTHS,),
+                                                                love_model.APP_CURVE_PRESET)
+        for kind, values in (('encounter', encounter[:, 0]), ('relationship', relationship[:, 0])):
+            counts[kind] += np.bincount(_bins(values), minlength=HIST_BINS)
+            totals[kind] += float(values.sum())
+    meta = {
+        'size': size, 'seed': seed, 'chunk_size': chunk_size, 'hist_bins': HIST_BINS,
+        'sampler_version': SAMPLER_VERSION, 'mean': {kind: totals[kind] / max(size, 1) for kind in KINDS},
+        'built_at': time.time(), 'elapsed': time.perf_counter() - started,
+    }
+    return PopulationStats(counts, meta)
+
+
+def cache_path(size=DEFAULT_POPULATION, seed=0, chunk_size=DEFAULT_CHUNK_SIZE, cache_dir=DEFAULT_CACHE_DIR,
+               activities_options=love_model.activities_options):
+    return os.path.join(cache_dir, f"population_{model_key(size, seed, chunk_size, activities_options)}.npz")
+
+
+def load_or_build(size=DEFAULT_POPULATION, seed=0, chunk_size=DEFAULT_CHUNK_SIZE, cache_dir=DEFAULT_CACHE_DIR,
+                  activities_options=love_model.activities_options):
+    """디스크 캐시가 있으면 불러오고, 없거나 읽을 수 없으면 계산해서 저장"""
+    path = cache_path(size, seed, chunk_size, cache_dir, activities_options)
+    if os.path.exists(path):
+        try:
+            return PopulationStats.load(path)
+        except (OSError, ValueError, KeyError): # 깨진 캐시는 다시 만듦
+            pass
+    stats = build_population(size, seed, chunk_size, activities_options)
+    try:
+        stats.save(path)
+    except OSError: # 캐시를 못 써도 계산 결과는 사용
+        pass
+    return stats
+
+
+class PopulationLoader:
+    """앱용: 처음 get() 할 때 백그라운드 스레드에서 load_or_build, 준비되기 전에는 None
+
+    실패하면 error 에 사유를 남기고, retry_interval 초(실패할 때마다 두 배, 최대 max_retry_interval)가
+    지난 뒤의 get() 에서 다시 시도합니다.
+    """
+
+    def __init__(self, size=DEFAULT_POPULATION, seed=0, chunk_size=DEFAULT_CHUNK_SIZE, cache_dir=DEFAULT_CACHE_DIR,
+                 retry_interval=30.0, max_retry_interval=600.0):
+        self.size = size
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.cache_dir = cache_dir
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._next_retry = 0.0 # time.monotonic() 기준
+        self.failures = 0
+        self.stats = None
+        self.error = None # 마지막 실패 사유 (성공하면 None)
+
+    @property
+    def loading(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def get(self):
+        """준비된 PopulationStats (아직이면 None, 계산을 기다리지 않음)"""
+        if self.stats is None and self._thread is None and time.monotonic() >= self._next_retry:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._load, name="population-loader", daemon=True)
+                    self._thread.start()
+        return self.stats
+
+    def wait(self, timeout=None):
+        """준비될 때까지 기다림 (스크립트/테스트용)"""
+        self.get()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.stats
+
+    def _load(self):
+        try:
+            self.stats = load_or_build(self.size, self.seed, self.chunk_size, self.cache_dir)
+            self.error = None
+        except Exception as e: # 분포가 없어도 앱의 나머지 기능은 동작
+            self.error = f"{type(e).__name__}: {e}"
+            self.failures += 1
+            backoff = min(self.retry_interval * 2 ** (self.failures - 1), self.max_retry_interval)
+            self._next_retry = time.monotonic() + backoff
+        finally:
+            with self._lock:
+                self._thread = None # 실패했으면 다음 get() 이 (backoff 뒤에) 다시 시도
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가상 인구 분포를 계산해서 디스크 캐시에 저장")
+    parser.add_argument("--size", type=int, default=DEFAULT_POPULATION)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args()
+    stats = load_or_build(args.size, args.seed, args.chunk_size, args.cache_dir)
+    p10, p50, p90 = stats.percentiles([10, 50, 90])
+    print(f"{cache_path(args.size, args.seed, args.chunk_size, args.cache_dir)}: {stats.size:,}명, "
+          f"계산 {stats.meta['elapsed']:.1f}s, 6개월 연애 확률 p10={p10:.2f}% p50={p50:.2f}% p90={p90:.2f}%")
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""시뮬레이션 실행 기록 저장소 (SQLite + SQLAlchemy)
+
+버튼 클릭 경로에서는 RunStore.record() 가 실행 내용을 메모리 대기열에 올리기만 하고 바로 돌아옵니다.
+백그라운드 스레드가 flush_interval 초마다, 또는 대기열이 max_batch 개 이상 쌓이면
+행으로 변환(JSON 직렬화 포함)해서 트랜잭션 하나에 모아 INSERT 합니다.
+
+SQLite 는 WAL 모드로 열어 쓰는 동안에도 집계 조회가 막히지 않게 하고,
+(age_group, gender, relationship_6m) 복합 인덱스로 나이대/성별별 6개월 확률 분포를 인덱스만으로 집계합니다.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+import pandas as pd
+from sqlalchemy import (Column, Float, Index, Integer, MetaData, String, Table, Text, create_engine, event, func,
+                        select)
+from sqlalchemy.exc import OperationalError
+
+DEFAULT_DB_PATH = os.environ.get("LOVE_SIM_RUN_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "runs.db"))
+DEFAULT_FLUSH_INTERVAL = 1.0 # 초
+DEFAULT_MAX_BATCH = 500 # 한 트랜잭션에 넣을 최대 행 수
+DEFAULT_MAX_QUEUE = 50_000 # 대기열 상한 (넘으면 가장 오래된 기록부터 버림)
+PERIOD_COLUMNS = {'3개월': '3m', '6개월': '6m', '12개월': '12m'}
+
+metadata = MetaData()
+
+runs = Table(
+    "runs", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("created_at", Float, nullable=False), # UNIX 시간
+    Column("session_id", String(36)),
+    Column("gender", String(8)),
+    Column("age_group", String(16)),
+    Column("solo_duration", String(16)),
+    Column("exp_level", String(8)),
+    Column("encounter_3m", Float), Column("encounter_6m", Float), Column("encounter_12m", Float),
+    Column("relationship_3m", Float), Column("relationship_6m", Float), Column("relationship_12m", Float),
+    Column("character", String(64)), # 표시한 캐릭터 이미지 파일 이름 (확률 구간)
+    Column("params_json", Text, nullable=False),
+    Column("results_json", Text, nullable=False),
+    Index("ix_runs_age_gender_rel6m", "age_group", "gender", "relationship_6m"),
+    Index("ix_runs_created_at", "created_at"),
+)
+
+
+def create_store_engine(path=DEFAULT_DB_PATH):
+    """WAL 모드 SQLite 엔진을 만들고 테이블/인덱스를 생성"""
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA busy_timeout=5000") # 먼저 설정해야 여러 프로세스가 동시에 WAL 로 바꿀 때도 기다림
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL") # WAL 에서는 커밋마다 fsync 하지 않아도 DB 는 깨지지 않음
+        cursor.close()
+
+    try:
+        metadata.create_all(engine)
+    except OperationalError: # 다른 프로세스가 같은 DB 에 동시에 테이블을 만든 경우 → 이미 있는 것은 건너뛰고 다시
+        metadata.create_all(engine)
+    return engine
+
+
+def run_to_row(created_at, session_id, params, results_df, character_path):
+    """실행 하나 → runs 테이블 행 딕셔너리 (results_df 는 배열로 한 번만 꺼내서 사용)"""
+    periods = [str(period) for period in results_df.index]
+    columns = list(results_df.columns)
+    data = results_df.to_numpy(dtype=float).tolist()
+    row = {
+        'created_at': created_at,
+        'session_id': session_id,
+        'gender': params.get('gender'),
+        'age_group': params.get('age_group'),
+        'solo_duration': params.get('solo_duration'),
+        'exp_level': params.get('exp_level'),
+        'character': os.path.basename(character_path) if character_path else None,
+        'params_json': json.dumps({key: value for key, value in params.items() if key != 'activities_options'},
+                                  ensure_ascii=False, default=str),
+        'results_json': json.dumps({'columns': columns, 'index': periods, 'data': data}, ensure_ascii=False),
+    }
+    position = {period: i for i, period in enumerate(periods)}
+    encounter_column, relationship_column = columns.index('만남 확률 (%)'), columns.index('연애 시작 확률 (%)')
+    for period, suffix in PERIOD_COLUMNS.items():
+        values = data[position[period]] if period in position else None
+        row[f'encounter_{suffix}'] = values[encounter_column] if values else None
+        row[f'relationship_{suffix}'] = values[relationship_column] if values else None
+    return row
+
+
+class RunStore:
+    """실행 기록 write-behind 저장소
+
+    record() 는 대기열에 (시각, params, results_df, 캐릭터 경로) 를 올리고 바로 반환합니다.
+    실패한 배치는 버리지 않고 대기열 앞에 되돌려 다음 주기에 다시 시도합니다.
+    그 사이 새 실행이 쌓여 자리가 모자라면 실패한 배치의 오래된 쪽부터 버리고 dropped 에 셉니다
+    (대기열이 가득 찼을 때 record() 가 가장 오래된 실행을 버리는 것과 같은 순서).
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, flush_interval=DEFAULT_FLUSH_INTERVAL, max_batch=DEFAULT_MAX_BATCH,
+                 max_queue=DEFAULT_MAX_QUEUE, engine=None):
+        self.path = path
+        self.engine = engine if engine is not None else create_store_engine(path)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue = deque(maxlen=max_queue)
+        self._lock = threading.Lock() # 대기열/dropped/스레드 시작
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+        self.written_total = 0 # DB 에 저장된 실행 수
+        self.batch_count = 0
+        self.dropped = 0 # 대기열이 가득 차서 버린 실행 수 (되돌릴 자리가 없던 실패 배치 포함)
+        self.last_error = None
+        self.last_flush_at = None
+
+    @property
+    def pending(self):
+        return len(self._queue)
+
+    @staticmethod
+    def new_session_id():
+        return str(uuid.uuid4())
+
+    def record(self, params, results_df, character_path=None, session_id=None):
+        """실행 하나를 대기열에 올림 (버튼 클릭 경로에서 호출, 즉시 반환)"""
+        item = (time.time(), session_id, dict(params), results_df, character_path)
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(item)
+            pending = len(self._queue)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="run-store-writer", daemon=True)
+                self._thread.start()
+        if pending >= self.max_batch:
+            self._wakeup.set()
+
+    def flush(self):
+        """대기 중인 실행을 max_batch 개씩 트랜잭션으로 저장 (모두 성공하면 True)"""
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+                if not batch:
+                    break
+                try:
+                    rows = [run_to_row(*item) for item in batch]
+                    with self.engine.begin() as connection:
+                        connection.execute(runs.insert(), rows)
+                except Exception as e:
+                    self._requeue(batch) # 실패한 배치는 다음 주기에 재시도
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    return False
+                self.written_total += len(batch)
+                self.batch_count += 1
+                self.last_error = None
+                self.last_flush_at = time.time()
+        return True
+
+    def _requeue(self, batch):
+        """실패한 배치를 대기열 앞에 되돌림 (남은 자리만큼, 넘치는 오래된 실행은 dropped 에 셈)"""
+        with self._lock:
+            free = self._queue.maxlen - len(self._queue)
+            if len(batch) > free:
+                self.dropped += len(batch) - free
+                batch = batch[len(batch) - free:]
+            self._queue.extendleft(reversed(batch))
+
+    def close(self):
+        """백그라운드 스레드를 멈추고 남은 실행을 마지막으로 저장"""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 10)
+        return self.flush()
+
+    def _run(self):
+        atexit.register(self.close) # 프로세스 종료 시 남은 기록 저장
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self._closed:
+                self.flush()
+
+    def count(self):
+        with self.engine.connect() as connection:
+            return connection.execute(select(func.count()).select_from(runs)).scalar_one()
+
+    def probability_distribution(self, bucket_width=10):
+        """나이대 × 성별 × 6개월 연애 확률 구간별 실행 수 (복합 인덱스만으로 집계)"""
+        bucket = (func.cast(runs.c.relationship_6m / bucket_width, Integer) * bucket_width).label("bucket")
+        query = (select(runs.c.age_group, runs.c.gender, bucket, func.count().label("runs"))
+                 .group_by(runs.c.age_group, runs.c.gender, bucket)
+                 .order_by(runs.c.age_group, runs.c.gender, bucket))
+        with self.engine.connect() as connection:
+            return pd.DataFrame(connection.execute(query).all(), columns=["age_group", "gender", "bucket", "runs"])
+
+    def probability_summary(self):
+        """나이대 × 성별별 실행 수와 6개월 연애 확률 평균/최소/최대"""
+        query = (select(runs.c.age_group, runs.c.gender, func.count().label("runs"),
+                        func.avg(runs.c.relationship_6m).label("mean"),
+                        func.min(runs.c.relationship_6m).label("min"), func.max(runs.c.relationship_6m).label("max"))
+                 .group_by(runs.c.age_group, runs.c.gender))
+        with self.engine.connect() as connection:
+            return pd.DataFrame(connection.execute(query).all(),
+                                columns=["age_group", "gender", "runs", "mean", "min", "max"])
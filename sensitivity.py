@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""민감도 분석: 입력값 하나만 바꿨을 때 6개월 연애 확률이 얼마나 움직이는지
+
+현재 params 에서 입력 하나씩을 다른 모든 값으로 바꾼 변형(슬라이더 값, select_slider 단계,
+필터 개수, 활동 1/2 조합 등)을 열 배열로 한 번에 만들고, love_model.score_batch 로
+한 번에 계산해서 6개월 연애 확률 변화량 순으로 정렬합니다. (수백~천 개 변형, 수 ms)
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+import love_model
+
+TARGET_COLUMN = 'relationship_6m'
+BOOL_LABELS = {True: "예", False: "아니오"}
+
+
+def _format_number(field, value):
+    return f"{value:.1f}" if field == 'appearance' else f"{value:.0f}"
+
+
+def build_variants(params, activities_options=love_model.activities_options):
+    """입력 하나만 바꾼 모든 변형을 열 딕셔너리로 생성
+
+    반환: (columns, meta) — columns 의 0번 행은 현재 값,
+    meta 는 행별 (field, 이전 값, 바꾼 값, 몇 칸 움직였는지) 목록
+    """
+    activity_names = list(activities_options)
+    blocks = [] # (field 목록, 값 배열 목록, 표시용 from, 표시용 to 목록, 칸 수 배열)
+
+    for field, (low, high, step) in love_model.NUMERIC_RANGES.items():
+        values = np.arange(low, high + step / 2, step, dtype=np.float64)
+        values = values[values != float(params[field])]
+        blocks.append(([field], [values], _format_number(field, params[field]),
+                       [_format_number(field, v) for v in values], np.abs(values - float(params[field])) / step))
+
+    for field, levels in love_model.CATEGORY_LEVELS.items():
+        current = levels.index(params[field])
+        codes = np.array([code for code in range(len(levels)) if code != current], dtype=np.intp)
+        blocks.append(([field], [codes], params[field], [levels[code] for code in codes], np.abs(codes - current)))
+
+    flipped = not bool(params['apply_sim_result'])
+    blocks.append((['apply_sim_result'], [np.array([flipped])], BOOL_LABELS[not flipped], [BOOL_LABELS[flipped]],
+                   np.ones(1)))
+
+    # 활동 1/2 는 두 칸을 한 번에 바꾸는 조합 (순서 무관이므로 중복 제외)
+    current_pair = tuple(sorted((params['activity1'], params['activity2'])))
+    pairs = [pair for pair in itertools.combinations_with_replacement(range(len(activity_names)), 2)
+             if tuple(sorted((activity_names[pair[0]], activity_names[pair[1]]))) != current_pair]
+    pair_codes = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+    blocks.append((['activity1', 'activity2'], [pair_codes[:, 0], pair_codes[:, 1]],
+                   f"{params['activity1']} + {params['activity2']}",
+                   [f"{activity_names[a]} + {activity_names[b]}" for a, b in pairs], np.ones(len(pairs))))
+
+    n = 1 + sum(len(block[1][0]) for block in blocks)
+    columns = love_model.profile_columns(params, n, activity_names)
+    meta_field, meta_from, meta_to = ['current'], [""], [""]
+    meta_steps = np.zeros(n)
+    start = 1
+    for fields, values, from_label, to_labels, steps in blocks:
+        stop = start + len(values[0])
+        for field, field_values in zip(fields, values):
+            columns[field][start:stop] = field_values
+        group = 'activities' if len(fields) == 2 else fields[0]
+        meta_field += [group] * (stop - start)
+        meta_from += [from_label] * (stop - start)
+        meta_to += to_labels
+        meta_steps[start:stop] = steps
+        start = stop
+    return columns, (meta_field, meta_from, meta_to, meta_steps)
+
+
+def sensitivity_sweep(params, activities_options=love_model.activities_options):
+    """한 가지 입력 변경별 6개월 연애 확률과 변화량 (변화량 큰 순 DataFrame)
+
+    열: field, 입력, 현재 값, 바꾼 값, 칸 수, 6개월 연애 확률 (%), 변화 (%p), 6개월 만남 확률 (%)
+    (칸 수: 슬라이더/단계를 몇 칸 움직였는지, 활동 조합과 체크박스는 1)
+    """
+    columns, (fields, from_labels, to_labels, steps) = build_variants(params, activities_options)
+    scores = love_model.score_batch(columns, activities_options)
+    relationship = scores[TARGET_COLUMN]
+    delta = relationship - relationship[0]
+    order = np.argsort(-delta[1:], kind='stable') + 1 # 0번 행(현재 값) 제외
+    fields = np.asarray(fields, dtype=object)[order]
+    return pd.DataFrame({
+        'field': fields,
+        '입력': [love_model.INPUT_LABELS[f] for f in fields],
+        '현재 값': np.asarray(from_labels, dtype=object)[order],
+        '바꾼 값': np.asarray(to_labels, dtype=object)[order],
+        '칸 수': steps[order].astype(int),
+        '6개월 연애 확률 (%)': relationship[order],
+        '변화 (%p)': delta[order],
+        '6개월 만남 확률 (%)': scores['encounter_6m'][order],
+    })
+
+
+def top_changes(sweep, n=5, per_field=1, max_steps=None):
+    """입력별로 가장 좋은 변경만 남겨 상위 n 개 (확률이 오르는 변경만, max_steps 칸 이내)"""
+    candidates = sweep[sweep['변화 (%p)'] > 0]
+    if max_steps is not None:
+        candidates = candidates[candidates['칸 수'] <= max_steps]
+    return candidates.groupby('field', sort=False).head(per_field).head(n)
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""공유 카드 이미지 (인스타 스토리 1080×1920 PNG)
+
+캐릭터 이미지, 6개월 연애 확률, 캐릭터 감정 표현, 활동 이름을 한 장에 그립니다.
+바뀌지 않는 부분은 프로세스에서 한 번만 만들어 두는 레이어입니다.
+- 성별별 배경 (그라데이션 + 흰 패널 + 제목/주소 같은 고정 글자)
+- 캐릭터 8종 (원본 PNG 를 디코딩해서 카드 크기로 축소, 둥근 모서리 마스크)
+- 글꼴
+카드 한 장 = 배경 복사 + 캐릭터 붙이기 + 글자 세 줄 + PNG 인코딩 (대부분 인코딩 시간)
+
+같은 내용의 카드는 다시 그리지 않도록 (성별, 확률 구간, 반올림한 확률, 활동) 키로 캐시하고,
+오래 안 쓴 카드부터 버려서 바이트 총량을 max_bytes 안으로 유지합니다 (LRU).
+
+한글 글꼴: LOVE_SIM_CARD_FONT 환경 변수 → 시스템 한글 글꼴 후보(나눔고딕/Noto CJK/애플 SD 고딕/맑은 고딕) 순서로
+찾고, 하나도 없으면 Pillow 기본 글꼴로 그립니다 (기본 글꼴에는 한글이 없어서 숫자/영문만 제대로 나옴).
+Streamlit Cloud 는 packages.txt 의 fonts-nanum 으로 나눔고딕이 설치됩니다.
+"""
+import io
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+import image_cache
+import love_model
+import pipeline
+
+CARD_SIZE = (1080, 1920) # 인스타 스토리
+CHARACTER_WIDTH = 520
+CHARACTER_TOP = 330
+PREVIEW_WIDTH = 270 # 앱에 보여줄 미리보기 너비 (다운로드는 원본 크기 PNG)
+DEFAULT_MAX_BYTES = 32 * 2**20 # 캐시 메모리 상한 (카드 한 장 약 0.8MB)
+SHARE_URL = "lovesim.streamlit.app"
+FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgunbd.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+)
+# 배경 그라데이션 (위, 아래) — 사용자가 남성이면 여성 캐릭터(분홍), 여성이면 남성 캐릭터(하늘)
+GRADIENTS = {
+    "남성": ((255, 214, 226), (255, 160, 190)),
+    "여성": ((212, 232, 255), (150, 190, 245)),
+}
+TEXT_COLOR = (70, 40, 60)
+ACCENT_COLOR = (230, 60, 110)
+# 카드 글꼴에 없는 이모지/기호 (글자 자리에 네모가 찍히지 않도록 빼고 그림)
+_EMOJI = re.compile("[\U0001F000-\U0001FFFF\u2600-\u27BF\uFE0F\u200D]")
+
+# 캐시 항목: 다운로드용 PNG, 미리보기 JPEG, 그리는 데 걸린 시간
+ShareCard = namedtuple('ShareCard', ['png', 'preview', 'render_seconds'])
+
+
+def find_font_path():
+    """카드에 쓸 한글 글꼴 경로 (없으면 None → Pillow 기본 글꼴)"""
+    for path in (os.environ.get("LOVE_SIM_CARD_FONT"),) + FONT_CANDIDATES:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def card_text(text):
+    """이모지를 빼고 공백 정리"""
+    return " ".join(_EMOJI.sub("", text).split())
+
+
+def card_key(relationship_prob_6m, gender, activity):
+    """카드 내용 키: 확률 구간(캐릭터 이미지 경로)은 반올림 전 값으로 정해지므로 따로 넣음"""
+    return (gender, love_model.get_character_image_path(relationship_prob_6m, gender),
+            round(float(relationship_prob_6m), 1), activity)
+
+
+class ShareCardRenderer:
+    """미리 만든 레이어로 카드를 그림 (캐시 없음)"""
+
+    def __init__(self, base_dir=image_cache.BASE_DIR, font_path=None):
+        self.font_path = font_path or find_font_path()
+        self.fonts = {role: self._font(size) for role, size in
+                      (('title', 64), ('prob', 200), ('text', 60), ('small', 40))}
+        started = time.perf_counter()
+        self.backgrounds = {gender: self._background(top, bottom) for gender, (top, bottom) in GRADIENTS.items()}
+        self.characters = {}
+        self.errors = {} # 경로 → 오류 메시지 (캐릭터 없이 그림)
+        for path in image_cache.character_image_paths():
+            try:
+                with Image.open(os.path.join(base_dir, path)) as image:
+                    height = round(image.height * CHARACTER_WIDTH / image.width)
+                    self.characters[path] = image.convert("RGB").resize((CHARACTER_WIDTH, height), Image.LANCZOS)
+            except (OSError, ValueError) as e:
+                self.errors[path] = str(e)
+        # 캐릭터 이미지는 크기가 모두 같아서 마스크 하나를 같이 씀
+        self._masks = {}
+        for character in self.characters.values():
+            if character.size not in self._masks:
+                mask = Image.new("L", character.size, 0)
+                ImageDraw.Draw(mask).rounded_rectangle((0, 0, character.width - 1, character.height - 1), 48, fill=255)
+                self._masks[character.size] = mask
+        self.build_seconds = time.perf_counter() - started
+
+    def _font(self, size):
+        if self.font_path:
+            return ImageFont.truetype(self.font_path, size)
+        return ImageFont.load_default(size)
+
+    def _background(self, top, bottom):
+        """그라데이션 + 흰 패널 + 고정 글자"""
+        width, height = CARD_SIZE
+        ramp = np.linspace(0, 1, height)[:, None]
+        rows = (np.array(top) * (1 - ramp) + np.array(bottom) * ramp).astype(np.uint8)
+        background = Image.fromarray(np.repeat(rows[:, None, :], width, axis=1), "RGB")
+        draw = ImageDraw.Draw(background)
+        draw.rounded_rectangle((80, 240, width - 80, height - 240), 60, fill=(255, 255, 255))
+        draw.text((width // 2, 150), "향후 6개월 연애 확률", font=self.fonts['title'], fill=TEXT_COLOR, anchor="mm")
+        draw.text((width // 2, height - 140), f"너도 해봐! {SHARE_URL}", font=self.fonts['small'],
+                  fill=TEXT_COLOR, anchor="mm")
+        return background
+
+    def compose(self, relationship_prob_6m, gender, activity):
+        """카드 Image (RGB)"""
+        texts = pipeline.result_texts(relationship_prob_6m, gender)
+        width = CARD_SIZE[0]
+        card = self.backgrounds.get(gender, self.backgrounds["여성"]).copy()
+        character = self.characters.get(texts['character_image_path'])
+        bottom = CHARACTER_TOP
+        if character is not None:
+            card.paste(character, ((width - character.width) // 2, CHARACTER_TOP), self._masks[character.size])
+            bottom += character.height
+        draw = ImageDraw.Draw(card)
+        draw.text((width // 2, bottom + 150), f"{relationship_prob_6m:.1f}%", font=self.fonts['prob'],
+                  fill=ACCENT_COLOR, anchor="mm")
+        draw.text((width // 2, bottom + 300), card_text(texts['char_feeling_text']), font=self.fonts['text'],
+                  fill=TEXT_COLOR, anchor="mm")
+        draw.text((width // 2, bottom + 400), card_text(f"'{activity}' 활동 덕분인가?"), font=self.fonts['text'],
+                  fill=TEXT_COLOR, anchor="mm")
+        return card
+
+    def render(self, relationship_prob_6m, gender, activity):
+        """ShareCard (PNG + 미리보기 JPEG)"""
+        started = time.perf_counter()
+        card = self.compose(float(relationship_prob_6m), gender, activity) # 구간은 반올림 전 값, 표시는 소수 첫째 자리
+        buffer = io.BytesIO()
+        card.save(buffer, "PNG", compress_level=6)
+        preview, _, _ = image_cache.encode_thumbnail(card, PREVIEW_WIDTH)
+        return ShareCard(buffer.getvalue(), preview, time.perf_counter() - started)
+
+
+class ShareCardCache:
+    """card_key → ShareCard, 바이트 총량 max_bytes 를 넘으면 오래 안 쓴 카드부터 버림 (스레드 안전)"""
+
+    def __init__(self, renderer=None, max_bytes=DEFAULT_MAX_BYTES):
+        self._renderer = renderer
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def renderer(self):
+        """레이어는 처음 그릴 때 만듦 (앱 시작 시간에 넣지 않도록)"""
+        if self._renderer is None:
+            with self._lock:
+                if self._renderer is None:
+                    self._renderer = ShareCardRenderer()
+        return self._renderer
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, relationship_prob_6m, gender, activity):
+        key = card_key(relationship_prob_6m, gender, activity)
+        with self._lock:
+            card = self._items.get(key)
+            if card is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return card
+            self.misses += 1
+        # 그리는 동안은 잠그지 않음 (같은 카드를 동시에 처음 요청하면 두 번 그릴 수 있지만 결과는 같음)
+        card = self.renderer.render(relationship_prob_6m, gender, activity)
+        size = len(card.png) + len(card.preview)
+        if size > self.max_bytes:
+            return card
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = card
+                self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted.png) + len(evicted.preview)
+                self.evictions += 1
+        return card
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""테스트 공용 프로필 (bench 스크립트와 따로 둠: 벤치를 고쳐도 테스트가 확인하는 내용은 바뀌지 않도록)"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import love_model  # noqa: E402
+import love_profile  # noqa: E402
+
+PROFILE_COUNT = 500
+PROFILE_SEED = 0
+
+
+def _covering_columns(rng, n):
+    """모든 범주형 단계/활동/표시용 선택지가 나오고 숫자 입력은 양 끝값을 포함하는 열 딕셔너리 (라벨)"""
+    columns = {}
+    for field, (low, high, step) in love_model.NUMERIC_RANGES.items():
+        values = low + step * rng.integers(0, round((high - low) / step) + 1, n)
+        values[:2] = low, high
+        columns[field] = rng.permutation(values)
+    activities = list(love_model.activities_options)
+    choices = {**love_model.CATEGORY_LEVELS, **love_profile.DISPLAY_LEVELS,
+               'activity1': activities, 'activity2': activities}
+    for field, levels in choices.items():
+        columns[field] = rng.permutation(np.resize(np.asarray(levels, dtype=object), n))
+    columns['apply_sim_result'] = rng.permutation(np.arange(n) % 2 == 0)
+    return columns
+
+
+@pytest.fixture(scope="session")
+def covering_columns():
+    """시드 고정 프로필 PROFILE_COUNT 개 (열 딕셔너리, 범주형은 라벨)"""
+    return _covering_columns(np.random.default_rng(PROFILE_SEED), PROFILE_COUNT)
+
+
+@pytest.fixture
+def covering_params(covering_columns):
+    """covering_columns 를 앱 params 딕셔너리 목록으로 (테스트마다 새로 만들어서 고쳐도 됨)"""
+    return [{**{field: values[i].item() if isinstance(values[i], np.generic) else values[i]
+                for field, values in covering_columns.items()},
+             'activities_options': love_model.activities_options}
+            for i in range(PROFILE_COUNT)]
+
+
+@pytest.fixture
+def params(covering_params):
+    """프로필 하나"""
+    return covering_params[0]
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""예전 love_sim.py (첫 버전) 의 점수 계산 함수, 활동 점수표, 결과 표 만들기를 그대로 옮겨 둔 기준 구현
+
+love_model 의 배치 엔진/인코딩 표가 예전 문자열 비교 공식과 같은 값을 내는지 확인하는 데만 씁니다.
+앱 코드를 따라 고치지 말 것 (고치면 테스트가 비교하는 기준이 같이 바뀜).
+"""
+import numpy as np
+import pandas as pd
+
+activities_options = {
+    "선택 안 함": 0, "집콕(영화/게임/독서 등)": -5, "스터디/외국어 학원": 5,
+    "공연/전시/사진/글쓰기": 10, "봉사활동/종교활동": 15, "요가/필라테스": 10,
+    "등산/여행 동호회": 15, "러닝 크루 (건강+균형)": 20, "댄스/음악/미술 학원": 12,
+    "헬스장(주로 혼자)": 3, "축구/농구/야구 동호회": 8, "주짓수/격투기/서핑": 25,
+    "게임/IT 동아리": 5, "자동차/바이크 동호회": 8
+}
+
+
+def calculate_base_score_v2(params):
+    """입력 파라미터 기반으로 기본 점수 계산"""
+    score = 50
+    # 외모 점수 반영
+    score += (params['appearance'] - 5) * 3.0
+    # 활동 반경 점수
+    if params['activity_range'] == "집-회사 위주": score -= 5
+    elif params['activity_range'] == "시내/핫플 자주 감": score += 3
+    elif params['activity_range'] == "지역/해외 이동 잦음": score += 6
+    # 네트워크 점수
+    score += params['network_size'] * 0.8
+    score += (params['network_quality'] - 3) * 1.5
+    # 직장 이성 비율 (중심 50%에서 벗어날수록 감점 효과 유사)
+    score += (params['work_gender_ratio'] / 100 - 0.5) * 10 if params['work_gender_ratio'] <= 50 else (0.5 - params['work_gender_ratio'] / 100) * 10
+    if params['living_env'] == "자취/독립": score += 3
+    # 적극성/마인드셋 점수
+    if params['proactiveness'] == "거의 없음": score -= 10
+    elif params['proactiveness'] == "월 1회": score += 3
+    elif params['proactiveness'] == "주 1회 이상": score += 8
+    score += (params['resilience'] - 3) * 2.0
+    score += (params['confidence'] - 6) * 2.5
+    score += (params['openness'] - 3) * 2.0
+    # 필터링 페널티
+    filter_penalty = (params['high_filters'] * 5.0) + (params['medium_filters'] * 2.0) + (params['low_filters'] * 0.5)
+    score -= filter_penalty
+    return max(0, min(100, score)) # 0~100 사이 값 유지
+
+def calculate_encounter_prob_v2(base_score, params):
+    """기본 점수와 활동 기반으로 만남 확률 계산"""
+    activity_score = 0
+    activity_score += params['activities_options'].get(params['activity1'], 0) # 없는 키 접근 방지
+    activity_score += params['activities_options'].get(params['activity2'], 0)
+    # 활동 빈도 가중치
+    if params['activity_freq'] == "월 1-2회": activity_score *= 1.2
+    elif params['activity_freq'] == "주 1회": activity_score *= 1.5
+    elif params['activity_freq'] == "주 2회 이상": activity_score *= 1.8
+    # 새로운 활동 시도 가중치
+    if params['new_activity_try'] == "분기 1회": activity_score += 5
+    elif params['new_activity_try'] == "적극적": activity_score += 10
+    # 시뮬레이션 결과 참고 의향 가중치
+    if params['apply_sim_result']: activity_score += 3 # 약간의 추가 점수
+
+    total_score = base_score + activity_score
+    # 로지스틱 함수 변형으로 확률 계산 (0.05 ~ 0.95 사이 유지)
+    prob = 1 / (1 + np.exp(-(total_score - 60) / 15)) # 중심점 60, 스케일 15 (조정 가능)
+    prob = max(0.05, min(0.95, prob))
+    return prob * 100
+
+def calculate_relationship_prob_v2(encounter_prob, base_score, params):
+    """만남 확률과 매력 관리 기반으로 연애 시작 확률 계산"""
+    charm_upgrade_score = 0
+    # 외모/매력 관리 노력 점수
+    if params['style_effort'] == "가끔 신경 씀": charm_upgrade_score += 3
+    elif params['style_effort'] == "적극 투자/컨설팅": charm_upgrade_score += 8
+    if params['skin_hair_care'] == "주기적 관리": charm_upgrade_score += 3
+    elif params['skin_hair_care'] == "시술/전문 관리": charm_upgrade_score += 7
+    if params['body_care_effort'] == "주 1-2회": charm_upgrade_score += 2
+    elif params['body_care_effort'] == "주 3회 이상": charm_upgrade_score += 5
+    elif params['body_care_effort'] == "PT/식단 병행": charm_upgrade_score += 9
+    if params['manner_effort'] == "가끔 노력": charm_upgrade_score += 2
+    elif params['manner_effort'] == "적극 교정/학습": charm_upgrade_score += 6
+    if params['health_care'] == "노력 중": charm_upgrade_score += 1
+    elif params['health_care'] == "성공/비해당": charm_upgrade_score += 4
+
+    # 만남 -> 연애 전환 계수 계산 (기본 점수와 매력 점수 합산 기반)
+    conversion_factor = (base_score + charm_upgrade_score) / 200 # 최대 1.0 가능하도록 정규화
+    conversion_factor = 0.1 + conversion_factor * 0.6 # 0.1 ~ 0.7 사이로 조정 (최소 전환율 10%, 최대 70%)
+    conversion_factor = max(0.1, min(0.7, conversion_factor))
+
+    prob = (encounter_prob / 100) * conversion_factor * 100
+    # 연애 확률은 만남 확률보다 클 수 없음
+    return max(0.0, min(encounter_prob, prob))
+
+def apply_time_decay_v2(prob, months):
+    """시간 경과에 따른 확률 조정 (단기 < 중기 < 장기)"""
+    if months == 3: decay_factor = 0.6 # 3개월 내에는 확률 낮게 조정
+    elif months == 6: decay_factor = 1.0 # 6개월 기준
+    else: decay_factor = 1.3 # 1년 내에는 확률 높게 조정
+    return min(99.0, prob * decay_factor) # 최대 99%
+
+def get_character_image_path(relationship_prob, user_gender):
+    """ 사용자의 성별에 따라 상대방 성별의 캐릭터 이미지 경로를 반환 """
+    # 사용자가 남성이면 여성 캐릭터, 여성이면 남성 캐릭터 표시
+    target_gender_prefix = "female_char" if user_gender == "남성" else "male_char"
+
+    # 확률 구간에 따라 파일명 접미사 결정
+    if relationship_prob < 15:
+        suffix = "0_15.png" # 예: images/female_char_0_15.png
+    elif relationship_prob < 35:
+        suffix = "15_35.png"
+    elif relationship_prob < 60:
+        suffix = "35_60.png"
+    else:
+        suffix = "60_plus.png"
+    # 최종 이미지 경로 반환 (images 폴더 안에 있다고 가정)
+    return f"images/{target_gender_prefix}_{suffix}"
+
+
+def results_table(params):
+    """결과 표 (버튼 처리 부분에서 그대로 옮김)"""
+    base_score = calculate_base_score_v2(params)
+    encounter_prob_base = calculate_encounter_prob_v2(base_score, params)
+    relationship_prob_base = calculate_relationship_prob_v2(encounter_prob_base, base_score, params)
+
+    results = {'기간': [], '만남 확률 (%)': [], '연애 시작 확률 (%)': []}
+    period_order = ["3개월", "6개월", "12개월"]
+
+    for months in [3, 6, 12]:
+        encounter_p = apply_time_decay_v2(encounter_prob_base, months)
+        relationship_p = apply_time_decay_v2(relationship_prob_base, months)
+        relationship_p = min(encounter_p, relationship_p) # 연애 확률 > 만남 확률 방지
+        results['기간'].append(f"{months}개월")
+        results['만남 확률 (%)'].append(round(encounter_p, 1))
+        results['연애 시작 확률 (%)'].append(round(relationship_p, 1))
+
+    results_df = pd.DataFrame(results)
+    results_df['기간'] = pd.Categorical(results_df['기간'], categories=period_order, ordered=True)
+    results_df = results_df.set_index('기간')
+    return results_df
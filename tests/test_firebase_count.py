@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""firebase_count: 카운트 읽기/초기화, ETag 충돌 재시도, CountWriter 반영 (로컬 Firebase 대역 서버)"""
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+import firebase_count
+from fake_firebase import FakeFirebaseServer
+from firebase_client import CircuitBreaker, FirebaseClient
+
+COUNT_PATH = "/simulations/love_simulator/count.json"
+
+
+@pytest.fixture
+def server():
+    server = FakeFirebaseServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client():
+    client = FirebaseClient(retries=0)
+    yield client
+    client.close()
+
+
+def test_reads_integer(server, client):
+    server.data[COUNT_PATH] = 41
+    assert firebase_count.get_firebase_count(server.url, COUNT_PATH, client) == (41, None)
+
+
+def test_initializes_only_missing_path(server, client):
+    count, message = firebase_count.get_firebase_count(server.url, COUNT_PATH, client)
+    assert count == 0 and "초기화 완료" in message
+    assert server.data[COUNT_PATH] == 0
+
+
+def test_non_integer_value_is_left_alone(server, client):
+    server.data[COUNT_PATH] = "oops"
+    count, message = firebase_count.get_firebase_count(server.url, COUNT_PATH, client)
+    assert count == 0 and "형식 오류" in message
+    assert server.data[COUNT_PATH] == "oops"
+    assert server.stats['put'] == 0
+
+
+class _HtmlResponse:
+    """JSON 이 아닌 200 응답 (프록시 오류 페이지 흉내)"""
+    status_code = 200
+    headers = {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads("<html>bad gateway</html>")
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.puts = []
+
+    def get(self, url, **kwargs):
+        return _HtmlResponse()
+
+    def put(self, url, **kwargs):
+        self.puts.append((url, kwargs))
+        raise AssertionError("읽기 오류에서 쓰기를 보내면 안 됨")
+
+
+def test_undecodable_response_does_not_write():
+    client = _RecordingClient()
+    count, message = firebase_count.get_firebase_count("http://firebase.invalid", COUNT_PATH, client)
+    assert count == 0 and "JSON 아님" in message
+    assert client.puts == []
+
+
+def test_initialization_is_conditional(server, client):
+    # GET 에서는 비어 있었지만 초기화 전에 다른 쪽이 값을 쓴 경우: 412 → 그 값을 그대로 사용
+    original_get = client.get
+
+    def get_then_someone_writes(url, **kwargs):
+        response = original_get(url, **kwargs)
+        server.data[COUNT_PATH] = 7
+        return response
+
+    client.get = get_then_someone_writes
+    assert firebase_count.get_firebase_count(server.url, COUNT_PATH, client) == (7, None)
+    assert server.data[COUNT_PATH] == 7
+
+
+def test_update_retries_after_conflict(server, client):
+    # GET 과 조건부 PUT 사이에 다른 쪽이 값을 바꿈 → 412 응답의 최신 값/ETag 로 다시 시도
+    server.data[COUNT_PATH] = 10
+    original_get = client.get
+
+    def get_then_someone_writes(url, **kwargs):
+        response = original_get(url, **kwargs)
+        server.data[COUNT_PATH] = 15
+        return response
+
+    client.get = get_then_someone_writes
+    assert firebase_count.update_firebase_count(server.url, COUNT_PATH, delta=2, client=client) == (True, 17)
+    assert server.data[COUNT_PATH] == 17 and server.stats['conflict'] == 1
+
+
+def test_count_writer_flushes_pending(server, client):
+    flushed = []
+    writer = firebase_count.CountWriter(server.url, COUNT_PATH, flush_interval=3600, max_pending=1000,
+                                        on_flush=flushed.append,
+                                        update=lambda *args: firebase_count.update_firebase_count(*args, client=client))
+    for _ in range(5):
+        writer.add()
+    assert writer.pending == 5
+    assert writer.flush() is True
+    assert server.data[COUNT_PATH] == 5 and writer.pending == 0 and flushed == [5]
+    writer.add(3)
+    writer.close()
+    assert server.data[COUNT_PATH] == 8 and writer.flushed_total == 8 and writer.flush_count == 2
+
+
+def test_count_writer_keeps_pending_on_failure():
+    writer = firebase_count.CountWriter("http://firebase.invalid", COUNT_PATH, flush_interval=3600,
+                                        update=lambda db_url, path, delta: (False, "연결 실패"))
+    writer.add(4)
+    assert writer.flush() is False
+    assert writer.pending == 4 and writer.error_count == 1 and writer.last_error == "연결 실패"
+    writer._update = lambda db_url, path, delta: (True, delta)
+    assert writer.close() is True and writer.flushed_total == 4
+
+
+def test_concurrent_writers_count_exactly():
+    # 여러 CountWriter 를 여러 스레드가 동시에 올리고, 서버는 요청의 30% 에 503 을 돌려줌 (값 반영 전 실패)
+    server = FakeFirebaseServer(error_rate=0.3, seed=0).start()
+    client = FirebaseClient(retries=0, pool_maxsize=20, breaker=CircuitBreaker(failure_threshold=10 ** 6))
+    server.data[COUNT_PATH] = 0
+    update = lambda *args: firebase_count.update_firebase_count(*args, client=client)
+    writers = [firebase_count.CountWriter(server.url, COUNT_PATH, flush_interval=0.01, max_pending=5, update=update)
+               for _ in range(4)]
+    threads, clicks = 16, 200
+
+    def click(writer):
+        for _ in range(clicks):
+            writer.add()
+            time.sleep(0.001) # 클릭 사이에 반영이 여러 번 일어나도록
+
+    workers = [threading.Thread(target=click, args=(writers[i % len(writers)],)) for i in range(threads)]
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        server.error_rate = 0.0
+        for writer in writers:
+            writer.close()
+        for writer in writers: # 마지막 반영이 다른 writer 와 부딪혀 실패했으면 경쟁 없이 다시
+            assert writer.flush() is True and writer.pending == 0
+        assert server.data[COUNT_PATH] == threads * clicks
+        assert sum(writer.flushed_total for writer in writers) == threads * clicks
+        assert all(writer.uncertain_total == 0 for writer in writers)
+        assert server.stats['injected_error'] > 0 and sum(writer.error_count for writer in writers) > 0
+    finally:
+        client.close()
+        server.stop()
+
+
+def _lose_put_response(client, applied):
+    """PUT 을 (applied 면 서버에 반영한 뒤) 읽기 타임아웃으로 바꾸는 클라이언트"""
+    original_put = client.put
+
+    def put(url, **kwargs):
+        client.put = original_put # 한 번만
+        if applied:
+            original_put(url, **kwargs)
+        raise requests.exceptions.ReadTimeout("응답 없음")
+
+    client.put = put
+
+
+def test_lost_put_response_that_was_applied_counts_once(server, client):
+    server.data[COUNT_PATH] = 10
+    _lose_put_response(client, applied=True)
+    assert firebase_count.update_firebase_count(server.url, COUNT_PATH, delta=3, client=client) == (True, 13)
+    assert server.data[COUNT_PATH] == 13
+
+
+def test_lost_put_request_is_retried(server, client):
+    server.data[COUNT_PATH] = 10
+    _lose_put_response(client, applied=False)
+    assert firebase_count.update_firebase_count(server.url, COUNT_PATH, delta=3, client=client) == (True, 13)
+
+
+def test_uncertain_write_is_not_readded(server, client):
+    # 응답을 잃은 사이 다른 쪽도 값을 바꿔서 반영 여부를 알 수 없음 → CountWriter 는 다시 더하지 않음
+    server.data[COUNT_PATH] = 10
+    original_put = client.put
+
+    def put(url, **kwargs):
+        client.put = original_put
+        original_put(url, **kwargs)
+        server.data[COUNT_PATH] += 1
+        raise requests.exceptions.ReadTimeout("응답 없음")
+
+    client.put = put
+    writer = firebase_count.CountWriter(server.url, COUNT_PATH, flush_interval=3600,
+                                        update=lambda *args: firebase_count.update_firebase_count(*args, client=client))
+    writer.add(3)
+    assert writer.flush() is False
+    assert writer.pending == 0 and writer.uncertain_total == 3 and "불명" in writer.last_error
+    assert server.data[COUNT_PATH] == 14
+
+
+class _NoEtagResponse(_HtmlResponse):
+    def json(self):
+        return 5
+
+
+def test_missing_etag_is_not_written_blindly():
+    client = _RecordingClient()
+    client.get = lambda url, **kwargs: _NoEtagResponse()
+    success, message = firebase_count.update_firebase_count("http://firebase.invalid", COUNT_PATH, client=client)
+    assert success is False and "ETag" in message
+    assert client.puts == []
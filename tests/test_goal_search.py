@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""goal_search.find_min_effort: 작은 문제에서 전수 탐색과 같은 최소 비용"""
+import itertools
+
+import numpy as np
+
+import goal_search
+import love_model
+
+FREE_FIELDS = 3 # 전수 탐색에서 풀어둘 입력 수
+
+
+def _choices(params, field):
+    """위젯 선택지 전체와 현재 값에서 몇 칸인지 (외모는 0.5점, 활동/체크박스는 바꾸면 한 칸)"""
+    if field in love_model.NUMERIC_RANGES:
+        low, high, step = love_model.NUMERIC_RANGES[field]
+        values = [low + step * i for i in range(round((high - low) / step) + 1)]
+        return values, [abs(value - params[field]) / step for value in values]
+    if field == 'apply_sim_result':
+        values = [False, True]
+        return values, [float(value != params[field]) for value in values]
+    if field in ('activity1', 'activity2'):
+        values = list(love_model.activities_options)
+        return values, [float(value != params[field]) for value in values]
+    levels = love_model.CATEGORY_LEVELS[field]
+    current = levels.index(params[field])
+    return levels, [float(abs(i - current)) for i in range(len(levels))]
+
+
+def brute_force(params, step_costs):
+    """풀린 입력의 모든 조합을 라벨 그대로 계산 -> (조합별 비용, 6개월 연애 확률)"""
+    free = [field for field, cost in step_costs.items() if cost is not None]
+    choices = [_choices(params, field) for field in free]
+    combos = list(itertools.product(*[range(len(values)) for values, _ in choices]))
+    columns = {field: [params[field]] * len(combos) for field in love_model.MODEL_FIELDS}
+    cost = np.zeros(len(combos))
+    for i, (field, (values, steps)) in enumerate(zip(free, choices)):
+        columns[field] = [values[combo[i]] for combo in combos]
+        cost += np.array([steps[combo[i]] for combo in combos]) * step_costs[field]
+    return cost, love_model.score_batch(columns)['relationship_6m']
+
+
+def test_matches_brute_force(covering_params):
+    rng = np.random.default_rng(0)
+    fields = list(goal_search.DEFAULT_STEP_COSTS)
+    for params in covering_params[:8]:
+        free = rng.choice(fields, FREE_FIELDS, replace=False)
+        step_costs = {field: (float(rng.integers(1, 4)) if field in free else None) for field in fields}
+        cost, prob = brute_force(params, step_costs)
+        # 도달 가능한 목표 여러 개 + 닿지 않는 목표 하나
+        for target in [*rng.uniform(prob.min(), prob.max(), 3), prob.max() + 1.0]:
+            reached = prob >= target - 1e-9
+            result = goal_search.find_min_effort(params, float(target), step_costs, time_budget=10)
+            assert result.complete
+            if not reached.any():
+                assert not result.reachable and result.cost is None
+            else:
+                assert result.reachable and abs(result.cost - cost[reached].min()) < 1e-9
+                assert result.achieved_prob >= target - 1e-6
+
+
+def test_already_reached(params):
+    result = goal_search.find_min_effort(params, 0.0)
+    assert result.reachable and result.complete and result.cost == 0 and result.changes == []
+
+
+def test_unreachable_target(params):
+    result = goal_search.find_min_effort(params, 100.0, time_budget=10)
+    assert not result.reachable and result.complete and result.cost is None
+    assert result.max_prob < 100.0
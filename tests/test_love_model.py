@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""love_model: 배치 엔진과 프로필 하나용 함수가 예전 love_sim.py 공식(legacy_model)과 같은 값을 내는지"""
+import numpy as np
+
+import legacy_model
+import love_model
+
+
+def legacy_scores(params):
+    """예전 공식으로 (기본 점수, 만남, 연애, 3/6/12개월 만남·연애) — 연애는 만남을 넘지 않게 자름 (예전 앱과 동일)"""
+    params = dict(params, activities_options=legacy_model.activities_options)
+    base = legacy_model.calculate_base_score_v2(params)
+    encounter = legacy_model.calculate_encounter_prob_v2(base, params)
+    relationship = legacy_model.calculate_relationship_prob_v2(encounter, base, params)
+    periods = {}
+    for months in love_model.PERIOD_MONTHS:
+        periods[f'encounter_{months}m'] = legacy_model.apply_time_decay_v2(encounter, months)
+        periods[f'relationship_{months}m'] = min(periods[f'encounter_{months}m'],
+                                                 legacy_model.apply_time_decay_v2(relationship, months))
+    return {'base_score': base, 'encounter_prob': encounter, 'relationship_prob': relationship, **periods}
+
+
+def test_activity_table_matches_legacy():
+    assert dict(love_model.activities_options) == legacy_model.activities_options
+
+
+def test_batch_matches_legacy(covering_columns, covering_params):
+    scores = love_model.score_batch(covering_columns)
+    for i, params in enumerate(covering_params):
+        expected = legacy_scores(params)
+        assert {key: scores[key][i] for key in expected} == expected
+
+
+def test_single_profile_matches_legacy(covering_params):
+    for params in covering_params:
+        expected = legacy_scores(params)
+        base = love_model.calculate_base_score_v2(params)
+        encounter = love_model.calculate_encounter_prob_v2(base, params)
+        relationship = love_model.calculate_relationship_prob_v2(encounter, base, params)
+        assert (base, encounter, relationship) == (
+            expected['base_score'], expected['encounter_prob'], expected['relationship_prob'])
+        for months in love_model.PERIOD_MONTHS:
+            assert love_model.apply_time_decay_v2(relationship, months) == \
+                legacy_model.apply_time_decay_v2(relationship, months)
+        for gender in ("남성", "여성"):
+            assert love_model.get_character_image_path(relationship, gender) == \
+                legacy_model.get_character_image_path(relationship, gender)
+
+
+def test_profile_columns_matches_labels(params):
+    codes = love_model.score_batch(love_model.profile_columns(params, 2))
+    labels = love_model.score_batch(love_model.params_to_columns(params))
+    assert all(np.array_equal(codes[key], np.repeat(labels[key], 2)) for key in labels)
+
+    params['activity1'] = "목록에 없는 활동" # 모르는 활동은 마지막 코드 (= 0점)
+    assert love_model.profile_columns(params)['activity1'][0] == len(love_model.activities_options)
+
+
+def test_histogram_percentiles():
+    counts = np.zeros(100, dtype=np.int64)
+    counts[[10, 50, 90]] = 1
+    assert love_model.histogram_percentiles(counts, [0, 50, 100]).tolist() == [10.5, 50.5, 90.5]
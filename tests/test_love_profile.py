@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""love_profile.Profile: 왕복 변환, 범위 확인, 딕셔너리 경로와 계산 결과 동일"""
+import pickle
+
+import numpy as np
+import pytest
+
+import love_model
+import love_profile
+
+
+@pytest.fixture
+def params_list(covering_params):
+    return covering_params
+
+
+def score(params):
+    base = love_model.calculate_base_score_v2(params)
+    encounter = love_model.calculate_encounter_prob_v2(base, params)
+    return base, encounter, love_model.calculate_relationship_prob_v2(encounter, base, params)
+
+
+def test_round_trip(params_list):
+    for params in params_list:
+        profile = love_profile.Profile.from_params(params)
+        assert {key: profile.to_params()[key] for key in params} == params
+        packed = profile.to_bytes()
+        assert len(packed) == love_profile.PACKED_SIZE
+        assert love_profile.Profile.from_bytes(packed) == profile
+        assert pickle.loads(pickle.dumps(profile)) == profile
+        assert hash(love_profile.Profile.from_codes(profile.codes())) == hash(profile)
+
+
+def test_scalar_matches_dict_path(params_list):
+    for params in params_list:
+        assert score(love_profile.Profile.from_params(params)) == score(params)
+
+
+def test_packed_batch_matches_label_columns(params_list):
+    profiles = [love_profile.Profile.from_params(params) for params in params_list]
+    records = love_profile.pack_profiles(profiles)
+    labels = {field: [params[field] for params in params_list] for field in love_model.MODEL_FIELDS}
+    expected = love_model.score_batch(labels)
+    for key, values in love_model.score_batch(records).items():
+        np.testing.assert_array_equal(values, expected[key])
+    assert love_profile.unpack_profiles(records) == profiles
+    # 스칼라 함수도 같은 배치 엔진 결과
+    for profile, relationship in zip(profiles, expected['relationship_prob']):
+        assert score(profile)[2] == relationship
+
+
+def test_appearance_only_input_and_replace(params_list):
+    params = {key: value for key, value in params_list[0].items() if key not in ('appearance_self', 'appearance_others')}
+    profile = love_profile.Profile.from_params(dict(params, appearance=7.5))
+    assert profile['appearance'] == 7.5
+    assert profile.replace(appearance=3.0)['appearance'] == 3.0
+    assert profile.replace(activity1="요가/필라테스")['activity1'] == "요가/필라테스"
+    with pytest.raises(AttributeError):
+        profile.confidence = 3
+
+
+@pytest.mark.parametrize("field, value", [('activity_range', "우주"), ('confidence', 11), ('appearance', 5.2)])
+def test_invalid_widget_values(params_list, field, value):
+    with pytest.raises(ValueError):
+        love_profile.Profile.from_params(dict(params_list[0], **{field: value}))
+
+
+def test_out_of_range_codes_rejected(params_list):
+    codes = list(love_profile.Profile.from_params(params_list[0]).codes())
+    codes[love_profile.FIELDS.index('activity_range')] = 9
+    with pytest.raises(ValueError):
+        love_profile.Profile.from_codes(codes)
+    records = love_profile.pack_profiles([love_profile.Profile.from_params(params_list[0])]).copy()
+    records['gender'] = 7
+    with pytest.raises(ValueError):
+        love_profile.unpack_profiles(records)
+    with pytest.raises(ValueError):
+        love_profile.Profile.from_bytes(b"\x02" + bytes(love_profile.PACKED_SIZE - 1))
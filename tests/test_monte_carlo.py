@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""monte_carlo.simulate_bands: 밴드가 결과 표와 같은 곡선을 씀"""
+import monte_carlo
+import pipeline
+
+
+def test_bands_follow_results_table(covering_params):
+    params = covering_params[3]
+    results_df = pipeline.build_pipeline().evaluate(params, targets=['results_frame'])['results_frame']
+    # 입력 오차가 없으면 모든 시나리오가 같음 → 중앙값 = 표 값, 시뮬레이션 비율 ≈ 표 값
+    bands = monte_carlo.simulate_bands(params, scenarios=50_000, noise_std={}).bands
+    for months in (3, 6, 12):
+        for label, column in (("만남", '만남 확률 (%)'), ("연애", '연애 시작 확률 (%)')):
+            expected = results_df.loc[f"{months}개월", column]
+            assert abs(bands.loc[months, f"{label} p50 (%)"] - expected) < 0.06
+            assert abs(bands.loc[months, f"{label} 시뮬레이션 (%)"] - expected) < 1.0
+
+
+def test_relationship_never_before_encounter(params):
+    bands = monte_carlo.simulate_bands(params, scenarios=20_000).bands
+    assert (bands['연애 시뮬레이션 (%)'] <= bands['만남 시뮬레이션 (%)']).all()
+    assert (bands['연애 p50 (%)'].diff().dropna() >= 0).all()
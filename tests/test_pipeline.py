@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""pipeline: 예전 결과 표와 같은 값, 바뀐 입력을 읽는 단계만 재계산, 세션끼리 캐시 값을 공유해도 수정이 퍼지지 않음"""
+import pytest
+
+import legacy_model
+import love_model
+import love_profile
+import pipeline
+
+
+def test_sessions_do_not_share_mutable_values(params):
+    result_pipeline = pipeline.build_pipeline()
+    first = result_pipeline.evaluate(params, session=result_pipeline.new_session())
+    expected = first['results_frame'].copy()
+
+    first['results_frame'].iloc[:, :] = -1
+    first['sensitivity']['변화 (%p)'] = 0
+    with pytest.raises(TypeError):
+        first['texts']['result_comment'] = "바뀜"
+    with pytest.raises(ValueError):
+        first['curves']['relationship'][0] = -1
+
+    second = result_pipeline.evaluate(params, session=result_pipeline.new_session())
+    assert result_pipeline.stats[('results_frame', 'global_hit')] == 1
+    assert second['results_frame'].equals(expected)
+    assert (second['sensitivity']['변화 (%p)'] != 0).any()
+
+
+def test_results_frame_matches_legacy_table(covering_params):
+    result_pipeline = pipeline.build_pipeline()
+    for params in covering_params:
+        results_df = result_pipeline.evaluate(params, targets=['results_frame'])['results_frame']
+        expected = legacy_model.results_table(dict(params, activities_options=legacy_model.activities_options))
+        assert results_df.equals(expected)
+
+
+def test_profile_uses_stored_codes(params, monkeypatch):
+    profile = love_profile.Profile.from_params(params)
+    expected = pipeline.build_pipeline().evaluate(params, targets=['relationship_prob'])
+
+    def no_label_lookup(values, levels):
+        raise AssertionError("Profile 은 라벨을 다시 코드로 바꾸지 않아야 함")
+
+    monkeypatch.setattr(love_model, '_label_codes', no_label_lookup)
+    assert pipeline.build_pipeline().evaluate(profile, targets=['relationship_prob']) == expected
+
+
+def _recomputed(result_pipeline, session, params):
+    """evaluate 한 번에서 다시 계산된(miss) 단계 이름 집합"""
+    before = session.stats.copy()
+    result_pipeline.evaluate(params, session=session)
+    return {name for name in result_pipeline.stages
+            if session.stats[(name, 'miss')] > before[(name, 'miss')]}
+
+
+def _other(field, value):
+    levels = {**love_profile.DISPLAY_LEVELS, **love_model.CATEGORY_LEVELS}[field]
+    return next(level for level in levels if level != value)
+
+
+@pytest.mark.parametrize("field, expected", [
+    ('age_group', set()),
+    ('solo_duration', set()),
+    ('exp_level', set()),
+    ('gender', {'texts'}),
+    ('style_effort', {'relationship_prob', 'curves', 'results_frame', 'texts', 'sensitivity'}),
+])
+def test_only_affected_stages_recompute(params, field, expected):
+    result_pipeline = pipeline.build_pipeline()
+    session = result_pipeline.new_session()
+    assert _recomputed(result_pipeline, session, params) == set(result_pipeline.stages)
+    changed = dict(params, **{field: _other(field, params[field])})
+    assert _recomputed(result_pipeline, session, changed) == expected
+    if not expected: # 모델이 읽지 않는 입력만 바뀌면 모든 단계가 세션 캐시에서
+        assert all(session.stats[(name, 'session_hit')] == 1 for name in result_pipeline.stages)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""run_store.RunStore: 실패한 배치 되돌리기와 dropped 계산"""
+import pytest
+
+import pipeline
+import run_store
+
+
+@pytest.fixture
+def run(params):
+    return params, pipeline.build_pipeline().evaluate(params, targets=['results_frame'])['results_frame']
+
+
+class FailingEngine:
+    """begin() 이 실패하는 엔진 (실패 직전에 before_fail 실행)"""
+
+    def __init__(self, before_fail=None):
+        self.before_fail = before_fail
+
+    def begin(self):
+        if self.before_fail is not None:
+            self.before_fail()
+        raise RuntimeError("디스크 가득 참")
+
+
+def test_failed_batch_is_retried(tmp_path, run):
+    store = run_store.RunStore(str(tmp_path / "runs.db"), flush_interval=3600, max_batch=4)
+    engine = store.engine
+    for _ in range(3):
+        store.record(*run)
+    store.engine = FailingEngine()
+    assert store.flush() is False and store.pending == 3 and "디스크" in store.last_error
+    store.engine = engine
+    assert store.close() is True
+    assert store.count() == 3 and store.dropped == 0
+
+
+def test_requeue_overflow_is_counted(tmp_path, run):
+    store = run_store.RunStore(str(tmp_path / "runs.db"), flush_interval=3600, max_batch=4, max_queue=6)
+    engine = store.engine
+    for _ in range(4):
+        store.record(*run)
+
+    def fill_queue(): # 배치를 쓰는 동안 새 실행 5개가 들어옴 → 되돌릴 자리는 1개
+        for _ in range(5):
+            store.record(*run)
+
+    store.engine = FailingEngine(fill_queue)
+    assert store.flush() is False
+    assert store.pending == 6 and store.dropped == 3
+    store.engine = engine
+    assert store.close() is True
+    assert store.count() + store.dropped == 9
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""share_card.ShareCardCache: 바이트 상한 LRU"""
+import share_card
+
+
+class FakeRenderer:
+    """확률 값(정수)을 PNG 바이트 수로 쓰는 가짜 렌더러"""
+
+    def __init__(self):
+        self.renders = 0
+
+    def render(self, relationship_prob_6m, gender, activity):
+        self.renders += 1
+        return share_card.ShareCard(b"p" * int(relationship_prob_6m), b"", 0.0)
+
+
+def test_byte_cap_evicts_least_recently_used():
+    renderer = FakeRenderer()
+    cache = share_card.ShareCardCache(renderer, max_bytes=100)
+    for prob in (30, 40, 20): # 90 바이트
+        cache.get(prob, "여성", "러닝 크루")
+    cache.get(30, "여성", "러닝 크루") # 30 을 최근으로
+    cache.get(25, "여성", "러닝 크루") # 115 → 가장 오래 안 쓴 40 제거
+    assert cache.nbytes == 75 and len(cache) == 3 and cache.evictions == 1
+    assert cache.hits == 1 and renderer.renders == 4
+
+    cache.get(40, "여성", "러닝 크루") # 제거된 카드는 다시 그림
+    assert renderer.renders == 5 and cache.nbytes <= cache.max_bytes
+
+
+def test_card_larger_than_cap_is_not_cached():
+    renderer = FakeRenderer()
+    cache = share_card.ShareCardCache(renderer, max_bytes=50)
+    card = cache.get(80, "남성", "러닝 크루")
+    assert len(card.png) == 80 and len(cache) == 0 and cache.nbytes == 0